@@ -1,3 +1,19 @@
-from bmcs_beam.beam_config.beam_design import BeamDesign
-from bmcs_beam.beam_config.boundary_conditions import BoundaryConditions, BoundaryConfig
-from bmcs_beam.bending.deflection_profile import DeflectionProfile, LoadDeflectionParamsStudy
\ No newline at end of file
+'''
+Public API of bmcs_beam. The names are imported from their modules on
+the first access, so that e.g. BoundaryConfig is available without
+loading sympy, matplotlib and the cross section models.
+'''
+
+from bmcs_beam.lazy_import import lazy_attributes
+
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    'bmcs_beam.beam_config.beam_design': ['BeamDesign'],
+    'bmcs_beam.beam_config.boundary_conditions': ['BoundaryConditions'],
+    'bmcs_beam.beam_config.closed_form': ['BoundaryConfig'],
+    'bmcs_beam.bending.deflection_profile': ['DeflectionProfile', 'LoadDeflectionParamsStudy'],
+    'bmcs_beam.bending.deflection_study': ['DeflectionStudy'],
+    'bmcs_beam.bending.inverse_design': ['InverseDesign'],
+    'bmcs_beam.bending.long_term_deflection': ['LongTermDeflection'],
+    'bmcs_beam.bending.sls_check': ['SLSCheck', 'get_EN1990_combinations'],
+    'bmcs_beam.profiling': ['StageProfiler'],
+})
@@ -0,0 +1,7 @@
+from bmcs_beam.lazy_import import lazy_attributes
+
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.beam_design': ['BeamDesign'],
+    '.boundary_conditions': ['BoundaryConditions'],
+    '.closed_form': ['BoundaryConfig'],
+})
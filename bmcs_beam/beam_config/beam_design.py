@@ -1,13 +1,20 @@
 import traits.api as tr
+from bmcs_beam.beam_config import kernel_cache
 from bmcs_beam.beam_config.boundary_conditions import BoundaryConditions, BoundaryConfig
 from bmcs_cross_section.cs_design import CrossSectionDesign
 from bmcs_utils.api import InteractiveModel, \
     Int, Item, View, Float, Range, Button, ButtonEditor, mpl_align_yaxis, FloatRangeEditor
+from bmcs_beam.profiling import stage, record_cache, timed
 from sympy.physics.continuum_mechanics.beam import Beam
 import sympy as sp
 import numpy as np
 from numbers import Number
 
+MQ_KERNELS = {}
+'''Compiled kernels M(x, F) and Q(x, F) of the statical systems shared
+by all beam designs, keyed by (MQ_backend, beam_conf_name, L, first_load_distance)
+'''
+
 # Quick fix for [bmcs_shear_zone]
 class BeamDesign(CrossSectionDesign):
 
@@ -20,9 +27,30 @@ class BeamDesign(CrossSectionDesign):
     L = Float(5000)
     F = Float(-1000)
     # TODO [HS]: make the conf a dropdown menu when the implementation is done by [RC]
-    beam_conf_name = BoundaryConfig.THREE_PB
+    beam_conf_name = tr.Enum(BoundaryConfig)
     beam_conf_name_slider = Range(0.)
 
+    span = tr.Property(depends_on='L, beam_conf_name')
+    '''Span of the beam - the length of a single span of the three-span beam
+    '''
+    def _get_span(self):
+        if self.beam_conf_name == BoundaryConfig.THREE_SPAN_DIST_LOAD:
+            return self.L / 3
+        return self.L
+
+    MQ_backend = tr.Enum('closed_form', 'sympy')
+    '''Statical solution used for the moment and shear kernels get_M_x,
+    get_Q_x and get_MQ_xF. The sympy Beam is kept for validation of the
+    closed-form solution. The deflection of DeflectionProfile is always
+    resolved with the closed-form unit load and reaction terms of
+    compute.solve_xF, which the moment redistribution requires.
+    '''
+
+    MQ_disk_cache = tr.Bool(False)
+    '''Opt-in persistent kernel cache of the sympy backend in the directory
+    of bmcs_beam.cache, e.g. for short-lived worker processes
+    '''
+
     # beam_configs = BoundaryConfig
     # beam_conf = Enum(values='')
 
@@ -31,24 +59,65 @@ class BeamDesign(CrossSectionDesign):
     def _beam_default(self):
         return BoundaryConditions.get_configured_beam(self.L, self.F, self.beam_conf_name)
 
-    x = tr.Property(depends_on='L, n_x')
+    x_grid = tr.Enum('uniform', 'refined')
+    '''Discretization of the beam - uniform or with the points at the loads
+    and supports and with local refinement at the crossings of M_refine
+    '''
+
+    M_refine = tr.Array(np.float64, value=np.zeros(0))
+    '''Moments of the cross section, e.g. the cracking and yield moments,
+    whose positions along the beam are inserted in the refined grid for
+    the elastic moments due to the load F, see get_x_F for other loads
+    '''
 
+    n_refine = Int(0)
+    '''Number of bisections of the intervals adjacent to the crossings of M_refine
+    '''
+
+    x_memo = tr.Property(depends_on='L, n_x, F, beam_conf_name, x_grid, M_refine, n_refine')
+    '''Discretizations keyed by the first_load_distance of the beam
+    configuration which is not a trait
+    '''
     @tr.cached_property
+    def _get_x_memo(self):
+        return {}
+
+    x = tr.Property
+    '''Positions of the points along the beam. The refined grid contains
+    n_x points plus the points inserted by the local refinement.
+    '''
     def _get_x(self):
-        return np.linspace(0, self.L, self.n_x)
+        conf = self.beam_conf_name
+        x = self.x_memo.get(conf.first_load_distance)
+        if x is None:
+            x = self.x_memo[conf.first_load_distance] = self.get_x_F([self.F])
+        return x
+
+    def get_x_F(self, F):
+        '''
+        Positions of the points along the beam for the array of loads F.
+        The refined grid contains the crossings of M_refine for all loads,
+        e.g. the load levels of a load-deflection curve, so that the kinks
+        of the curvature are points of the grid at each load level. The
+        uniform grid does not depend on F.
+        '''
+        if self.x_grid == 'uniform':
+            return np.linspace(0, self.L, self.n_x)
+        conf = self.beam_conf_name
+        x_refine = BoundaryConditions.get_x_crossings(self.L, conf, F, self.M_refine) \
+            if len(self.M_refine) and len(F) else []
+        return BoundaryConditions.get_x_grid(self.L, self.n_x, BoundaryConditions.get_x_nodes(self.L, conf),
+                                             x_refine, self.n_refine)
 
     @tr.observe("beam_conf_name_slider")
     def notify_slider_change(self, event):
         self.beam_conf_name = BoundaryConfig(int(event.new))
-        self.beam = BoundaryConditions.get_configured_beam(self.L, self.F, self.beam_conf_name)
 
-    @tr.observe("L")
-    def notify_L_change(self, event):
-        self.beam = BoundaryConditions.get_configured_beam(event.new, self.F, self.beam_conf_name)
-
-    @tr.observe("F")
-    def notify_F_change(self, event):
-        self.beam = BoundaryConditions.get_configured_beam(self.L, event.new, self.beam_conf_name)
+    @tr.observe("L, F, beam_conf_name")
+    def notify_beam_change(self, event):
+        # the sympy beam is only needed for plotting, it is constructed
+        # on the next access instead of with each change of the load
+        self.reset_traits(['beam'])
 
     # add_force_btn = Button()
     #
@@ -59,7 +128,7 @@ class BeamDesign(CrossSectionDesign):
         Item('L', latex='L \mathrm{[mm]}'),
         Item('F', latex='F \mathrm{[N]}'),
         Item('n_x', latex='n_x'),
-        Item('beam_conf_name_slider', editor=FloatRangeEditor(label='Beam config', n_steps=5, low=0, high=5)),
+        Item('beam_conf_name_slider', editor=FloatRangeEditor(label='Beam config', n_steps=6, low=0, high=6)),
         # Item('beam_conf', editor=EnumEditor(label='Beam config', options_tuple_list=beam_configs)),
         # Item('add_force_btn', editor=ButtonEditor(label='Force', icon='plus'))
     )
@@ -77,25 +146,115 @@ class BeamDesign(CrossSectionDesign):
             if not isinstance(load_value, Number):
                 reactions_names.append(load_value)
 
-        self.beam.solve_for_reaction_loads(*reactions_names)
+        with stage('BeamDesign.sympy_solve'):
+            self.beam.solve_for_reaction_loads(*reactions_names)
+
+    def get_MQ_kernels(self):
+        '''
+        Return the functions M(x, F) and Q(x, F) of the current statical
+        system. With the sympy backend, the beam is solved symbolically with
+        F kept as a symbol and converted to piecewise polynomials only once
+        per configuration, repeated calls, e.g. within load-deflection curves,
+        sliders or parametric studies reuse the kernels. With MQ_disk_cache,
+        the polynomials are shared with other processes and with other
+        lengths of the beam via the persistent kernel cache.
+        '''
+        conf = self.beam_conf_name
+        key = (self.MQ_backend, conf, float(self.L), conf.first_load_distance)
+        kernels = MQ_KERNELS.get(key)
+        record_cache('BeamDesign.MQ_kernels', kernels is not None)
+        if kernels is None:
+            if self.MQ_backend == 'closed_form':
+                kernels = BoundaryConditions.get_MQ_kernels(self.L, conf)
+            else:
+                data = None
+                if self.MQ_disk_cache:
+                    data = kernel_cache.load_kernel_data(key[1:])
+                    record_cache('BeamDesign.MQ_disk_cache', data is not None)
+                if data is None:
+                    data = self._get_MQ_data()
+                    if self.MQ_disk_cache:
+                        kernel_cache.save_kernel_data(key[1:], data)
+                kernels = kernel_cache.make_kernels(data, self.L)
+            MQ_KERNELS[key] = kernels
+        return kernels
+
+    def _get_MQ_data(self):
+        '''
+        Piecewise polynomials of the kernels M(x, F) and Q(x, F) of the
+        solved sympy beam, see kernel_cache.get_kernel_data
+        '''
+        F = sp.Symbol('F')
+        conf = self.beam_conf_name
+        beam = BoundaryConditions.get_configured_beam(self.L, F, conf)
+        reactions_names = [load[0] for load in beam.applied_loads
+                           if isinstance(load[0], sp.Symbol) and load[0] != F]
+        with stage('BeamDesign.sympy_solve'):
+            beam.solve_for_reaction_loads(*reactions_names)
+            M_ = beam.bending_moment().subs(F, 1)
+            Q_ = beam.shear_force().subs(F, 1)
+        # the moment is proportional to F L for point loads, F L**2 for
+        # distributed loads and F for point moments
+        order = [order for name, _, _, order in BoundaryConditions.get_load_terms(self.L, conf)
+                 if name == 'F'][0]
+        with stage('BeamDesign.kernel_data'):
+            return kernel_cache.get_kernel_data(M_, Q_, beam.variable, self.L, order + 2)
 
     def get_M_x(self, solve_beam_first=True):
-        if solve_beam_first:
-            self.solve_beam_for_reactions()
-        x = sp.symbols('x')
-        M_ = self.beam.bending_moment().rewrite(sp.Piecewise)
-        get_M = sp.lambdify(x, M_, 'numpy')
-        return get_M(self.x)
+        get_M, _ = self.get_MQ_kernels()
+        return get_M(self.x, self.F) * np.ones_like(self.x)
 
     def get_Q_x(self, solve_beam_first=True):
-        if solve_beam_first:
-            self.solve_beam_for_reactions()
-        x = sp.symbols('x')
-        Q_ = self.beam.shear_force().rewrite(sp.Piecewise)
-        get_Q = sp.lambdify(x, Q_, 'numpy')
-        Q_x = get_Q(self.x)
-        return Q_x
+        _, get_Q = self.get_MQ_kernels()
+        return get_Q(self.x, self.F) * np.ones_like(self.x)
+
+    def get_MQ_xF(self, F):
+        '''
+        Bending moment and shear force profiles for an array of loads F.
+        The kernels are evaluated by broadcasting, the returned arrays
+        have the shape (n_x, n_F) and the F trait of the model is not changed.
+        '''
+        return self.get_M_xF(F), self.get_Q_xF(F)
+
+    def get_M_xF(self, F):
+        '''Bending moment profile for an array of loads F - shape (n_x, n_F)
+        '''
+        get_M, _ = self.get_MQ_kernels()
+        return self._eval_xF(get_M, F)
+
+    def get_Q_xF(self, F):
+        '''Shear force profile for an array of loads F - shape (n_x, n_F)
+        '''
+        _, get_Q = self.get_MQ_kernels()
+        return self._eval_xF(get_Q, F)
+
+    def _eval_xF(self, get_fn, F):
+        F_F = np.asarray(F, dtype=np.float64)[np.newaxis, :]
+        x_x = self.x[:, np.newaxis]
+        # constant branches of the piecewise kernels return scalars
+        return get_fn(x_x, F_F) * np.ones((len(self.x), F_F.shape[1]))
+
+    def get_influence_lines(self, xi):
+        '''
+        Influence lines of the moment, shear force and deflection (for EI = 1)
+        along the beam for a unit load at the positions xi - shape (n_x, n_xi)
+        '''
+        return BoundaryConditions.get_influence_lines(self.x, xi, self.beam_conf_name)
+
+    @timed('BeamDesign.moving_load')
+    def get_moving_load_envelopes(self, P, a, n_positions=1001, EI=1.):
+        '''
+        Envelopes of the moment, shear force and deflection along the beam
+        for a train of point loads P with the distances a behind the leading
+        load crossing the supports of the beam configuration, see
+        closed_form.get_moving_load_envelopes. The statical system is
+        resolved once for all positions of the train instead of solving
+        the sympy beam per position.
+        '''
+        return BoundaryConditions.get_moving_load_envelopes(
+            self.x, self.beam_conf_name, P, a, n_positions, EI)
 
+    @timed('BeamDesign.plot')
     def plot_MQ(self, ax2, ax3):
         x = self.x
         M_scale = 1e+6
@@ -1,26 +1,11 @@
 from numbers import Number
 
 import numpy as np
-import sympy as sp
 import traits.api as tr
-from matplotlib.patches import PathPatch
-from matplotlib.path import Path
-from sympy.physics.continuum_mechanics.beam import Beam
-import matplotlib.patches as mpatches
 
-import enum
-
-# class BoundaryConfigSettings:
-#     pass
-
-class BoundaryConfig(enum.Enum):
-    # The following should be provided as sub classes with possible settings change and get moment ability
-    THREE_PB, FOUR_PB, SIMPLE_BEAM_DIST_LOAD, THREE_SPAN_DIST_LOAD, THREE_PB_FIXED_SUPPORT, SINGLE_MOMENT = range(6)
-
-    # TODO [HS] This is not initialized when any of the above enums are created, fix this
-    first_load_distance = 0
-
-    # settings = BoundaryConfigSettings()
+from bmcs_beam.beam_config import closed_form
+from bmcs_beam.beam_config.closed_form import BoundaryConfig
+from bmcs_beam.profiling import timed
 
 
 class BoundaryConditions(tr.HasTraits):
@@ -29,7 +14,11 @@ class BoundaryConditions(tr.HasTraits):
     name = 'BoundaryConditions'
 
     @staticmethod
+    @timed('BoundaryConditions.get_configured_beam')
     def get_configured_beam(L, F, config):
+        # sympy is imported with the first symbolic beam
+        import sympy as sp
+        from sympy.physics.continuum_mechanics.beam import Beam
         # imput beam should have a numerical length and has E and I as symbols, and have predefined supports
         R1, R2, R3, R4, M1, M2 = sp.symbols('R1, R2, R3, R4, M1, M2')
         E, I = sp.symbols('E, I')
@@ -85,10 +74,37 @@ class BoundaryConditions(tr.HasTraits):
             beam.apply_load(-F, L / 2, -2)
             beam.bc_deflection = [(0, 0), (L, 0)]
 
+        elif config == BoundaryConfig.CANTILEVER:
+            # cantilever clamped at the left end loaded at the free end
+            beam.apply_load(R1, 0, -1)
+            beam.apply_load(M1, 0, -2)
+            beam.apply_load(F, L, -1)
+            beam.bc_deflection = [(0, 0)]
+            beam.bc_slope = [(0, 0)]
+
         return beam
 
+    # closed-form statical solution
+    get_load_terms = staticmethod(closed_form.get_load_terms)
+    get_M_extrema = staticmethod(closed_form.get_M_extrema)
+    get_M_max = staticmethod(closed_form.get_M_max)
+    get_F_at_M = staticmethod(closed_form.get_F_at_M)
+    get_unit_MQ = staticmethod(closed_form.get_unit_MQ)
+    get_reactions = staticmethod(closed_form.get_reactions)
+    get_MQ_kernels = staticmethod(closed_form.get_MQ_kernels)
+    get_w_kernel = staticmethod(closed_form.get_w_kernel)
+    get_influence_lines = staticmethod(closed_form.get_influence_lines)
+    get_moving_load_envelopes = staticmethod(closed_form.get_moving_load_envelopes)
+    get_x_nodes = staticmethod(closed_form.get_x_nodes)
+    get_x_crossings = staticmethod(closed_form.get_x_crossings)
+    get_x_grid = staticmethod(closed_form.get_x_grid)
+
     @staticmethod
+    @timed('BoundaryConditions.plot')
     def plot(ax, beam):
+        import matplotlib.patches as mpatches
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
         L = float(beam.length)
         # ax.annotate('L = {} mm'.format(np.round(L), 0), xy=(L / 2, 5), color='black')
 
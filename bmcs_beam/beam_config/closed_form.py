@@ -0,0 +1,369 @@
+'''
+Closed-form statical solution of the beam configurations. The loads and
+the resolved support reactions are given as singularity functions, the
+module depends on NumPy only and is shared by the interactive models and
+by the headless compute API.
+'''
+
+import enum
+import math
+
+import numpy as np
+
+
+class BoundaryConfig(enum.Enum):
+    # The following should be provided as sub classes with possible settings change and get moment ability
+    THREE_PB, FOUR_PB, SIMPLE_BEAM_DIST_LOAD, THREE_SPAN_DIST_LOAD, THREE_PB_FIXED_SUPPORT, SINGLE_MOMENT, \
+        CANTILEVER = range(7)
+
+    def __init__(self, *args):
+        # distance of the first load from the left support, zero stands
+        # for the default position given by the configuration
+        self.first_load_distance = 0
+
+    # settings = BoundaryConfigSettings()
+
+
+def _sf_integral(x, start, order, k):
+    '''
+    k-fold integral of the singularity function <x - start>^order.
+    Dirac terms remaining for order + k < 0 are omitted.
+    '''
+    n = order + k
+    if n < 0:
+        return np.zeros_like(x, dtype=np.float64)
+    # coefficient of the integrated term, 1/n! for Dirac terms
+    factor = math.factorial(max(order, 0)) / math.factorial(n)
+    x_a = x - start
+    return np.where(x_a >= 0, factor * np.fabs(x_a) ** n, 0)
+
+
+def get_load_terms(L, config):
+    '''
+    Closed-form counterpart of get_configured_beam. Returns the loads
+    and the resolved reactions per unit load F as a list of tuples
+    (name, value, start, order) following the sign convention
+    of Beam.apply_load. Order -2 stands for a point moment, -1 for
+    a point load and 0 for a distributed load up to the end of the beam.
+    '''
+    if config == BoundaryConfig.THREE_PB:
+        return [('R1', -1 / 2, 0, -1),
+                ('R2', -1 / 2, L, -1),
+                ('F', 1, L / 2, -1)]
+
+    elif config == BoundaryConfig.FOUR_PB:
+        load_distance = config.first_load_distance
+        if load_distance == 0:
+            load_distance = L / 3
+        return [('R1', -1, 0, -1),
+                ('R2', -1, L, -1),
+                ('F', 1, load_distance, -1),
+                ('F', 1, L - load_distance, -1)]
+
+    elif config == BoundaryConfig.SIMPLE_BEAM_DIST_LOAD:
+        return [('R1', -L / 2, 0, -1),
+                ('R2', -L / 2, L, -1),
+                ('F', 1, 0, 0)]
+
+    elif config == BoundaryConfig.THREE_SPAN_DIST_LOAD:
+        # continuous beam over three equal spans
+        l = L / 3
+        return [('R1', -0.4 * l, 0, -1),
+                ('R2', -1.1 * l, l, -1),
+                ('R3', -1.1 * l, 2 * l, -1),
+                ('R4', -0.4 * l, L, -1),
+                ('F', 1, 0, 0)]
+
+    elif config == BoundaryConfig.THREE_PB_FIXED_SUPPORT:
+        return [('R1', -1 / 2, 0, -1),
+                ('M1', L / 8, 0, -2),
+                ('R2', -1 / 2, L, -1),
+                ('M2', -L / 8, L, -2),
+                ('F', 1, L / 2, -1)]
+
+    elif config == BoundaryConfig.SINGLE_MOMENT:
+        return [('R1', 1 / L, 0, -1),
+                ('R2', -1 / L, L, -1),
+                ('F', -1, L / 2, -2)]
+
+    elif config == BoundaryConfig.CANTILEVER:
+        return [('R1', -1, 0, -1),
+                ('M1', L, 0, -2),
+                ('F', 1, L, -1)]
+
+
+def get_M_extrema(L, config, first_load_distance=0):
+    '''
+    Maximum and minimum of the elastic moment along the beam due to a unit
+    load F in the sign convention of the cross section, i.e. positive for
+    sagging. The arguments are broadcasted, so that arrays of lengths,
+    configurations (given as members or values of BoundaryConfig) and
+    load distances of a batch of beams are processed at once. Zero load
+    distance stands for the default position L/3.
+    '''
+    L = np.asarray(L, dtype=np.float64)
+    config = np.asarray(config)
+    if config.dtype == object:
+        config = np.vectorize(lambda c: BoundaryConfig(c).value, otypes=[int])(config)
+    load_distance = np.asarray(first_load_distance, dtype=np.float64)
+    load_distance = np.where(load_distance == 0, L / 3, load_distance)
+    conditions = [config == BoundaryConfig.THREE_PB.value,
+                  config == BoundaryConfig.FOUR_PB.value,
+                  config == BoundaryConfig.SIMPLE_BEAM_DIST_LOAD.value,
+                  config == BoundaryConfig.THREE_SPAN_DIST_LOAD.value,
+                  config == BoundaryConfig.THREE_PB_FIXED_SUPPORT.value,
+                  config == BoundaryConfig.SINGLE_MOMENT.value,
+                  config == BoundaryConfig.CANTILEVER.value]
+    zero = 0 * L
+    M_max = np.select(conditions,
+                      [L / 4, np.minimum(load_distance, L - load_distance), L ** 2 / 8,
+                       0.08 * (L / 3) ** 2, L / 8, 0.5 + zero, zero], np.nan)
+    # hogging at the inner supports of the continuous beam, at the clamped
+    # supports and left of the point moment
+    M_min = np.select(conditions,
+                      [zero, zero, zero, -0.1 * (L / 3) ** 2, -L / 8, -0.5 + zero, -L], np.nan)
+    return M_max, M_min
+
+
+def get_M_max(L, config, first_load_distance=0):
+    '''
+    Maximum absolute value of the elastic moment along the beam due to
+    a unit load F with the arguments broadcasted as in get_M_extrema
+    '''
+    M_max, M_min = get_M_extrema(L, config, first_load_distance)
+    return np.maximum(M_max, -M_min)
+
+
+def get_F_at_M(L, config, M_pos, M_neg, first_load_distance=0):
+    '''
+    Load F at which the elastic moment first attains the sagging moment
+    M_pos > 0 or the hogging moment M_neg < 0 of the cross section with
+    the arguments broadcasted as in get_M_extrema
+    '''
+    M_max, M_min = get_M_extrema(L, config, first_load_distance)
+    M_pos = np.asarray(M_pos, dtype=np.float64)
+    M_neg = np.asarray(M_neg, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        F_pos = np.where(M_max > 0, M_pos / M_max, np.inf)
+        F_neg = np.where(M_min < 0, M_neg / M_min, np.inf)
+    return np.minimum(F_pos, F_neg)
+
+
+def get_unit_MQ(x, terms):
+    '''
+    Moment and shear force profiles at x due to a unit value of each
+    of the load terms, returned as arrays of shape (n_x, n_terms)
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    M = [-_sf_integral(x, start, order, 2) for _, _, start, order in terms]
+    Q = [-_sf_integral(x, start, order, 1) for _, _, start, order in terms]
+    return np.stack(M, axis=-1), np.stack(Q, axis=-1)
+
+
+def get_reactions(L, F, config):
+    '''
+    Reaction loads in closed form as a dictionary {name: value}
+    corresponding to Beam.reaction_loads
+    '''
+    return {name: value * F
+            for name, value, _, _ in get_load_terms(L, config)
+            if name != 'F'}
+
+
+def get_MQ_kernels(L, config):
+    '''
+    Return the NumPy functions M(x, F) and Q(x, F) of the statical
+    system derived from the closed-form load terms. Point moments
+    and point loads contribute to the shear force and to the moment
+    with their Dirac terms omitted. Jumps take the value on the right
+    side of the discontinuity as in the sympy Beam.
+    '''
+    terms = get_load_terms(L, config)
+
+    def get_M(x, F):
+        return -F * sum(value * _sf_integral(x, start, order, 2)
+                        for _, value, start, order in terms)
+
+    def get_Q(x, F):
+        return -F * sum(value * _sf_integral(x, start, order, 1)
+                        for _, value, start, order in terms)
+
+    return get_M, get_Q
+
+
+def get_w_kernel(L, config):
+    '''
+    Return the NumPy function w(x, F, EI) of the deflection of a linear
+    elastic beam obtained by integrating EI w'' = -M twice. With the
+    resolved reactions, the terms vanish with their derivative at x = 0,
+    where all configurations are supported. The remaining integration
+    constant follows from zero deflection at the last point support
+    or from zero rotation of a clamped left end.
+    '''
+    terms = get_load_terms(L, config)
+
+    def get_w_loads(x):
+        return sum(value * _sf_integral(x, start, order, 4)
+                   for _, value, start, order in terms)
+
+    x_s = max(start for name, _, start, order in terms
+              if name != 'F' and order == -1)
+    C_1 = -get_w_loads(np.float64(x_s)) / x_s if x_s > 0 else 0
+
+    def get_w(x, F, EI):
+        return F / EI * (get_w_loads(x) + C_1 * x)
+
+    return get_w
+
+
+def get_influence_lines(x, xi, config):
+    '''
+    Influence lines of the moment, of the shear force and of the deflection
+    at x for a unit point load F at the positions xi on the supports of the
+    configuration, returned as arrays of shape (n_x, n_xi). The load follows
+    the convention of BeamDesign.F, i.e. it is negative downwards. The
+    reactions of statically indeterminate systems are resolved for all
+    positions at once from the kinematic conditions of a beam with constant
+    bending stiffness, the deflection is given for EI = 1. Positions
+    outside of the beam contribute zero. The profiles at x = L take the
+    values on the left side of the end, i.e. include the clamping moment
+    and the shear force of the right end reactions or of a load at the end,
+    which the singularity functions would drop at the end of the beam.
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    xi = np.asarray(xi, dtype=np.float64)
+    L = x[-1]
+    supports = [term for term in get_load_terms(L, config) if term[0] != 'F']
+    n_R = len(supports)
+    on_beam = (xi >= 0) & (xi <= L)
+
+    def get_sf(z, k):
+        # profiles of the unit reactions and of the moving load, the
+        # deflection of the integrated curvature M / EI is returned for k = 4
+        sf_zR = np.stack([-_sf_integral(z, start, order, k)
+                          for _, _, start, order in supports], axis=-1)
+        sf_zxi = -_sf_integral(z[:, np.newaxis], xi[np.newaxis, :], -1, k) * on_beam
+        return sf_zR, sf_zxi
+
+    # equilibrium at the end of the beam and the kinematic conditions at
+    # the supports for the unknowns [R_1 ... R_n, C_0, C_1]
+    A_ab = np.zeros((n_R + 2, n_R + 2))
+    b_axi = np.zeros((n_R + 2, len(xi)))
+    L_ = np.array([L])
+    for a, k in enumerate([2, 1]):
+        sf_R, sf_xi = get_sf(L_, k)
+        A_ab[a, :n_R], b_axi[a] = sf_R[0], -sf_xi[0]
+    for a, (_, _, x_s, order) in enumerate(supports, start=2):
+        # zero rotation at clamped supports, zero deflection at point supports
+        k = 3 if order == -2 else 4
+        sf_R, sf_xi = get_sf(np.array([x_s]), k)
+        A_ab[a, :n_R], b_axi[a] = sf_R[0], -sf_xi[0]
+        A_ab[a, n_R:] = [0, 1] if order == -2 else [1, x_s]
+    u_axi = np.linalg.solve(A_ab, b_axi)
+    R_Rxi, (C_0, C_1) = u_axi[:n_R], u_axi[n_R:]
+    M_xR, M_xxi = get_sf(x, 2)
+    Q_xR, Q_xxi = get_sf(x, 1)
+    w_xR, w_xxi = get_sf(x, 4)
+    # the reactions and loads at the right end act only beyond the beam
+    at_end_x = x[:, np.newaxis] >= L
+    at_end_xR = at_end_x & (np.array([x_s for _, _, x_s, _ in supports]) >= L)
+    at_end_xxi = at_end_x & (xi[np.newaxis, :] >= L)
+    M_xR, Q_xR = np.where(at_end_xR, 0, M_xR), np.where(at_end_xR, 0, Q_xR)
+    Q_xxi = np.where(at_end_xxi, 0, Q_xxi)
+    return (M_xxi + M_xR @ R_Rxi, Q_xxi + Q_xR @ R_Rxi,
+            w_xxi + w_xR @ R_Rxi + C_0 + np.outer(x, C_1))
+
+
+def get_moving_load_envelopes(x, config, P, a, n_positions=1001, EI=1.):
+    '''
+    Envelopes of the moment, shear force and deflection at x for a train
+    of point loads P (in the convention of BeamDesign.F) with the distances
+    a >= 0 behind the leading load moving across the beam. The leading load
+    is placed at n_positions from the left end to the position where the
+    last load leaves the beam. The influence lines are evaluated at all
+    load positions at once and superposed per position of the train.
+    Returns the dictionary of the arrays of shape (n_x,) with the keys
+    'M_min', 'M_max', 'Q_min', 'Q_max', 'w_min', 'w_max' and the
+    positions 'p' of the leading load.
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    P_k = np.atleast_1d(np.asarray(P, dtype=np.float64))
+    a_k = np.atleast_1d(np.asarray(a, dtype=np.float64))
+    if P_k.shape != a_k.shape or np.any(a_k < 0):
+        raise ValueError('the loads P and the non-negative distances a must have equal lengths')
+    p = np.linspace(0, x[-1] + np.max(a_k), n_positions)
+    xi_pk = p[:, np.newaxis] - a_k[np.newaxis, :]
+    envelopes = {'p': p}
+    for name, IL_xxi, scale in zip('MQw', get_influence_lines(x, xi_pk.flatten(), config),
+                                   [1, 1, 1 / EI]):
+        u_xp = IL_xxi.reshape(len(x), n_positions, len(P_k)) @ P_k * scale
+        envelopes[name + '_min'] = np.min(u_xp, axis=1)
+        envelopes[name + '_max'] = np.max(u_xp, axis=1)
+    return envelopes
+
+
+def get_x_nodes(L, config):
+    '''
+    Positions of the loads and of the supports within the beam, where the
+    moment profile has kinks or the kinematic conditions apply, and the
+    midpoints between the supports
+    '''
+    terms = get_load_terms(L, config)
+    x_s = np.unique([start for name, _, start, _ in terms if name != 'F'])
+    return np.unique(np.hstack([[0., L], (x_s[1:] + x_s[:-1]) / 2] +
+                               [start for _, _, start, _ in terms if 0 <= start <= L]))
+
+
+def get_x_crossings(L, config, F, M_j, n_sample=2000):
+    '''
+    Positions where the moment profiles M(x, F) of the configuration attain
+    the moments M_j given in the convention of the cross section,
+    e.g. the cracking and yield moments. For an array of loads F, e.g. the
+    load levels of a load-deflection curve, the union of the positions
+    of all loads is returned.
+    '''
+    x = np.linspace(0, L, n_sample + 1)
+    get_M, _ = get_MQ_kernels(L, config)
+    M_j = np.asarray(M_j, dtype=np.float64)
+    x_c = [np.zeros(0)]
+    for F_ in np.atleast_1d(np.asarray(F, dtype=np.float64)):
+        # moments of the section are positive for sagging
+        dM_xj = (-get_M(x, F_) * np.ones_like(x))[:, np.newaxis] - M_j
+        i_c, j_c = np.nonzero((dM_xj[:-1] <= 0) != (dM_xj[1:] <= 0))
+        eta = dM_xj[i_c, j_c] / (dM_xj[i_c, j_c] - dM_xj[i_c + 1, j_c])
+        x_c.append(x[i_c] + eta * (x[i_c + 1] - x[i_c]))
+    return np.unique(np.hstack(x_c))
+
+
+def get_x_grid(L, n_x, x_nodes, x_refine=(), n_refine=0):
+    '''
+    Discretization of the beam with n_x points including the x_nodes,
+    e.g. the positions of the loads and supports. The remaining points
+    are distributed over the segments between the nodes proportionally
+    to their length. The positions x_refine, e.g. the cracking fronts,
+    are inserted as well and the intervals adjacent to them are
+    bisected n_refine times.
+    '''
+    x_nodes = np.unique(np.hstack([[0., L], np.clip(x_nodes, 0, L)]))
+    l_s = np.diff(x_nodes)
+    # at least one interval per segment, the rest by the largest remainders
+    n_s = np.ones(len(l_s), dtype=int)
+    n_free = max(n_x - 1 - len(l_s), 0)
+    share_s = n_free * l_s / L
+    n_s += np.floor(share_s).astype(int)
+    rest = n_free - (n_s.sum() - len(l_s))
+    n_s[np.argsort(np.floor(share_s) - share_s)[:rest]] += 1
+    x = np.unique(np.hstack([np.linspace(x_a, x_b, n + 1)
+                             for x_a, x_b, n in zip(x_nodes[:-1], x_nodes[1:], n_s)]))
+    x_refine = np.asarray(x_refine, dtype=np.float64)
+    x_refine = x_refine[(x_refine > 0) & (x_refine < L)]
+    x = np.unique(np.hstack([x, x_refine]))
+    # points closer than the tolerance are merged
+    x = x[np.hstack([True, np.diff(x) > 1e-9 * L])]
+    for _ in range(n_refine):
+        i = np.searchsorted(x, x_refine)
+        i_left = np.clip(i - 1, 0, len(x) - 2)
+        i_right = np.clip(i, 0, len(x) - 2)
+        i_intervals = np.unique(np.hstack([i_left, i_right]))
+        x = np.unique(np.hstack([x, (x[i_intervals] + x[i_intervals + 1]) / 2]))
+    return x
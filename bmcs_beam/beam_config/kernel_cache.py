@@ -0,0 +1,152 @@
+'''
+Persistent cache of the moment and shear kernels derived by the sympy Beam.
+The solved kernels are piecewise polynomials of the load F and of the
+position along the beam. They are stored as data - the breakpoints and the
+polynomial coefficients of a beam of unit length - and rebuilt into NumPy
+functions, so that fresh processes, e.g. short-lived workers, load the
+kernels without solving the statical system again. No code is read from
+the cache. The data of a beam of unit length serve all lengths of the
+configuration with the same ratio of the load distance to the length.
+
+The files are stored in the shared cache directory of bmcs_beam.cache and
+written atomically, so that concurrent workers can share the directory.
+'''
+
+import hashlib
+import os
+import tempfile
+import warnings
+import zipfile
+
+import numpy as np
+
+from bmcs_beam.cache import get_cache_dir
+
+CACHE_VERSION = 2
+'''Version of the format of the cached data - stored in the file names,
+so that a change of the format invalidates the existing files
+'''
+
+DATA_NAMES = ('xi', 'M_coeffs', 'Q_coeffs', 'e_M')
+'''Breakpoints xi = x / L of the intervals, the coefficients of the
+polynomials in xi per interval (highest power first) for a beam of unit
+length and a unit load, and the exponent of L in the moment M(x, F)
+'''
+
+
+def get_cache_file(key):
+    '''
+    Path of the cached data for the key (beam_conf_name, L, first_load_distance).
+    The file depends on the ratio of the load distance to the length only.
+    '''
+    conf, L, first_load_distance = key
+    digest = hashlib.sha1(repr((CACHE_VERSION, conf.name,
+                                float(first_load_distance) / float(L))).encode()).hexdigest()[:16]
+    return os.path.join(get_cache_dir(), 'MQ_v%d_%s_%s.npz' % (CACHE_VERSION, conf.name, digest))
+
+
+def get_kernel_data(M_, Q_, x, L, e_M):
+    '''
+    Data of the kernels for the moment M_ and the shear force Q_ of the
+    solved sympy beam of length L per unit load, given in terms of
+    singularity functions of x. The moment scales with L**e_M, the shear
+    force with L**(e_M - 1).
+    '''
+    import sympy as sp
+    xi = sp.Symbol('xi')
+    offsets = {float(f.args[1]) / L for expr in (M_, Q_) for f in expr.atoms(sp.SingularityFunction)}
+    xi_k = np.unique(np.clip(np.hstack([[0.], sorted(offsets)]), 0, 1))
+    # the last interval extends beyond the end of the beam
+    xi_mid = np.hstack([(xi_k[:-1] + xi_k[1:]) / 2, [xi_k[-1] + 1]])
+
+    def get_coeffs(expr, e):
+        coeffs = []
+        for xi_m in xi_mid:
+            # singularity functions within the interval of xi_m, the
+            # concentrated terms of negative order vanish
+            expr_k = expr.replace(
+                lambda f: isinstance(f, sp.SingularityFunction),
+                lambda f: (f.args[0] - f.args[1]) ** f.args[2]
+                if f.args[2] >= 0 and float(f.args[1]) / L <= xi_m else 0)
+            poly = sp.Poly(sp.expand(expr_k.subs(x, xi * L) / L ** e), xi)
+            coeffs.append([float(c) for c in poly.all_coeffs()])
+        n_p = max(len(c) for c in coeffs)
+        return np.array([[0.] * (n_p - len(c)) + c for c in coeffs])
+
+    return dict(xi=xi_k, M_coeffs=get_coeffs(M_, e_M), Q_coeffs=get_coeffs(Q_, e_M - 1),
+                e_M=np.float64(e_M))
+
+
+def make_kernels(data, L):
+    '''
+    Kernels (get_M, get_Q) of the beam of length L rebuilt from the data
+    '''
+    xi_k = data['xi']
+    L = float(L)
+
+    def make_kernel(coeffs_kp, e):
+        def get_fn(x, F):
+            xi = np.asarray(x, dtype=np.float64) / L
+            k = np.clip(np.searchsorted(xi_k, xi, side='right') - 1, 0, len(xi_k) - 1)
+            value = np.zeros_like(xi)
+            for coeffs_k in coeffs_kp.T:
+                value = value * xi + coeffs_k[k]
+            return F * L ** e * value
+        return get_fn
+
+    e_M = float(data['e_M'])
+    return make_kernel(data['M_coeffs'], e_M), make_kernel(data['Q_coeffs'], e_M - 1)
+
+
+def _check_data(data):
+    n_k = len(data['xi'])
+    if data['xi'].ndim != 1 or np.any(np.diff(data['xi']) <= 0) or \
+            data['M_coeffs'].shape[0] != n_k or data['Q_coeffs'].shape[0] != n_k:
+        raise ValueError('inconsistent kernel data')
+
+
+def load_kernel_data(key):
+    '''
+    Data stored for the key or None if they are not cached
+    or the cached file cannot be read
+    '''
+    path = get_cache_file(key)
+    try:
+        with np.load(path) as npz:
+            data = {name: npz[name] for name in DATA_NAMES}
+        _check_data(data)
+        return data
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+        warnings.warn('ignoring the cached kernels %s: %s' % (path, e))
+        return None
+
+
+def save_kernel_data(key, data):
+    '''
+    Store the data of the kernels for the key. Failures to write
+    the cache are reported as warnings, the kernels remain usable in memory.
+    '''
+    path = get_cache_file(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp.npz', dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        warnings.warn('cannot write the kernel cache %s: %s' % (path, e))
+
+
+def clear_cache():
+    '''
+    Remove all cached kernels including the files of the previous formats,
+    e.g. the generated modules of version 1
+    '''
+    cache_dir = get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return
+    for name in os.listdir(cache_dir):
+        if name.startswith('MQ_v') and name.endswith(('.npz', '.py')):
+            os.remove(os.path.join(cache_dir, name))
@@ -0,0 +1,63 @@
+'''
+Test the compiled moment and shear kernels of the beam design.
+'''
+
+from bmcs_beam.api import BeamDesign, BoundaryConfig
+from bmcs_beam.beam_config.beam_design import MQ_KERNELS
+
+import numpy as np
+import sympy as sp
+
+
+def get_MQ_sympy(bd):
+    '''Reference solution lambdified from the numerically loaded beam.
+    '''
+    bd.solve_beam_for_reactions()
+    x = sp.symbols('x')
+    M_ = bd.beam.bending_moment().rewrite(sp.Piecewise)
+    Q_ = bd.beam.shear_force().rewrite(sp.Piecewise)
+    ones_x = np.ones_like(bd.x)
+    return (sp.lambdify(x, M_, 'numpy')(bd.x) * ones_x,
+            sp.lambdify(x, Q_, 'numpy')(bd.x) * ones_x)
+
+
+def test_MQ_kernels():
+    '''The kernels must reproduce the sympy solution for all configurations.
+    '''
+    for MQ_backend in ['closed_form', 'sympy']:
+        bd = BeamDesign(L=3000, F=-2000, n_x=61, MQ_backend=MQ_backend)
+        check_MQ_kernels(bd)
+
+
+def check_MQ_kernels(bd):
+    for conf in BoundaryConfig:
+        bd.beam_conf_name = conf
+        M_ref, Q_ref = get_MQ_sympy(bd)
+        M_x, Q_x = bd.get_M_x(), bd.get_Q_x()
+        # Dirac terms of the support moments are omitted in the closed form
+        finite = np.isfinite(Q_ref)
+        assert np.allclose(M_x, M_ref, atol=1e-6 * np.max(np.fabs(M_ref)))
+        assert np.allclose(Q_x[finite], Q_ref[finite],
+                           atol=1e-6 * np.max(np.fabs(Q_ref[finite])))
+        M_xF = bd.get_M_xF([-2000, -4000])
+        assert np.allclose(M_xF[:, 1], 2 * M_x)
+
+
+def test_MQ_kernels_reused():
+    '''Repeated evaluations must not compile new kernels.
+    '''
+    bd = BeamDesign(L=3100)
+    bd.get_M_x()
+    n_kernels = len(MQ_KERNELS)
+    bd.F = -3000
+    bd.get_M_x()
+    bd.get_Q_xF([-1000, -2000])
+    assert len(MQ_KERNELS) == n_kernels
+    bd.L = 3200
+    bd.get_M_x()
+    assert len(MQ_KERNELS) == n_kernels + 1
+
+
+if __name__ == '__main__':
+    test_MQ_kernels()
+    test_MQ_kernels_reused()
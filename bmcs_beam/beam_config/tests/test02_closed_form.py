@@ -0,0 +1,72 @@
+'''
+Test the closed-form solution of the statical systems against the sympy Beam.
+'''
+
+from bmcs_beam.api import BoundaryConditions, BoundaryConfig
+
+import numpy as np
+import sympy as sp
+
+
+def test_reactions():
+    F = sp.symbols('F')
+    L = 4000
+    for conf in BoundaryConfig:
+        beam = BoundaryConditions.get_configured_beam(L, F, conf)
+        reactions_names = [load[0] for load in beam.applied_loads
+                           if isinstance(load[0], sp.Symbol) and load[0] != F]
+        beam.solve_for_reaction_loads(*reactions_names)
+        reactions = BoundaryConditions.get_reactions(L, -1000, conf)
+        for name, value in beam.reaction_loads.items():
+            assert np.isclose(float(value.subs(F, -1000)), reactions[str(name)])
+
+
+def test_elastic_deflection():
+    '''Compare with sympy where available and check the support conditions.
+    '''
+    x, E, I = sp.symbols('x, E, I')
+    L, F, EI = 6., -2., 3.
+    x_x = np.linspace(0, L, 61)
+    for conf in [BoundaryConfig.THREE_PB, BoundaryConfig.FOUR_PB,
+                 BoundaryConfig.SIMPLE_BEAM_DIST_LOAD, BoundaryConfig.SINGLE_MOMENT]:
+        beam = BoundaryConditions.get_configured_beam(L, F, conf)
+        reactions_names = [load[0] for load in beam.applied_loads
+                           if isinstance(load[0], sp.Symbol)]
+        beam.solve_for_reaction_loads(*reactions_names)
+        w_ = beam.deflection().subs({E: EI, I: 1}).rewrite(sp.Piecewise)
+        w_ref = sp.lambdify(x, w_, 'numpy')(x_x)
+        w_x = BoundaryConditions.get_w_kernel(L, conf)(x_x, F, EI)
+        assert np.allclose(w_x, w_ref)
+
+    get_w = BoundaryConditions.get_w_kernel(L, BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    assert np.allclose(get_w(np.array([0, L / 3, 2 * L / 3, L]), F, EI), 0)
+
+    get_w = BoundaryConditions.get_w_kernel(L, BoundaryConfig.THREE_PB_FIXED_SUPPORT)
+    assert np.isclose(get_w(L / 2, F, EI), F * L ** 3 / (192 * EI))
+    dx = 1e-6 * L
+    assert np.isclose((get_w(dx, F, EI) - get_w(0., F, EI)) / dx, 0, atol=1e-5)
+
+
+def test_M_max():
+    '''The maximum moment must match the moment kernels for a batch of beams.
+    '''
+    L = np.array([3000., 4500., 6000.])
+    load_distance = np.array([0., 1000., 4000.])
+    for conf in BoundaryConfig:
+        M_max = BoundaryConditions.get_M_max(L, conf, load_distance)
+        for j in range(len(L)):
+            conf.first_load_distance = load_distance[j]
+            try:
+                get_M, _ = BoundaryConditions.get_MQ_kernels(L[j], conf)
+            finally:
+                conf.first_load_distance = 0
+            x = np.linspace(0, L[j], 3001)
+            assert np.isclose(np.max(np.fabs(get_M(x, 1.) * np.ones_like(x))), M_max[j])
+    configs = np.array([conf.value for conf in BoundaryConfig])
+    assert BoundaryConditions.get_M_max(3000., configs).shape == configs.shape
+
+
+if __name__ == '__main__':
+    test_reactions()
+    test_elastic_deflection()
+    test_M_max()
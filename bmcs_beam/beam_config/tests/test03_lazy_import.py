@@ -0,0 +1,45 @@
+'''
+Test the lazy loading of the names exported by the packages.
+'''
+
+import subprocess
+import sys
+
+import bmcs_beam.api
+import bmcs_beam.beam_config
+
+
+def get_loaded_modules(code, modules=('sympy', 'matplotlib', 'bmcs_cross_section', 'traitsui')):
+    '''Heavy modules loaded by the code in a fresh interpreter
+    '''
+    code += '; import sys; print(sorted(m for m in %r if m in sys.modules))' % (modules,)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return out.stdout.strip()
+
+
+def test_lazy_api():
+    assert get_loaded_modules('import bmcs_beam.api') == '[]'
+    assert get_loaded_modules('from bmcs_beam.api import BoundaryConfig, BoundaryConditions; '
+                              'BoundaryConditions.get_M_max(3000., BoundaryConfig.THREE_PB)') == '[]'
+    assert get_loaded_modules('from bmcs_beam.api import BoundaryConfig, BoundaryConditions; '
+                              'BoundaryConditions.get_configured_beam(3000., -1., BoundaryConfig.THREE_PB)') \
+        == "['sympy']"
+
+
+def test_exported_names():
+    for module in [bmcs_beam.api, bmcs_beam.beam_config]:
+        assert set(module.__all__) <= set(dir(module))
+        for name in module.__all__:
+            assert getattr(module, name).__name__ == name
+    assert bmcs_beam.api.BoundaryConfig is bmcs_beam.beam_config.BoundaryConfig
+    try:
+        bmcs_beam.api.BeamDesing
+    except AttributeError:
+        pass
+    else:
+        assert False, 'unknown names must raise AttributeError'
+
+
+if __name__ == '__main__':
+    test_lazy_api()
+    test_exported_names()
@@ -0,0 +1,67 @@
+'''
+Test the influence lines and the envelopes of moving loads.
+'''
+
+from bmcs_beam.api import BeamDesign, BoundaryConfig
+from bmcs_beam.beam_config import closed_form
+
+import numpy as np
+
+
+def test_influence_lines():
+    '''The influence lines superpose to the closed-form solution
+    of the configurations and satisfy the reciprocity of deflections.
+    '''
+    L = 3000
+    x = np.linspace(0, L, 61)
+    for conf in BoundaryConfig:
+        terms = closed_form.get_load_terms(L, conf)
+        loads = [(value, start) for name, value, start, order in terms
+                 if name == 'F' and order == -1]
+        if not loads:
+            continue
+        get_M, get_Q = closed_form.get_MQ_kernels(L, conf)
+        M_xxi, Q_xxi, _ = closed_form.get_influence_lines(x, [start for _, start in loads], conf)
+        values = np.array([value for value, _ in loads])
+        # values on the left side of the end support at x = L
+        x_ = np.hstack([x[:-1], L * (1 - 1e-12)])
+        assert np.allclose(M_xxi @ values, get_M(x_, 1.), atol=1e-9 * L)
+        assert np.allclose(Q_xxi @ values, get_Q(x_, 1.) * np.ones_like(x))
+    # distributed load over the continuous beam
+    xi = np.linspace(0, L, 6001)
+    M_xxi, _, w_xxi = closed_form.get_influence_lines(x, xi, BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    get_M, _ = closed_form.get_MQ_kernels(L, BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    assert np.allclose(np.trapz(M_xxi, xi, axis=1), get_M(x, 1.), atol=1e-5 * L ** 2)
+    _, _, w_xx = closed_form.get_influence_lines(x, x, BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    assert np.allclose(w_xx, w_xx.T, atol=1e-9 * np.max(np.fabs(w_xx)))
+
+
+def test_moving_load_envelopes():
+    bd = BeamDesign(L=3000, n_x=31, beam_conf_name=BoundaryConfig.THREE_PB)
+    x = bd.x
+    # single load - the maximum moment at x occurs with the load at x
+    env = bd.get_moving_load_envelopes([-1000.], [0.], n_positions=301)
+    assert np.allclose(env['M_min'], -1000 * x * (3000 - x) / 3000)
+    assert np.allclose(env['M_max'], 0)
+    # axle train over the continuous beam compared with the loop over positions
+    bd.beam_conf_name = BoundaryConfig.THREE_SPAN_DIST_LOAD
+    P, a = np.array([-100., -200., -200.]), np.array([0., 300., 450.])
+    env = bd.get_moving_load_envelopes(P, a, n_positions=201, EI=2.)
+    u_pxk = [bd.get_influence_lines(p - a) for p in env['p']]
+    M_xp = np.array([M_xk @ P for M_xk, _, _ in u_pxk]).T
+    w_xp = np.array([w_xk @ P for _, _, w_xk in u_pxk]).T / 2
+    assert np.allclose(env['M_min'], M_xp.min(axis=1)) and np.allclose(env['M_max'], M_xp.max(axis=1))
+    assert np.allclose(env['w_max'], w_xp.max(axis=1))
+    # hogging moments at the inner supports
+    assert env['M_max'][10] > 0 and env['M_min'][5] < 0
+    # clamping moments at both ends of the fixed beam, maximum for the load at L/3
+    bd.beam_conf_name = BoundaryConfig.THREE_PB_FIXED_SUPPORT
+    M_xxi, _, _ = bd.get_influence_lines([1000., 2000.])
+    assert np.allclose(M_xxi[[0, -1]], [[-4000 / 9, -2000 / 9], [-2000 / 9, -4000 / 9]])
+    env = bd.get_moving_load_envelopes([-1.], [0.], n_positions=301)
+    assert np.allclose(env['M_max'][[0, -1]], 4 * 3000 / 27) and np.allclose(env['M_min'][[0, -1]], 0)
+
+
+if __name__ == '__main__':
+    test_influence_lines()
+    test_moving_load_envelopes()
@@ -0,0 +1,75 @@
+'''
+Test the persistent cache of the kernels of the sympy backend.
+'''
+
+import os
+import warnings
+
+from bmcs_beam.api import BeamDesign, BoundaryConfig, StageProfiler
+from bmcs_beam.beam_config import kernel_cache
+from bmcs_beam.beam_config.beam_design import MQ_KERNELS
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('BMCS_BEAM_CACHE_DIR', str(tmp_path))
+    MQ_KERNELS.clear()
+    yield str(tmp_path)
+    MQ_KERNELS.clear()
+
+
+def test_kernel_cache(cache_dir):
+    bd = BeamDesign(L=3300, n_x=41, MQ_backend='sympy', MQ_disk_cache=True,
+                    beam_conf_name=BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    bd_ref = BeamDesign(L=3300, n_x=41, beam_conf_name=BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    with StageProfiler() as prof:
+        M_x = bd.get_M_x()
+    assert prof.get_report()['BeamDesign.MQ_disk_cache']['misses'] == 1
+    key = (bd.beam_conf_name, bd.L, 0)
+    assert os.path.exists(kernel_cache.get_cache_file(key))
+    atol = 1e-9 * np.max(np.fabs(M_x))
+    assert np.allclose(M_x, bd_ref.get_M_x(), atol=atol)
+    # warm start without solving the sympy beam
+    MQ_KERNELS.clear()
+    with StageProfiler() as prof:
+        assert np.allclose(bd.get_M_x(), M_x)
+        assert np.allclose(bd.get_Q_x(), bd_ref.get_Q_x(), atol=atol / bd.L)
+    report = prof.get_report()
+    assert report['BeamDesign.MQ_disk_cache']['hits'] == 1
+    assert 'BeamDesign.sympy_solve' not in report
+    # the data of the unit length serve other lengths with the same
+    # ratio of the load distance
+    bd_L = BeamDesign(L=4800, n_x=41, MQ_backend='sympy', MQ_disk_cache=True,
+                      beam_conf_name=BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    bd_L_ref = BeamDesign(L=4800, n_x=41, beam_conf_name=BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    assert kernel_cache.get_cache_file((bd_L.beam_conf_name, bd_L.L, 0)) == kernel_cache.get_cache_file(key)
+    with StageProfiler() as prof:
+        M_L_x = bd_L.get_M_x()
+        assert np.allclose(M_L_x, bd_L_ref.get_M_x(), atol=1e-9 * np.max(np.fabs(M_L_x)))
+        assert np.allclose(bd_L.get_Q_x(), bd_L_ref.get_Q_x(), atol=1e-9 * np.max(np.fabs(M_L_x)) / bd_L.L)
+    assert 'BeamDesign.sympy_solve' not in prof.get_report()
+    # a damaged file is replaced
+    with open(kernel_cache.get_cache_file(key), 'wb') as f:
+        f.write(b'def get_M(x, F):\n    return (\n')
+    MQ_KERNELS.clear()
+    with warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        assert np.allclose(bd.get_M_x(), M_x)
+    assert len(w) == 1
+    assert kernel_cache.load_kernel_data(key) is not None
+    # the files of the previous format are removed as well
+    with open(os.path.join(cache_dir, 'MQ_v1_THREE_PB_0123456789abcdef.py'), 'w') as f:
+        f.write('')
+    kernel_cache.clear_cache()
+    assert os.listdir(cache_dir) == []
+
+
+def test_kernel_cache_opt_in(cache_dir):
+    '''The sympy backend writes the cache only on request.
+    '''
+    bd = BeamDesign(L=3300, n_x=41, MQ_backend='sympy')
+    bd.get_M_x()
+    assert os.listdir(cache_dir) == []
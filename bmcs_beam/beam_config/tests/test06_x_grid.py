@@ -0,0 +1,45 @@
+'''
+Test the refined discretization of the beam.
+'''
+
+from bmcs_beam.api import BeamDesign, BoundaryConfig
+from bmcs_beam.beam_config import closed_form
+
+import numpy as np
+
+
+def test_x_grid():
+    L = 3000
+    x_nodes = closed_form.get_x_nodes(L, BoundaryConfig.FOUR_PB)
+    assert np.allclose(x_nodes, [0, 1000, 1500, 2000, 3000])
+    x = closed_form.get_x_grid(L, 11, x_nodes)
+    assert len(x) == 11 and np.all(np.isin(x_nodes, x))
+    # the crossings are inserted and their neighborhood is bisected
+    x_refine = closed_form.get_x_crossings(L, BoundaryConfig.THREE_PB, -1000, [3e5, -1e5])
+    assert np.allclose(x_refine, [600, 2400])
+    # union of the crossings for an array of loads
+    x_refine_F = closed_form.get_x_crossings(L, BoundaryConfig.THREE_PB, [-1000, -2000], [3e5])
+    assert np.allclose(x_refine_F, [300, 600, 2400, 2700])
+    x = closed_form.get_x_grid(L, 11, [0, 1500, L], x_refine, n_refine=2)
+    assert np.all(np.isin(x_refine, x)) and np.all(np.diff(x) > 0)
+    i = np.searchsorted(x, 600)
+    assert np.allclose(np.diff(x[i - 2:i + 3]), 75)
+
+
+def test_beam_design_x():
+    bd = BeamDesign(L=3000, n_x=11, beam_conf_name=BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    assert np.allclose(bd.x, np.linspace(0, 3000, 11))
+    bd.x_grid = 'refined'
+    assert len(bd.x) == 11 and np.all(np.isin([0, 1000, 2000, 3000], bd.x))
+    bd.M_refine = [1e5]
+    x = bd.x
+    assert len(x) > 11
+    bd.F = -2000
+    assert len(bd.x) == len(x) and not np.allclose(bd.x, x)
+    x_F = bd.get_x_F([-1000, -2000])
+    assert np.all(np.isin(bd.x, x_F)) and np.all(np.isin(x, x_F))
+
+
+if __name__ == '__main__':
+    test_x_grid()
+    test_beam_design_x()
@@ -0,0 +1,160 @@
+# Import Standard Libraries
+import hashlib
+import os
+import tempfile
+import warnings
+import zipfile
+import numpy as np
+
+# Import Local Libraries
+from bmcs_beam.cache import get_cache_dir
+try:
+	from . import Util_EC2 as EC2
+except ImportError:
+	import Util_EC2 as EC2
+
+#===========================================================================
+#   EC2 Design tables with dimensionless coefficients
+#===========================================================================
+# The tables relate the relative moment mu_Eds = M_Ed/(b*d**2*fcd) of a
+# rectangular section to the mechanical reinforcement ratio omega, the
+# relative depth of the neutral axis xi = Xu/d and the lever arm ratio
+# zeta = z/d with the stress block (alpha, beta) of RectangularBeam and a
+# bilinear steel. The limit mu_lim at the ductility limit of xi replaces the
+# limit ko = 0.167 of the design routine in EC2.py - above it, compression
+# reinforcement is required. The tables are generated once per concrete
+# class and steel grade, stored in the cache directory and interpolated for
+# arrays of sections. Units are N, mm and MPa.
+
+TABLE_VERSION = 1
+
+gamma_c = 1.5
+gamma_S = 1.15
+
+_tables = {}
+
+
+def get_table_file(fck, fyk, Es, n_xi):
+	""" Input:	fck, fyk, Es, n_xi as in generate_table
+		Output:	path of the cached table in the cache directory """
+	digest = hashlib.sha1(repr((TABLE_VERSION, float(fck), float(fyk), float(Es),
+		int(n_xi))).encode()).hexdigest()[:16]
+	return os.path.join(get_cache_dir(), "EC2_table_v{:d}_C{:g}_B{:g}_{}.npz".format(
+		TABLE_VERSION, fck, fyk, digest))
+
+
+def generate_table(fck, fyk, Es=200000, n_xi=1000):
+	""" Input:	fck = char. comp. strength of concrete
+				fyk = char. yield stress of reinforcement
+				Es = modulus of reinforcement
+				n_xi = number of rows
+		Output:	table {column: array} with the rows over xi up to the
+				ductility limit xi_lim and the scalars mu_lim, xi_lim,
+				ecu3, fcd and fyd """
+	[alpha, beta] = EC2.alpha_beta(fck)
+	ecu3 = EC2.ultimate_strain(fck)
+	fcd = fck/gamma_c
+	fyd = fyk/gamma_S
+	xi_lim = EC2.max_neutral_axis(1, fck, fyd)
+	xi = np.linspace(0, xi_lim, n_xi)
+	with np.errstate(divide="ignore"):
+		eps_s1 = ecu3*(1-xi)/xi
+	sigma_s1 = np.minimum(Es*eps_s1, fyd)
+	table = dict(xi=xi, mu=alpha*xi*(1-beta*xi), omega=alpha*xi*fyd/sigma_s1,
+		zeta=1-beta*xi, eps_s1=eps_s1, sigma_s1=sigma_s1)
+	table.update(mu_lim=table["mu"][-1], xi_lim=xi_lim, ecu3=ecu3, fcd=fcd, fyd=fyd)
+	return table
+
+
+def get_table(fck, fyk, Es=200000, n_xi=1000):
+	""" Input:	fck, fyk, Es, n_xi as in generate_table
+		Output:	table of generate_table taken from the memory, from the
+				cache directory or generated and stored there """
+	key = (float(fck), float(fyk), float(Es), int(n_xi))
+	table = _tables.get(key)
+	if table is not None:
+		return table
+	path = get_table_file(*key)
+	try:
+		with np.load(path) as npz:
+			table = {name: npz[name][()] for name in npz.files}
+	except FileNotFoundError:
+		pass
+	except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+		warnings.warn("ignoring the cached design table {}: {}".format(path, e))
+		table = None
+	if table is None:
+		table = generate_table(*key)
+		_save_table(path, table)
+	_tables[key] = table
+	return table
+
+
+def _save_table(path, table):
+	try:
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		fd, tmp_path = tempfile.mkstemp(suffix=".tmp.npz", dir=os.path.dirname(path))
+		with os.fdopen(fd, "wb") as f:
+			np.savez(f, **table)
+		os.replace(tmp_path, path)
+	except OSError as e:
+		warnings.warn("cannot write the design table {}: {}".format(path, e))
+
+
+def clear_tables():
+	""" Remove the tables from the memory and from the cache directory """
+	_tables.clear()
+	cache_dir = get_cache_dir()
+	if not os.path.isdir(cache_dir):
+		return
+	for name in os.listdir(cache_dir):
+		if name.startswith("EC2_table_v{:d}_".format(TABLE_VERSION)) and name.endswith(".npz"):
+			os.remove(os.path.join(cache_dir, name))
+
+
+def required_reinforcement(M_Ed, b, d, fck, fyk, Es=200000, d2=None, n_xi=1000):
+	""" Input:	M_Ed = design moment [Nmm]
+				b, d = width and effective depth of the section
+				fck = char. comp. strength of concrete
+				fyk = char. yield stress of reinforcement
+				Es = modulus of reinforcement
+				d2 = depth of the compression reinforcement (default = 0.1 d),
+				smaller than d
+				all arguments are arrays of the sections or scalars
+		Output:	columnar table {name: array} with mu, xi, zeta, omega and
+				the tension and compression reinforcement As1, As2
+
+	The coefficients are interpolated in the tables of the distinct pairs
+	of fck and fyk. Above mu_lim, the section is designed at xi_lim and
+	the remaining moment is taken by the compression reinforcement. """
+	M_Ed, b, d, fck, fyk, Es = np.broadcast_arrays(
+		*(np.asarray(x, dtype=np.float64) for x in (M_Ed, b, d, fck, fyk, Es)))
+	d2 = 0.1*d if d2 is None else np.broadcast_to(np.asarray(d2, dtype=np.float64), d.shape)
+	if np.any(d2 >= d):
+		raise ValueError("the compression reinforcement must lie above the tension "
+			"reinforcement, d2 < d")
+	fcd = fck/gamma_c
+	fyd = fyk/gamma_S
+	mu = M_Ed/(b*d**2*fcd)
+	columns = {name: np.empty_like(mu)
+		for name in ("mu_lim", "xi", "zeta", "omega", "sigma_s1", "sigma_s2")}
+	materials, inverse = np.unique(np.stack([fck.ravel(), fyk.ravel(), Es.ravel()]), axis=1,
+		return_inverse=True)
+	inverse = inverse.reshape(mu.shape)
+	for i, (fck_i, fyk_i, Es_i) in enumerate(materials.T):
+		table = get_table(fck_i, fyk_i, Es_i, n_xi)
+		mask = inverse == i
+		mu_i = np.minimum(mu[mask], table["mu_lim"])
+		columns["mu_lim"][mask] = table["mu_lim"]
+		for name in ("xi", "zeta", "omega", "sigma_s1"):
+			columns[name][mask] = np.interp(mu_i, table["mu"], table[name])
+		eps_s2 = table["ecu3"]*(1-d2[mask]/(table["xi_lim"]*d[mask]))
+		columns["sigma_s2"][mask] = np.clip(Es_i*eps_s2, 0, table["fyd"])
+	# moment exceeding mu_lim taken by the compression reinforcement
+	Delta_M = np.maximum(mu-columns["mu_lim"], 0)*b*d**2*fcd
+	with np.errstate(divide="ignore", invalid="ignore"):
+		As2 = np.where(Delta_M > 0, Delta_M/((d-d2)*columns["sigma_s2"]), 0)
+		As1 = columns["omega"]*b*d*fcd/fyd \
+			+ np.where(Delta_M > 0, Delta_M/((d-d2)*columns["sigma_s1"]), 0)
+	return dict(mu=mu, xi=columns["xi"], zeta=columns["zeta"], omega=columns["omega"],
+		As1=As1, As2=As2)
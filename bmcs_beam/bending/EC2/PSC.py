@@ -1,12 +1,17 @@
 # Import Standard Libraries
 import logging
-import scipy as np
+import numpy as np
 import matplotlib.pyplot as plt
 
 # Import Local Libraries
-import Util_ACI as ACI
-import Util_EC2 as EC2
-from RC import ReinforcedBeam
+try:
+	from . import Util_ACI as ACI
+	from . import Util_EC2 as EC2
+	from .RC import ReinforcedBeam
+except ImportError:
+	import Util_ACI as ACI
+	import Util_EC2 as EC2
+	from RC import ReinforcedBeam
 
 
 #===========================================================================
@@ -177,6 +182,81 @@ class PrestressedBeam(ReinforcedBeam):
 			plt.xlim((-1.2*fcd, 2*fcd))
 		return MRd
 
+	#---------------------------------------------------------------------------
+	#   EC2 Equations - Batch design
+	#---------------------------------------------------------------------------
+
+	@classmethod
+	def EC2_design_table(cls, bf, hf, bw, d_P, e_P, Ap, Pm, fck, fpk, Ep,
+			d_S=0, As=0, fyk=500, Es=200000, k=0, units="MPa"):
+		""" Input:	bf, hf, bw, d_P, e_P, Ap, Pm, fck, fpk, Ep,
+					d_S, As, fyk, Es, k = arrays of the sections (or scalars
+					broadcasted to them) with the meaning of the attributes,
+					hf = inf for rectangular sections of width bf
+					units = "MPa" or "psi" (default = "MPa")
+			Output:	columnar table {name: array} with the neutral axis Xu,
+					the stresses fp, fs, the design moment MRd and the flag
+					converged of the EC2_design_moment without plotting
+
+		Within the compression zone in the flange and below it, Xu is
+		linear in fp from the horizontal equilibrium and fp is linear in
+		the strain ep, so that the fixed point of EC2_design_moment is the
+		single positive root of a quadratic equation in Xu. The roots of
+		both cases are evaluated for all sections at once, the root in the
+		flange is taken if it lies in the flange. If the jump of Xu at the
+		transition to the T-section leaves no consistent root, there is no
+		equilibrium, the iteration of EC2_design_moment ends in a cycle
+		and converged is False. """
+		bf, hf, bw, d_P, e_P, Ap, Pm, fck, fpk, Ep, d_S, As, fyk, Es, k = np.broadcast_arrays(
+			*(np.asarray(x, dtype=np.float64) for x in
+			  (bf, hf, bw, d_P, e_P, Ap, Pm, fck, fpk, Ep, d_S, As, fyk, Es, k)))
+		alpha, beta = EC2.alpha_beta(fck, units)
+		la, eta = EC2.lambda_eta(fck, units)
+		ecu3 = EC2.ultimate_strain(fck, units)
+		fcd = fck/cls.gamma_c
+		fyd = fyk/cls.gamma_S
+		fp01d = 0.9*fpk/cls.gamma_P
+		fpd = fpk/cls.gamma_P
+		epy = fp01d/Ep
+		epu = 0.035
+		ey = fyd/Es
+		sigma_p = Pm/Ap
+		E_pd = (fpd-fp01d)/(epu-epy)
+		# flange of the T-section, none for rectangular sections
+		hf_T = np.where(np.isfinite(hf), hf, 0)
+
+		# Xu = a*fp + b from the horizontal equilibrium and
+		# fp = c + K*(d_P-Xu)/Xu from the strain of the tendon
+		c = fp01d + (sigma_p/Ep-epy)*E_pd
+		K = ecu3*E_pd
+
+		def get_Xu(a, b):
+			p = a*(c-K) + b
+			return p/2 + np.sqrt(p**2/4 + a*d_P*K)
+
+		a_rect = Ap/(alpha*bf*fcd)
+		Xu_rect = get_Xu(a_rect, 0)
+		a_T = Ap/(eta*fcd*bw*la)
+		Xu_T = get_Xu(a_T, -eta*fcd*hf_T*(bf-bw)*a_T/Ap)
+		in_flange = Xu_rect < hf
+		Xu = np.where(in_flange, Xu_rect, Xu_T)
+		fp = c + K*(d_P-Xu)/Xu
+		# the neutral axis of the T-section has to lie below the flange
+		converged = in_flange | (Xu_T > hf)
+		fs = fyd + ((d_S-Xu)*ecu3/Xu-ey)*k
+
+		# Moment capacity with the compression zone in or below the flange
+		Delta_P = Ap*fp - Pm
+		Ns = As*fs
+		y1_rect = d_P - e_P - beta*Xu
+		MRd_rect = alpha*bf*Xu*fcd*y1_rect + Ns*(d_S-y1_rect-beta*Xu)
+		X = la*Xu
+		y1_T = d_P - e_P - hf_T/2
+		MRd_T = ((bf-bw)*hf_T*fcd*y1_T + bw*X*fcd*(d_P-e_P-X/2) +
+				 Ns*(d_P-y1_T-hf_T/2))
+		MRd = np.where(in_flange, MRd_rect, MRd_T) + Delta_P*e_P
+		return dict(Xu=Xu, fp=fp, fs=fs, MRd=MRd, converged=converged)
+
 	def rotation_capacity(self):
 		pass
 
@@ -0,0 +1,163 @@
+# Import Standard Libraries
+import logging
+import numpy as np
+from scipy.optimize import brentq
+
+# Import Local Libraries
+try:
+	from . import Util_EC2 as EC2
+	from .RC import ReinforcedBeam
+except ImportError:
+	import Util_EC2 as EC2
+	from RC import ReinforcedBeam
+
+
+#===========================================================================
+#   Polygonal Section
+#===========================================================================
+
+class PolygonSection(ReinforcedBeam):
+	""" Ultimate moment of an arbitrary polygonal concrete section with
+	layers of reinforcing steel and bonded tendons according to EC2 with
+	the rectangular stress block (lambda, eta).
+
+	Instance Members:
+		outline = vertices (y, z) of the section, z = depth below the top
+		voids = list of the vertices of the voids
+		steel = list of the layers (d, As) of the reinforcement
+		tendons = list of the layers (d, Ap, Pm) of the tendons
+		fck, fyk, fpk, Es, Ep, units = materials
+
+	Public Methods:
+		[A, S] = get_compression_zone(self, s)
+		N = get_N(self, Xu)
+		Xu = solve_Xu(self)
+		MRd = EC2_design_moment(self)
+
+	Static Methods:
+		tee_outline(bf, hf, bw, H)
+	"""
+
+	gamma_P = 1.1
+
+	def __init__(self, outline, voids=(), steel=(), tendons=(), fck=30, fyk=500,
+				 fpk=1860, Es=200000, Ep=195000, units="MPa", name=None):
+		self.outline = np.asarray(outline, dtype=np.float64)
+		self.voids = [np.asarray(void, dtype=np.float64) for void in voids]
+		self.H = np.max(self.outline[:, 1]) - np.min(self.outline[:, 1])
+		ReinforcedBeam.__init__(self, name)
+		self.steel = np.asarray(steel, dtype=np.float64).reshape(-1, 2)
+		self.tendons = np.asarray(tendons, dtype=np.float64).reshape(-1, 3)
+		self.fck, self.fyk, self.fpk = fck, fyk, fpk
+		self.Es, self.Ep, self.units = Es, Ep, units
+		self._init_width_table()
+
+	@staticmethod
+	def tee_outline(bf, hf, bw, H):
+		""" Input:	bf, hf = width and height of the flange
+					bw = width of the web
+					H = height of the section
+			Output:	vertices (y, z) of the T-section """
+		return [(-bf/2, 0), (bf/2, 0), (bf/2, hf), (bw/2, hf),
+				(bw/2, H), (-bw/2, H), (-bw/2, hf), (-bf/2, hf)]
+
+	@staticmethod
+	def get_width(polygon, z):
+		""" Input:	polygon = vertices (y, z)
+					z = array of depths
+			Output:	b = width of the polygon at the depths z as the sum
+					of the signed crossings of the edges """
+		y0, z0 = polygon.T
+		y1, z1 = np.roll(y0, -1), np.roll(z0, -1)
+		z = np.asarray(z, dtype=np.float64)[..., np.newaxis]
+		crossing = (np.minimum(z0, z1) <= z) & (z < np.maximum(z0, z1))
+		# horizontal edges are never crossed
+		dz = np.where(z1 == z0, 1, z1 - z0)
+		y = y0 + (z - z0)*(y1 - y0)/dz
+		return np.fabs(np.sum(np.where(crossing, y*np.sign(z1 - z0), 0), axis=-1))
+
+	def _init_width_table(self):
+		""" The width is linear between the depths of the vertices, the area
+		A and the first moment S about the top of the section above the
+		depth s are integrated analytically within these intervals """
+		z_top = np.min(self.outline[:, 1])
+		polygons = [self.outline] + self.voids
+		z_k = np.unique(np.hstack([polygon[:, 1] for polygon in polygons])) - z_top
+		dz = np.diff(z_k)
+		# width at the start of the intervals and its slope from the
+		# interior points of the intervals
+		z_13, z_23 = z_k[:-1] + dz/3 + z_top, z_k[:-1] + 2*dz/3 + z_top
+		b_13, b_23 = (self.get_width(self.outline, z) -
+					  sum(self.get_width(void, z) for void in self.voids) for z in (z_13, z_23))
+		b1 = (b_23 - b_13)*3/dz
+		b0 = b_13 - b1*dz/3
+		A_k = np.hstack([0, np.cumsum(b0*dz + b1*dz**2/2)])
+		S_k = np.hstack([0, np.cumsum(b0*(z_k[:-1]*dz + dz**2/2) + b1*(z_k[:-1]*dz**2/2 + dz**3/3))])
+		self.z_k, self.b0, self.b1, self.A_k, self.S_k = z_k, b0, b1, A_k, S_k
+
+	def get_compression_zone(self, s):
+		""" Input:	s = array of depths of the compression zone
+			Output:	A = area of the section above s
+					S = first moment of the area about the top """
+		s = np.clip(np.asarray(s, dtype=np.float64), 0, self.z_k[-1])
+		k = np.clip(np.searchsorted(self.z_k, s, side='right') - 1, 0, len(self.b0) - 1)
+		z, b0, b1 = self.z_k[k], self.b0[k], self.b1[k]
+		t = s - z
+		A = self.A_k[k] + b0*t + b1*t**2/2
+		S = self.S_k[k] + b0*(z*t + t**2/2) + b1*(z*t**2/2 + t**3/3)
+		return [A, S]
+
+	def design_parameters(self):
+		[la, eta] = EC2.lambda_eta(self.fck, self.units)
+		ecu3 = EC2.ultimate_strain(self.fck, self.units)
+		fcd = self.fck/self.gamma_c
+		fyd = self.fyk/self.gamma_S
+		fp01d = 0.9*self.fpk/self.gamma_P
+		fpd = self.fpk/self.gamma_P
+		return [la, eta, ecu3, fcd, fyd, fp01d, fpd]
+
+	def get_forces(self, Xu):
+		""" Input:	Xu = array of depths of the neutral axis
+			Output:	Nc = compressive force of concrete
+					Sc = its moment about the top
+					Ts, Tp = tensile forces of the steel and tendon layers """
+		[la, eta, ecu3, fcd, fyd, fp01d, fpd] = self.design_parameters()
+		Xu = np.asarray(Xu, dtype=np.float64)[..., np.newaxis]
+		[A, S] = self.get_compression_zone(la*Xu[..., 0])
+		# elastic-perfectly plastic steel
+		d_s, As = self.steel.T
+		es = (d_s - Xu)*ecu3/Xu
+		Ts = As*self.Es*np.clip(es, -fyd/self.Es, fyd/self.Es)
+		# bilinear tendons with the prestrain of Pm and the inclined
+		# branch up to epu
+		d_p, Ap, Pm = self.tendons.T
+		epy, epu = fp01d/self.Ep, 0.035
+		ep = Pm/(Ap*self.Ep) + (d_p - Xu)*ecu3/Xu
+		fp = np.where(ep < epy, self.Ep*ep, fp01d + (ep - epy)*(fpd - fp01d)/(epu - epy))
+		Tp = Ap*fp
+		return [eta*fcd*A, eta*fcd*S, Ts, Tp]
+
+	def get_N(self, Xu):
+		""" Input:	Xu = array of depths of the neutral axis
+			Output:	N = compression minus tension, increasing with Xu """
+		[Nc, Sc, Ts, Tp] = self.get_forces(Xu)
+		return Nc - np.sum(Ts, axis=-1) - np.sum(Tp, axis=-1)
+
+	def solve_Xu(self, xtol=1e-9):
+		""" Output:	Xu = depth of the neutral axis in equilibrium found by
+					the bracketing of the root of get_N """
+		Xu_lo, Xu_hi = 1e-6*self.H, 10*self.H
+		if self.get_N(Xu_lo) > 0 or self.get_N(Xu_hi) < 0:
+			raise ValueError("no equilibrium of the section {}".format(self.name))
+		return brentq(self.get_N, Xu_lo, Xu_hi, xtol=xtol*self.H)
+
+	def EC2_design_moment(self):
+		""" Output:	MRd = moment of the internal forces in equilibrium,
+					including the tendon force of the prestress - the moment
+					of PrestressedBeam.EC2_design_moment is MRd - Pm*e_P """
+		Xu = self.solve_Xu()
+		[Nc, Sc, Ts, Tp] = self.get_forces(Xu)
+		MRd = Ts @ self.steel[:, 0] + Tp @ self.tendons[:, 0] - Sc
+		logging.info("    Xu = {:6.2f}, Nc = {:6.2f}".format(Xu, Nc))
+		logging.info("    MRd = {:5.2f}".format(MRd))
+		return MRd
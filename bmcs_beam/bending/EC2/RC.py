@@ -1,11 +1,15 @@
 # Import Standard Libraries
 from abc import ABCMeta, abstractmethod
 import logging
-import scipy as np
+import numpy as np
 
 # Import Local Libraries
-import Util_ACI as ACI
-import Util_EC2 as EC2
+try:
+	from . import Util_ACI as ACI
+	from . import Util_EC2 as EC2
+except ImportError:
+	import Util_ACI as ACI
+	import Util_EC2 as EC2
 
 
 #===========================================================================
@@ -111,14 +115,10 @@ class RectangularBeam(ReinforcedBeam):
 		n = self.Es/Ec
 		logging.debug("    fr = {:6.2f}, Es/Ec = {:3.2f}".format(fr, n))
 
-		Ac = self.b*self.h
-		As = (n-1)*self.As
-		logging.debug("    b*h = {:6.2f}, (n-1)*As = {:6.2f}".format(Ac, As))
+		logging.debug("    b*h = {:6.2f}, (n-1)*As = {:6.2f}".format(
+			self.b*self.h, (n-1)*self.As))
 
-		y_bott = (Ac*self.h/2 + As*(self.h-self.d))/(Ac+As)
-		I_uncr = self.b*self.h**3/12\
-			+ Ac*(self.h/2-y_bott)**2\
-			+ As*(y_bott-(self.h-self.d))**2
+		y_bott, I_uncr = self.uncracked_section(self.b, self.h, self.d, self.As, n)
 		logging.debug("    Botton to NA: y_bott = {:6.2f}".format(y_bott))
 		logging.debug("    Moment of inertia = {:10.2f} ".format(I_uncr))
 
@@ -129,18 +129,14 @@ class RectangularBeam(ReinforcedBeam):
 	def ACI_elastic_moment(self):
 
 		Ec = ACI.elastic_modulus(self.fck, self.rho, self.units)
-		fc = 0.5*self.fck
 		n = self.Es/Ec
-		As = n*self.As
-		fs = self.fyk/n
-		logging.debug("    n = {:3.2f}, n*As = {:6.2f}".format(n, As))
+		logging.debug("    n = {:3.2f}, n*As = {:6.2f}".format(n, n*self.As))
 
-		kd = (-As+np.sqrt(As**2+2*self.b*As*self.d))/(self.b)
-		Icr = self.b*kd**3/12 + self.b*kd*(kd/2)**2 + As*(self.d-kd)**2
+		kd, Icr = self.cracked_section(self.b, self.d, self.As, n)
 		logging.debug("    Top to NA: kd = {:6.2f}".format(kd))
 		logging.debug("    Moment of inertia = {:10.2f}".format(Icr))
 
-		Mel = min(fc*Icr/kd, fs*Icr/(self.d-kd))
+		Mel = self.elastic_moment(self.fck, self.fyk, self.d, kd, Icr, n)
 		logging.info("    Mel = {:5.2f}".format(Mel))
 		return Mel
 
@@ -158,6 +154,41 @@ class RectangularBeam(ReinforcedBeam):
 		logging.info("    MRd = {:5.2f}".format(MRd))
 		return MRd
 
+	#---------------------------------------------------------------------------
+	#   Section properties - shared by the single and the batch design
+	#---------------------------------------------------------------------------
+
+	@staticmethod
+	def uncracked_section(b, h, d, As, n):
+		""" Input:	b, h, d, As = section dimensions and steel area
+					n = Es/Ec modular ratio
+			Output:	y_bott = distance of the neutral axis from the bottom
+					I_uncr = moment of inertia of the uncracked section """
+		Ac = b*h
+		As_n = (n-1)*As
+		y_bott = (Ac*h/2 + As_n*(h-d))/(Ac+As_n)
+		I_uncr = b*h**3/12 + Ac*(h/2-y_bott)**2 + As_n*(y_bott-(h-d))**2
+		return y_bott, I_uncr
+
+	@staticmethod
+	def cracked_section(b, d, As, n):
+		""" Input:	b, d, As = section width, effective depth and steel area
+					n = Es/Ec modular ratio
+			Output:	kd = distance of the neutral axis from the top
+					Icr = moment of inertia of the cracked section """
+		As_n = n*As
+		kd = (-As_n+np.sqrt(As_n**2+2*b*As_n*d))/b
+		Icr = b*kd**3/12 + b*kd*(kd/2)**2 + As_n*(d-kd)**2
+		return kd, Icr
+
+	@staticmethod
+	def elastic_moment(fck, fyk, d, kd, Icr, n):
+		""" Input:	fck, fyk = material strengths, d = effective depth
+					kd, Icr = cracked section, n = Es/Ec modular ratio
+			Output:	Mel = moment at the concrete stress 0.5*fck
+					or at the steel yield stress """
+		return np.minimum(0.5*fck*Icr/kd, fyk/n*Icr/(d-kd))
+
 	#---------------------------------------------------------------------------
 	#   EC2 Equations
 	#---------------------------------------------------------------------------
@@ -170,14 +201,10 @@ class RectangularBeam(ReinforcedBeam):
 		n = self.Es/Ec
 		logging.debug("    fr = {:6.2f}, Es/Ec = {:3.2f}".format(fr, n))
 
-		Ac = self.b*self.h
-		As = (n-1)*self.As
-		logging.debug("    b*h = {:6.2f}, (n-1)*As = {:6.2f}".format(Ac, As))
+		logging.debug("    b*h = {:6.2f}, (n-1)*As = {:6.2f}".format(
+			self.b*self.h, (n-1)*self.As))
 
-		y_bott = (Ac*self.h/2 + As*(self.h-self.d))/(Ac+As)
-		I_uncr = self.b*self.h**3/12\
-			+ Ac*(self.h/2-y_bott)**2\
-			+ As*(y_bott-(self.h-self.d))**2
+		y_bott, I_uncr = self.uncracked_section(self.b, self.h, self.d, self.As, n)
 		logging.debug("    Botton to NA: y_bott = {:6.2f}".format(y_bott))
 		logging.debug("    Moment of inertia = {:10.2f} ".format(I_uncr))
 
@@ -188,18 +215,14 @@ class RectangularBeam(ReinforcedBeam):
 	def EC2_elastic_moment(self):
 
 		Ec = EC2.elastic_modulus(self.fck, self.units)
-		fc = 0.5*self.fck
 		n = self.Es/Ec
-		As = n*self.As
-		fs = self.fyk/n
-		logging.debug("    n = {:3.2f}, n*As = {:6.2f}".format(n, As))
+		logging.debug("    n = {:3.2f}, n*As = {:6.2f}".format(n, n*self.As))
 
-		kd = (-As+np.sqrt(As**2+2*self.b*As*self.d))/(self.b)
-		Icr = self.b*kd**3/12 + self.b*kd*(kd/2)**2 + As*(self.d-kd)**2
+		kd, Icr = self.cracked_section(self.b, self.d, self.As, n)
 		logging.debug("    Top to NA: kd = {:6.2f}".format(kd))
 		logging.debug("    Moment of inertia = {:10.2f}".format(Icr))
 
-		Mel = min(fc*Icr/kd, fs*Icr/(self.d-kd))
+		Mel = self.elastic_moment(self.fck, self.fyk, self.d, kd, Icr, n)
 		logging.info("    Mel = {:5.2f}".format(Mel))
 		return Mel
 
@@ -220,6 +243,47 @@ class RectangularBeam(ReinforcedBeam):
 		logging.info("    MRd = {:5.2f}".format(MRd))
 		return MRd
 
+	#---------------------------------------------------------------------------
+	#   EC2 Equations - Batch design
+	#---------------------------------------------------------------------------
+
+	@classmethod
+	def EC2_design_table(cls, b, h, d, As, fck, fyk, Es, units="MPa"):
+		""" Input:	b, h, d, As, fck, fyk, Es = arrays of the sections
+					(or scalars broadcasted to them)
+					units = "MPa" or "psi" (default = "MPa")
+			Output:	columnar table {name: array} with the neutral axis Xu,
+					the design moment MRd, the cracking moment Mcr, the elastic
+					moment Mel, the ductility limit Xu_max, the steel area
+					limits A_min, A_max and the boolean checks ductile,
+					As_min_ok and As_max_ok of the EC2 methods without logging """
+		b, h, d, As, fck, fyk, Es = np.broadcast_arrays(
+			*(np.asarray(x, dtype=np.float64) for x in (b, h, d, As, fck, fyk, Es)))
+
+		# design moment
+		alpha, beta = EC2.alpha_beta(fck, units)
+		fcd = fck/cls.gamma_c
+		fyd = fyk/cls.gamma_S
+		Xu = As*fyd/(alpha*b*fcd)
+		MRd = As*fyd*(d-beta*Xu)
+		Xu_max = EC2.max_neutral_axis(d, fck, fyd, units)
+		A_min, A_max = EC2.steel_area_limits(fck, fyk, b, d, h, Xu_max, units)
+
+		# cracking moment of the uncracked section
+		Ec = EC2.elastic_modulus(fck, units)
+		fr = EC2.flex_tensile_strength(fck, h, units)
+		n = Es/Ec
+		y_bott, I_uncr = cls.uncracked_section(b, h, d, As, n)
+		Mcr = fr*I_uncr/y_bott
+
+		# elastic moment of the cracked section
+		kd, Icr = cls.cracked_section(b, d, As, n)
+		Mel = cls.elastic_moment(fck, fyk, d, kd, Icr, n)
+
+		return dict(Xu=Xu, MRd=MRd, Mcr=Mcr, Mel=Mel, Xu_max=Xu_max,
+					A_min=A_min, A_max=A_max, ductile=Xu < Xu_max,
+					As_min_ok=As > A_min, As_max_ok=As < A_max)
+
 
 class DoublyReinforcedBeam():
 	a = 2
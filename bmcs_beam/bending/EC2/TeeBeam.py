@@ -1,12 +1,17 @@
 # Import Standard Libraries
 import logging
-import scipy as np
+import numpy as np
 import matplotlib.pyplot as plt
 
 # Import Local Libraries
-import Util_ACI as ACI
-import Util_EC2 as EC2
-from PSC import PrestressedBeam
+try:
+	from . import Util_ACI as ACI
+	from . import Util_EC2 as EC2
+	from .PSC import PrestressedBeam
+except ImportError:
+	import Util_ACI as ACI
+	import Util_EC2 as EC2
+	from PSC import PrestressedBeam
 
 #===========================================================================
 #   T Beam
@@ -1,13 +1,18 @@
 # Import Standard Libraries
 import logging
-import scipy as np
+import numpy as np
 
 # Import Local Libraries
-from Utilities import *
+try:
+    from .Utilities import *
+except ImportError:
+    from Utilities import *
 
 #===========================================================================
 #   ACI Equations - Material properties
 #===========================================================================
+# The material functions accept scalars or arrays of fck, rho and units and
+# are evaluated element-wise, the scalar input returns a scalar.
 
 
 def elastic_modulus(fck, rho=145, units="psi"):
@@ -18,7 +23,7 @@ def elastic_modulus(fck, rho=145, units="psi"):
     fck = convert_2_psi(fck, units)
     rho = convert_2_pcf(rho, units)
     Ec = 33*rho**1.5*np.sqrt(fck)
-    return Ec if units == "psi" else convert_2_MPa(Ec, "psi")
+    return convert_psi_2(Ec, units)
 
 
 def tensile_strength(fck, units="psi"):
@@ -28,7 +33,7 @@ def tensile_strength(fck, units="psi"):
     fck = convert_2_psi(fck, units)
     la = 1  # lambda factor necessary
     fctm = 7.5*la*np.sqrt(fck)
-    return fctm if units == "psi" else convert_2_MPa(fctm, "psi")
+    return convert_psi_2(fctm, units)
 
 
 def ultimate_strain(fck, units="psi"):
@@ -36,7 +41,7 @@ def ultimate_strain(fck, units="psi"):
                 units = "MPa" or "psi" (default = "psi") 
         Output: ecu = ultimate strain of concrete """
     fck = convert_2_psi(fck, units)
-    return 3/1000
+    return np.full_like(fck, 3/1000)[()]
 
 #===========================================================================
 #   ACI Equations - Parameters
@@ -49,7 +54,7 @@ def beta(fck, units="psi"):
         Output: beta_1 = a/c in Whitney stress block """
     fck = convert_2_psi(fck, units)
     beta1 = 0.85-0.05*(fck-4000)/1000
-    return min(max(beta1, 0.65), 0.85)
+    return np.clip(beta1, 0.65, 0.85)[()]
 
 
 #===========================================================================
@@ -1,13 +1,18 @@
 # Import Standard Libraries
 import logging
-import scipy as np
+import numpy as np
 
 # Import Local Libraries
-from Utilities import *
+try:
+    from .Utilities import *
+except ImportError:
+    from Utilities import *
 
 #===========================================================================
 #   EC2 Equations - Material properties
 #===========================================================================
+# The material functions accept scalars or arrays of fck, h and units and
+# are evaluated element-wise, the scalar input returns a scalar.
 
 
 def elastic_modulus(fck, units="MPa"):
@@ -17,7 +22,13 @@ def elastic_modulus(fck, units="MPa"):
     fck = convert_2_MPa(fck, units)
     fcm = fck+8
     Ec = 22000*(fcm/10)**0.3
-    return Ec if units == "MPa" else convert_2_psi(Ec, "MPa")
+    return convert_MPa_2(Ec, units)
+
+
+def _tensile_strength(fck):
+    """ fctm [MPa] for fck [MPa] """
+    fcm = fck+8
+    return np.where(fck <= 50, 0.3*fck**(2/3), 2.12*np.log(1+fcm/10))
 
 
 def tensile_strength(fck, units="MPa"):
@@ -25,9 +36,7 @@ def tensile_strength(fck, units="MPa"):
                 units = "MPa" or "psi" (default = "MPa")
         Output: fctm = mean tensile strength of concrete """
     fck = convert_2_MPa(fck, units)
-    fcm = fck+8
-    fctm = 0.3*fck**(2/3) if fck <= 50 else 2.12*np.log(1+fcm/10)
-    return fctm if units == "MPa" else convert_2_psi(fctm, "MPa")
+    return convert_MPa_2(_tensile_strength(fck), units)
 
 
 def flex_tensile_strength(fck, h, units="MPa"):
@@ -36,10 +45,10 @@ def flex_tensile_strength(fck, h, units="MPa"):
                 units = "MPa" or "psi" (default = "MPa") 
         Output: fctm,fl = mean tensile strength for flexure """
     fck = convert_2_MPa(fck, units)
-    fctm = tensile_strength(fck)
+    fctm = _tensile_strength(fck)
     h = convert_2_mm(h, units)
-    fctm = min((1.6-h/1000)*fctm, fctm)
-    return fctm if units == "MPa" else convert_2_psi(fctm, "MPa")
+    fctm = np.minimum((1.6-h/1000)*fctm, fctm)
+    return convert_MPa_2(fctm, units)
 
 
 def ultimate_strain(fck, units="MPa"):
@@ -48,7 +57,7 @@ def ultimate_strain(fck, units="MPa"):
         Output: ecu3 = ultimate tensile strain """
     fck = convert_2_MPa(fck, units)
     ecu3 = 2.6+35*((90-fck)/100)**4
-    return min(ecu3, 3.5)/1000
+    return (np.minimum(ecu3, 3.5)/1000)[()]
 
 #===========================================================================
 #   EC2 Equations - Parameters
@@ -63,7 +72,7 @@ def alpha_beta(fck, units="MPa"):
     fck = convert_2_MPa(fck, units)
     alpha = np.ceil((9E-05*fck**2 - 0.0177*fck + 1.4032)*100)/100
     beta = np.ceil((4E-05*fck**2 - 0.0071*fck + 0.634)*100)/100
-    return [min(alpha, 0.75), min(beta, 0.39)]
+    return [np.minimum(alpha, 0.75)[()], np.minimum(beta, 0.39)[()]]
 
 
 def lambda_eta(fck, units="MPa"):
@@ -72,15 +81,26 @@ def lambda_eta(fck, units="MPa"):
         Output: la = (height of compressive zone)/Xu
                 eta = factor for "Whitney" stress block """
     fck = convert_2_MPa(fck, units)
-    la = min(0.8-(fck-50)/400, 0.8)
-    eta = min(1-(fck-50)/200, 1.0)
-    return [la, eta]
+    la = np.minimum(0.8-(fck-50)/400, 0.8)
+    eta = np.minimum(1-(fck-50)/200, 1.0)
+    return [la[()], eta[()]]
 
 #===========================================================================
 #   EC2 Equations - Maximum reinforcement (Ductility)
 #===========================================================================
 
 
+def max_neutral_axis(d, fck, fyd, units="MPa"):
+    """ Input:  d = dist. from comp. to reinforcement
+                fck = char. comp. strength of concrete
+                fyd = design steel yield stress
+                units = "MPa" or "psi" (default = "MPa")
+        Output: Xu_max = Max. dist. to neutral axis (arrays accepted) """
+    fck, fyd = convert_2_MPa(fck, units), convert_2_MPa(fyd, units)
+    ecu = ultimate_strain(fck)  # units="MPa"
+    return (np.minimum(ecu*10**6/(ecu*10**6+7*fyd), 0.535)*np.asarray(d))[()]
+
+
 def ductility_requirement(Xu, d, fck, fyd, units="MPa"):
     """ Input:  Xu = dist. from comp. to neutral axis 
                 d = dist. from comp. to reinforcement
@@ -88,10 +108,7 @@ def ductility_requirement(Xu, d, fck, fyd, units="MPa"):
                 fyd = design steel yield stress
                 units = "MPa" or "psi" (default = "MPa")
         Output: Xu_max = Max. dist. to neutral axis """
-    [fck, fyd] = convert_2_MPa(np.array([fck, fyd]), units)
-    
-    ecu = ultimate_strain(fck)  # units="MPa"
-    Xu_max = min(ecu*10**6/(ecu*10**6+7*fyd), 0.535)*d
+    Xu_max = max_neutral_axis(d, fck, fyd, units)
     if Xu < Xu_max:
         logging.info(
             "    Xu = {:6.2f} < Xu_max = {:6.2f}. OK".format(Xu, Xu_max))
@@ -105,9 +122,8 @@ def ductility_requirement(Xu, d, fck, fyd, units="MPa"):
 #===========================================================================
 
 
-def steel_ratio(As, fck, fyk, b, d, h, Xu, units="MPa"):
-    """ Input:  As = area of reinforcement steel
-                fck = char. comp. strength of concrete
+def steel_area_limits(fck, fyk, b, d, h, Xu, units="MPa"):
+    """ Input:  fck = char. comp. strength of concrete
                 fyk = char. yield stress of reinforcement
                 b = width of beam portion in compression
                 d = dist. from comp. to reinforcement
@@ -115,21 +131,33 @@ def steel_ratio(As, fck, fyk, b, d, h, Xu, units="MPa"):
                 Xu = maximum dist. to neutral axis
                 units = "MPa" or "psi" (default = "MPa")
         Output: A_min = minimum reinforcement area
-                A_max = maximum reinforcement area """
-    [fck, fyk] = convert_2_MPa(np.array([fck, fyk]), units)
-    [b, d, h, Xu] = convert_2_mm(np.array([b, d, h, Xu]), units)
-    As = convert_2_mm2(As, units)
+                A_max = maximum reinforcement area (arrays accepted) """
+    fck, fyk = convert_2_MPa(fck, units), convert_2_MPa(fyk, units)
+    b, d, h, Xu = (convert_2_mm(x, units) for x in (b, d, h, Xu))
 
     fctm = flex_tensile_strength(fck, h)  # units="MPa"
-    A_min = max((0.26*fctm/fyk),0.0013)* (b*d)
-    
+    A_min = np.maximum((0.26*fctm/fyk), 0.0013) * (b*d)
 
     fcd = fck/1.5
     fyd = fyk/1.15
 
     alpha = alpha_beta(fck)[0]  # units="MPa"
-    A_max = min(alpha*(fcd/fyd)*b*Xu, 0.4*b*d)
+    A_max = np.minimum(alpha*(fcd/fyd)*b*Xu, 0.4*b*d)
 
-    compare_steel_area(As, A_min, A_max)
+    return [convert_mm2_2(A_min, units), convert_mm2_2(A_max, units)]
 
-    return [A_min, A_max] if units == "MPa" else [A_min/(25.4**2), A_max/(25.4**2)]
+
+def steel_ratio(As, fck, fyk, b, d, h, Xu, units="MPa"):
+    """ Input:  As = area of reinforcement steel
+                fck = char. comp. strength of concrete
+                fyk = char. yield stress of reinforcement
+                b = width of beam portion in compression
+                d = dist. from comp. to reinforcement
+                h = height of reinforced concrete beam
+                Xu = maximum dist. to neutral axis
+                units = "MPa" or "psi" (default = "MPa")
+        Output: A_min = minimum reinforcement area
+                A_max = maximum reinforcement area """
+    [A_min, A_max] = steel_area_limits(fck, fyk, b, d, h, Xu, units)
+    compare_steel_area(As, A_min, A_max)
+    return [A_min, A_max]
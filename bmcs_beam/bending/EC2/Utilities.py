@@ -1,54 +1,73 @@
 # Import Standard Libraries
 import logging
+import numpy as np
 
 #===========================================================================
 #   Utilities
 #===========================================================================
+# The conversions accept scalars or arrays of values and of units, e.g. for
+# the scans over arrays of concrete grades. The units are checked once and
+# the values converted element-wise.
 
 
-def convert_2_psi(fck, units):
-    if units not in ["MPa", "psi"]:
+def check_units(units):
+    units = np.asarray(units)
+    if not np.all((units == "MPa") | (units == "psi")):
         raise KeyError("Only psi or MPa")
-    return fck if units == "psi" else 145.038*fck
+    return units
+
+
+def _convert(x, units, factor, to_units):
+    """ x given in units converted by factor unless units == to_units """
+    units = check_units(units)
+    x = np.asarray(x, dtype=np.float64)
+    return np.where(units == to_units, x, factor*x)[()]
+
+
+def convert_2_psi(fck, units):
+    return _convert(fck, units, 145.038, "psi")
 
 
 def convert_2_in(h, units):
-    if units not in ["MPa", "psi"]:
-        raise KeyError("Only psi or MPa")
-    return h if units == "psi" else h/25.4
+    return _convert(h, units, 1/25.4, "psi")
 
 
 def convert_2_in2(A, units):
-    if units not in ["MPa", "psi"]:
-        raise KeyError("Only psi or MPa")
-    return A if units == "psi" else A/(25.4**2)
+    return _convert(A, units, 1/(25.4**2), "psi")
 
 
 def convert_2_pcf(rho, units):
-    if units not in ["MPa", "psi"]:
-        raise KeyError("Only psi or MPa")
-    if units == "psi":
-        return rho
-    elif units == "MPa" and rho != 145:
-        return 6.366*rho
+    """ rho = 145 is taken as the default density in pcf for both units """
+    units = check_units(units)
+    rho = np.asarray(rho, dtype=np.float64)
+    return np.where((units == "psi") | (rho == 145), rho, 6.366*rho)[()]
 
 
 def convert_2_MPa(fck, units):
-    if units not in ["MPa", "psi"]:
-        raise KeyError("Only psi or MPa")
-    return fck if units == "MPa" else fck/145.038
+    return _convert(fck, units, 1/145.038, "MPa")
 
 
 def convert_2_mm(h, units):
-    if units not in ["MPa", "psi"]:
-        raise KeyError("Only psi or MPa")
-    return h if units == "MPa" else 25.4*h
+    return _convert(h, units, 25.4, "MPa")
 
 
 def convert_2_mm2(A, units):
-    if units not in ["MPa", "psi"]:
-        raise KeyError("Only psi or MPa")
-    return A if units == "MPa" else 25.4**2*A
+    return _convert(A, units, 25.4**2, "MPa")
+
+
+def convert_MPa_2(f, units):
+    """ f given in MPa converted to units """
+    return _convert(f, units, 145.038, "MPa")
+
+
+def convert_psi_2(f, units):
+    """ f given in psi converted to units """
+    return _convert(f, units, 1/145.038, "psi")
+
+
+def convert_mm2_2(A, units):
+    """ A given in mm2 converted to units """
+    return _convert(A, units, 1/(25.4**2), "MPa")
 
 def compare_steel_area(As,A_min,A_max):
     if As > A_min:
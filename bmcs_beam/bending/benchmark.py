@@ -0,0 +1,282 @@
+'''
+Timing and peak memory of the stages of the bending deflection pipeline
+for all beam configurations, several discretizations and the verification
+cases, preceded by the import times of the packages. The results are
+stored as JSON and compared with a baseline to detect performance
+regressions. The baseline is recorded locally in the cache directory,
+see bmcs_beam.cache, and is not part of the package. A baseline recorded
+on a different machine or environment is compared for information only.
+
+Usage:
+
+    python -m bmcs_beam.bending.benchmark --save-baseline
+    python -m bmcs_beam.bending.benchmark --output results.json
+    python -m bmcs_beam.bending.benchmark --quick --filter THREE_PB
+'''
+
+import argparse
+import collections
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from bmcs_beam.beam_config import beam_design
+from bmcs_beam.cache import get_cache_dir
+from bmcs_beam.beam_config.beam_design import BeamDesign
+from bmcs_beam.beam_config.boundary_conditions import BoundaryConditions, BoundaryConfig
+from bmcs_beam.bending.deflection_profile import DeflectionProfile
+from bmcs_beam.bending.verification_cases import VERIFICATION_CASES
+from bmcs_beam.version import __version__
+from bmcs_cross_section.api import BarLayer
+
+BASELINE_NAME = 'benchmark_baseline.json'
+
+ENVIRONMENT_KEYS = ('python', 'numpy', 'machine', 'node')
+'''Entries of the meta data that must coincide for a gating comparison
+'''
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'setup', 'run'])
+'''The stage run(state) is measured for a fresh state returned by setup()
+'''
+
+N_X = (101, 1001)
+N_LOAD_STEPS = (31, 101)
+
+IMPORT_STATEMENTS = (
+    'import bmcs_beam.api',
+    'import bmcs_beam.compute',
+    'from bmcs_beam.api import BoundaryConfig, BoundaryConditions',
+    'from bmcs_beam.api import BeamDesign',
+    'from bmcs_beam.api import DeflectionProfile',
+)
+'''Imports measured in a fresh interpreter including its startup
+'''
+
+
+def get_reference_dp(conf, n_x):
+    '''
+    Deflection profile of a reinforced concrete beam with a rectangular
+    section and reinforcement at both faces
+    '''
+    dp = DeflectionProfile()
+    dp.mc.low_kappa = -0.00005
+    dp.mc.high_kappa = 0.00005
+    dp.mc.cross_section_shape_.B = 200
+    dp.mc.cross_section_shape_.H = 300
+    dp.mc.cross_section_layout.add_layer(BarLayer(name='bottom', z=30, ds=16, count=3))
+    dp.mc.cross_section_layout.add_layer(BarLayer(name='top', z=270, ds=16, count=3))
+    dp.beam_design.beam_conf_name = _get_conf(conf)
+    dp.beam_design.n_x = n_x
+    return dp
+
+
+def _get_F(conf):
+    # the distributed load is given per unit length
+    return -1. if conf in (BoundaryConfig.SIMPLE_BEAM_DIST_LOAD,
+                           BoundaryConfig.THREE_SPAN_DIST_LOAD) else -10000.
+
+
+def _get_conf(conf):
+    # the load distance is an attribute of the shared enumeration member
+    conf.first_load_distance = 0
+    return conf
+
+
+def _run_import(statement):
+    subprocess.run([sys.executable, '-c', statement], check=True)
+
+
+def _get_beam_design(conf, n_x, MQ_backend, MQ_disk_cache=False):
+    # the compiled kernels are discarded to include their construction
+    bd = BeamDesign(beam_conf_name=_get_conf(conf), n_x=n_x, F=_get_F(conf),
+                    MQ_backend=MQ_backend, MQ_disk_cache=MQ_disk_cache)
+    if MQ_disk_cache:
+        # warm start of a fresh process with the kernels on disk
+        bd.get_MQ_kernels()
+    beam_design.MQ_KERNELS.clear()
+    return bd
+
+
+def _get_warm_dp(conf, n_x, n_load_steps=31):
+    # the moment-curvature relation is measured separately
+    dp = get_reference_dp(conf, n_x)
+    dp.n_load_steps = n_load_steps
+    dp.beam_design.F = _get_F(conf)
+    dp.kappa_M_table
+    return dp
+
+
+def get_benchmarks(n_x_list=N_X, n_load_steps_list=N_LOAD_STEPS):
+    '''
+    List of the benchmarks of the imports and of all stages for all beam
+    configurations and discretizations followed by the verification cases
+    '''
+    benchmarks = [Benchmark('import[%s]' % statement, lambda statement=statement: statement,
+                            _run_import) for statement in IMPORT_STATEMENTS]
+    benchmarks += [
+        Benchmark('DeflectionProfile.kappa_M_table',
+                  lambda: get_reference_dp(BoundaryConfig.THREE_PB, n_x_list[0]),
+                  lambda dp: dp.kappa_M_table)
+    ]
+    for conf in BoundaryConfig:
+        c = conf.name
+        benchmarks.append(Benchmark(
+            'BoundaryConditions.get_configured_beam[%s]' % c, lambda conf=conf: _get_conf(conf),
+            lambda conf: BoundaryConditions.get_configured_beam(5000, _get_F(conf), conf)))
+        benchmarks.append(Benchmark(
+            'BeamDesign.get_M_x[%s,sympy]' % c,
+            lambda conf=conf: _get_beam_design(conf, n_x_list[0], 'sympy'),
+            lambda bd: bd.get_M_x()))
+        benchmarks.append(Benchmark(
+            'BeamDesign.get_M_x[%s,sympy,disk_cache]' % c,
+            lambda conf=conf: _get_beam_design(conf, n_x_list[0], 'sympy', True),
+            lambda bd: bd.get_M_x()))
+        for n_x in n_x_list:
+            benchmarks.append(Benchmark(
+                'BeamDesign.get_M_x[%s,n_x=%d]' % (c, n_x),
+                lambda conf=conf, n_x=n_x: _get_beam_design(conf, n_x, 'closed_form'),
+                lambda bd: bd.get_M_x()))
+            get_dp = lambda conf=conf, n_x=n_x: _get_warm_dp(conf, n_x)
+            benchmarks += [
+                Benchmark('DeflectionProfile.get_kappa_x[%s,n_x=%d]' % (c, n_x), get_dp,
+                          lambda dp: dp.get_kappa_x()),
+                Benchmark('DeflectionProfile.get_w_x[%s,n_x=%d]' % (c, n_x), get_dp,
+                          lambda dp: dp.get_w_x()),
+                Benchmark('DeflectionProfile.F_max[%s,n_x=%d]' % (c, n_x), get_dp,
+                          lambda dp: dp.F_max),
+            ]
+            for n_load_steps in n_load_steps_list:
+                benchmarks.append(Benchmark(
+                    'DeflectionProfile.get_Fw[%s,n_x=%d,n_load_steps=%d]' % (c, n_x, n_load_steps),
+                    lambda conf=conf, n_x=n_x, n=n_load_steps: _get_warm_dp(conf, n_x, n),
+                    lambda dp: dp.get_Fw()))
+    for name, case in VERIFICATION_CASES.items():
+        benchmarks.append(Benchmark('verification.get_Fw[%s]' % name, case.get_dp,
+                                    lambda dp: dp.get_Fw()))
+    return benchmarks
+
+
+def run_benchmark(benchmark, repeat=3):
+    '''
+    Wall time of the stage for repeat fresh states and the peak of the
+    memory allocated by the stage within an additional traced run. A
+    warm-up run precedes the measurements, so that imports and module
+    level caches filled by the first call are not counted.
+    '''
+    benchmark.run(benchmark.setup())
+    times = []
+    for _ in range(repeat):
+        state = benchmark.setup()
+        t_start = time.perf_counter()
+        benchmark.run(state)
+        times.append(time.perf_counter() - t_start)
+    state = benchmark.setup()
+    tracemalloc.start()
+    try:
+        benchmark.run(state)
+        _, peak_mem = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return dict(t_min=min(times), t_median=statistics.median(times),
+                repeat=repeat, peak_mem=peak_mem)
+
+
+def run_benchmarks(benchmarks, repeat=3, name_filter='', log=None):
+    '''
+    Results of all benchmarks with the name containing name_filter
+    together with the description of the environment
+    '''
+    results = {}
+    for benchmark in benchmarks:
+        if name_filter not in benchmark.name:
+            continue
+        results[benchmark.name] = run_benchmark(benchmark, repeat)
+        if log:
+            log('%-80s %10.4f s %10.1f kB' % (benchmark.name, results[benchmark.name]['t_min'],
+                                              results[benchmark.name]['peak_mem'] / 1024))
+    meta = dict(version=__version__, python=platform.python_version(),
+                numpy=np.__version__, machine=platform.machine(),
+                node=platform.node(), date=datetime.datetime.now().isoformat())
+    return dict(meta=meta, results=results)
+
+
+def compare(results, baseline, time_factor=1.5, mem_factor=1.2, t_min=1e-3, mem_min=8192):
+    '''
+    Regressions of the results against the baseline as a list of tuples
+    (name, metric, baseline value, value). Times below t_min and memory
+    below mem_min bytes in both runs are considered as noise. Benchmarks
+    missing in one of the runs are skipped.
+    '''
+    regressions = []
+    base_results = baseline['results']
+    for name, result in results['results'].items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        if result['t_min'] > max(time_factor * base['t_min'], t_min):
+            regressions.append((name, 't_min', base['t_min'], result['t_min']))
+        if result['peak_mem'] > max(mem_factor * base['peak_mem'], mem_min):
+            regressions.append((name, 'peak_mem', base['peak_mem'], result['peak_mem']))
+    return regressions
+
+
+def is_same_environment(results, baseline):
+    '''
+    True if the results and the baseline were recorded in the same environment
+    '''
+    return all(results['meta'].get(key) == baseline['meta'].get(key) for key in ENVIRONMENT_KEYS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--quick', action='store_true',
+                        help='single discretization and run per benchmark')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--filter', default='', help='run benchmarks containing the string')
+    parser.add_argument('--output', help='JSON file of the results')
+    parser.add_argument('--baseline', default=os.path.join(get_cache_dir(), BASELINE_NAME))
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store the results as the new baseline')
+    parser.add_argument('--time-factor', type=float, default=1.5)
+    parser.add_argument('--mem-factor', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        benchmarks, repeat = get_benchmarks(N_X[:1], N_LOAD_STEPS[:1]), 1
+    else:
+        benchmarks, repeat = get_benchmarks(), args.repeat
+    results = run_benchmarks(benchmarks, repeat, args.filter, log=print)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=1)
+        return 0
+    if not os.path.exists(args.baseline):
+        print('no baseline %s, record it with --save-baseline' % args.baseline)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.time_factor, args.mem_factor)
+    for name, metric, base_value, value in regressions:
+        print('REGRESSION %s %s: %g -> %g (%.2fx)' % (name, metric, base_value, value,
+                                                       value / base_value))
+    if not is_same_environment(results, baseline):
+        print('baseline recorded in a different environment %s, the comparison is informational'
+              % {key: baseline['meta'].get(key) for key in ENVIRONMENT_KEYS})
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,10 +5,10 @@ from bmcs_utils.api import InteractiveModel, View, Item, Button, ButtonEditor, F
     mpl_align_yaxis, ParametricStudy
 from bmcs_utils.mpl_utils import mpl_align_xaxis
 
+from bmcs_beam import compute
 from bmcs_beam.beam_config.beam_design import BeamDesign
+from bmcs_beam.profiling import stage, record_cache, timed, cached_stage
 from bmcs_cross_section.mkappa import MKappa
-from scipy.integrate import cumtrapz
-import matplotlib.gridspec as gridspec
 
 from bmcs_beam.beam_config.boundary_conditions import BoundaryConditions, BoundaryConfig
 
@@ -28,92 +28,121 @@ class DeflectionProfile(InteractiveModel):
         Item('n_load_steps', latex='n_{\mathrm{load~steps}}')
     )
 
+    kappa_M_table = tr.Property(depends_on='mc, mc.state_changed')
+    '''
+    Monotone table of the inverse moment-curvature relation derived from
+    mc.inv_M_kappa. It is rebuilt only when the cross section or the material
+    of the moment-curvature model changes. Returns the strictly increasing
+    moments M_T, the corresponding curvatures kappa_T and the extreme
+    curvatures returned outside of the table.
+    '''
+    @cached_stage('DeflectionProfile.kappa_M_table')
+    def _get_kappa_M_table(self):
+        with stage('MKappa.inv_M_kappa'):
+            M_I, kappa_I = self.mc.inv_M_kappa
+        return compute.get_kappa_M_table(M_I, kappa_I)
+
+    def get_kappa_M(self, M):
+        '''
+        Curvature for an arbitrary array of moments, e.g. of shape (n_x, n_F),
+        interpolated in the cached kappa_M_table. Beyond the table, the extreme
+        curvatures are returned as in np.interp applied to mc.inv_M_kappa.
+        '''
+        return compute.get_kappa_M(M, self.kappa_M_table)
+
     def get_kappa_x(self):
         '''
         Profile of curvature along the beam
         '''
-        M = self.beam_design.get_M_x()
-        return self.mc.get_kappa_M(M)
-    
-    # def get_kappa_shrinkage(self):
-    #     '''
-    #     Calculate the shrinkage curvature based on EC2
-    #     '''
-    #     f_ck = 30
-    #     t = 365
-    #     t_s = 3
-    #
-    #     alpha_ds1 = 4
-    #     alpha_ds2 = 0.12
-    #
-    #     RH = 0.70
-    #     RH_0 = 1.00
-    #
-    #     f_cm = 30
-    #     f_cmo = 10
-    #     phi = 2.5
-    #     E_s = 200000
-    #     E_cm = 33000
-    #     S = 1000 * 300 ** 2 / 2
-    #     I = 1000 * 300 ** 3 / 12
-    #     A_c = 1000 * 300
-    #     u = 2 * (1000 + 300)
-    #
-    #     eps_ca_infty = 2.5 * (f_ck - 10) * 1e-6
-    #     beta_as_t = 1 - np.exp(- 0.2 * t ** 0.5)
-    #     eps_ca = beta_as_t * eps_ca_infty
-    #
-    #     beta_RH = 1.55 * (1 - (RH/RH_0)**3)
-    #     h_0 = 2 * A_c / u
-    #     beta_ds_t_t_s = (t - t_s) / ((t - t_s) + 0.04 * h_0 ** (3/2))
-    #     h_0_ = [100, 200 ,300, 500, 800]
-    #     k_h_ = [ 1, 0.85, 0.75, 0.7, 0.7 ]
-    #     k_h = np.interp(h_0, h_0_, k_h_)
-    #     eps_cd0 = 0.85 * ((220 + 110 * alpha_ds1) * np.exp(-alpha_ds2 * f_cm / f_cmo)) * 1e-6 * beta_RH
-    #     eps_cd = beta_ds_t_t_s * k_h * eps_cd0
-    #
-    #     eps_cs = eps_cd + eps_ca
-    #
-    #     E_c_eff = E_cm / (1 + phi)
-    #     alpha_e = E_s / E_c_eff
-    #     kappa_cs = eps_cs * alpha_e * S / I
-    #
-    #     kappa_cs_ = np.array([kappa_cs])
-    #     kappa_cs_x = np.zeros_like(self.get_kappa_x())
-    #     kappa_cs_x[:] = kappa_cs_
-    #
-    #     return kappa_cs_x
+        return self.get_kappa_xF([self.beam_design.F])[:, 0]
+
+    def get_kappa_xF(self, F):
+        '''
+        Profiles of curvature along the beam for an array of loads F,
+        returned as an array of shape (n_x, n_F)
+        '''
+        return self.solve_xF(F)[1]
 
     def get_phi_x(self):
         '''
         Calculate the cross sectional rotation by integrating the curvature
         '''
         # TODO rename phi to theta
-        kappa_x = self.get_kappa_x() #+ self.get_kappa_shrinkage()
-        # Kappa = 1/R = d_phi/d_x
-        phi_x = cumtrapz(kappa_x, self.beam_design.x, initial=0)
-        # resolve the integration constant by requiring zero curvature
-        # at the midspan of the beam
-        # TODO [SD] this is specific to 3 point bending - generalize
-        #           for other loading conditions.
-        #           HS: I guess this works for 4pb too (for symmetric beams)
-        phi_L2 = np.interp(self.beam_design.L / 2, self.beam_design.x, phi_x)
-        phi_x -= phi_L2
-        return phi_x
+        return self.get_phi_xF([self.beam_design.F])[:, 0]
+
+    def get_phi_xF(self, F):
+        '''
+        Cross sectional rotation for an array of loads F - shape (n_x, n_F)
+        '''
+        return self.solve_xF(F)[2]
 
     def get_w_x(self):
         '''
         Profile of deflection along the beam
         '''
-        phi_x = self.get_phi_x()
-        w_x = cumtrapz(phi_x, self.beam_design.x, initial=0)
-        # resolve the integration constant by requiring zero deflection
-        # at the left support - the right one comes automatically
-        # TODO [SR, HS] this is specific to 3 point bending - generalize
-        #           for other loading conditions.
-        #           HS: I guess this works for 4pb too (for symmetric beams)
-        w_x += w_x[0]
-        return w_x
+        return self.get_w_xF([self.beam_design.F])[:, 0]
+
+    def get_w_xF(self, F):
+        '''
+        Profiles of deflection along the beam for an array of loads F,
+        returned as an array of shape (n_x, n_F)
+        '''
+        return self.solve_xF(F)[3]
+
+    redistribution_tol = Float(1e-8)
+    '''Relative tolerance of the support reactions within the moment
+    redistribution of statically indeterminate systems
+    '''
+
+    redistribution_max_iter = Int(100)
+
+    @timed('DeflectionProfile.solve_xF')
+    def solve_xF(self, F, x=None):
+        '''
+        Profiles of moment, curvature, rotation and deflection for an array
+        of loads F returned as arrays of shape (n_x, n_F), see compute.solve_xF
+        for the moment redistribution in statically indeterminate systems.
+        The profiles are evaluated at the points x, by default at the points
+        of the beam design. The statical system is resolved in closed form
+        irrespective of the MQ_backend of the beam design.
+        '''
+        bd = self.beam_design
+        self._update_M_refine()
+        if x is None:
+            x = bd.x
+        return compute.solve_xF(x, bd.beam_conf_name, F, self.kappa_M_table,
+                                tol=self.redistribution_tol,
+                                max_iter=self.redistribution_max_iter)
+
+    def _update_M_refine(self):
+        '''
+        Pass the cracking and yield moments of the kappa_M_table, see
+        compute.get_M_kinks, to the refined discretization of the beam
+        design. The grid gains the crossings of up to four moments per
+        load level, i.e. of a load-deflection curve with n_load_steps
+        levels up to 4 * n_load_steps points, each bisected n_refine times.
+        Within the remaining nonlinear branches, the curvature is
+        integrated with the accuracy of the grid.
+        '''
+        bd = self.beam_design
+        if bd.x_grid != 'refined':
+            return
+        M_refine = compute.get_M_kinks(self.kappa_M_table)
+        if not np.array_equal(M_refine, bd.M_refine):
+            bd.M_refine = M_refine
+
+    def get_flexibility_0(self):
+        '''
+        Initial flexibility d_kappa / d_M of the uncracked cross section
+        '''
+        return compute.get_flexibility_0(self.kappa_M_table)
+
+    def get_flexibility_t(self, M):
+        '''
+        Tangential flexibility d_kappa / d_M of the kappa_M_table
+        for an arbitrary array of moments
+        '''
+        return compute.get_flexibility_t(M, self.kappa_M_table)
 
     theta_max = tr.Float(1)
 
@@ -122,26 +151,36 @@ class DeflectionProfile(InteractiveModel):
     Identify the ultimate limit state based on the maximum moment capacity
     of the cross section.
     '''
+    @timed('DeflectionProfile.F_max')
     def _get_F_max(self):
-        # specific to 3pt bending  - equation should be provided by the
-        # BoundaryCondition class - corresponding to the load configuration.
-        # TODO [SR, HS] this is specific to 3 point bending - generalize
-        #           for other loading conditions.
-        M_I, kappa_I = self.mc.inv_M_kappa
-        if self.beam_design.beam_conf_name == BoundaryConfig.THREE_PB:
-            F_max = 4 * M_I[-1] / self.beam_design.L
-        elif self.beam_design.beam_conf_name == BoundaryConfig.FOUR_PB:
-            load_distance = self.beam_design.beam_conf_name.first_load_distance
-            if load_distance == 0:
-                load_distance = self.beam_design.L / 3
-            F_max = M_I[-1] / load_distance
-        elif self.beam_design.beam_conf_name == BoundaryConfig.SIMPLE_BEAM_DIST_LOAD:
-            F_max = 8 * M_I[-1] / self.beam_design.L**2
-        return F_max
-    
-    
+        with stage('MKappa.inv_M_kappa'):
+            M_I, kappa_I = self.mc.inv_M_kappa
+        # the envelope of the elastic moment is independent of the load F
+        # of the beam design, i.e. of the crossings in the refined grid
+        return compute.get_F_max(self.beam_design.get_x_F([]), self.beam_design.beam_conf_name, M_I)
+
+    @staticmethod
+    def get_F_limits(L, config, M_u, M_cr=np.nan, M_y=np.nan, first_load_distance=0,
+                     M_u_neg=None, M_cr_neg=None, M_y_neg=None):
+        '''
+        Cracking, yield and ultimate loads (F_cr, F_y, F_max) at which the
+        elastic moment first reaches the corresponding sagging moments
+        M_cr, M_y, M_u or hogging moments M_cr_neg, M_y_neg, M_u_neg of the
+        cross section, given in its sign convention, i.e. negative for
+        hogging. The hogging moments default to the sagging ones with the
+        opposite sign of a symmetric section. All arguments are broadcasted,
+        so that a batch of beams given by arrays of lengths, configurations,
+        load distances and moments is evaluated at once without constructing
+        the models. For statically indeterminate systems the loads correspond
+        to the first attainment of the moments before any redistribution.
+        '''
+        def get_F(M, M_neg):
+            M = np.asarray(M, dtype=np.float64)
+            M_neg = -M if M_neg is None else M_neg
+            return BoundaryConditions.get_F_at_M(L, config, M, M_neg, first_load_distance)
+        return get_F(M_cr, M_cr_neg), get_F(M_y, M_y_neg), get_F(M_u, M_u_neg)
 
-    # def run(self):
+        # def run(self):
     #     F_arr = np.linspace(0, self.F_max, self.n_load_steps)
     #     w_list = []
     #     original_F = self.beam_design.F
@@ -158,34 +197,138 @@ class DeflectionProfile(InteractiveModel):
     # def reset(self):
     #     self.theta_F = 0
 
-    F_max_old = Float
+    load_stepping = tr.Enum('uniform', 'adaptive')
+    '''Distribution of the load levels of the load-deflection curve -
+    n_load_steps equidistant levels or levels refined by get_Fw_adaptive
+    '''
+
+    Fw_tol = Float(1e-3)
+    '''Tolerance of the adaptive load stepping relative to the maximum
+    deflection of the load-deflection curve
+    '''
+
+    n_load_steps_max = Int(500)
+
+    Fw_memo = tr.Property(depends_on='mc, mc.state_changed, beam_design, beam_design.L, '
+                                     'beam_design.n_x, beam_design.beam_conf_name, '
+                                     'beam_design.x_grid, beam_design.M_refine, beam_design.n_refine, '
+                                     'n_load_steps, load_stepping, Fw_tol, n_load_steps_max, '
+                                     'redistribution_tol, redistribution_max_iter')
+    '''Load-deflection curves keyed by the first_load_distance of the beam
+    configuration which is not a trait. The memo is reset with any change of
+    the cross section, material, geometry, discretization or load stepping -
+    but not with the current load F of the beam design. The curve does not
+    depend on F, its refined grid is built for its own load levels and
+    F_max is evaluated on the grid without the crossings of F.
+    '''
+    @tr.cached_property
+    def _get_Fw_memo(self):
+        return {}
+
+    Fw = tr.Property
+    '''Cached load-deflection curve returned by get_Fw
+    '''
+    def _get_Fw(self):
+        self._update_M_refine()
+        key = self.beam_design.beam_conf_name.first_load_distance
+        Fw = self.Fw_memo.get(key)
+        record_cache('DeflectionProfile.Fw', Fw is not None)
+        if Fw is None:
+            Fw = self.Fw_memo[key] = self.get_Fw()
+        return Fw
 
+    @timed('DeflectionProfile.get_Fw')
     def get_Fw(self):
+        '''
+        Load-deflection curve evaluated for all load levels at once
+        using the broadcasted profiles w(x, F). The load F of the
+        beam design is not modified.
+        '''
+        if self.load_stepping == 'adaptive':
+            F_arr, w_arr, _ = self.get_Fw_adaptive()
+            return F_arr, w_arr
+        F_arr = np.linspace(0, self.F_max, self.n_load_steps)
+        return F_arr, self._get_w_max(F_arr)
+
+    def _get_w_max(self, F_arr):
+        # the refined grid resolves the kinks of the curvature of all load levels
+        self._update_M_refine()
+        w_xF = self.solve_xF(-F_arr, x=self.beam_design.get_x_F(-F_arr))[3]
+        # maximum deflection that corresponds to each load level, its sign
+        # depends on the sign convention of the moment-curvature relation
+        w_arr = np.max(np.fabs(w_xF), axis=0)
+        w_arr[F_arr == 0] = 0
+        return w_arr
+
+    def get_Fw_adaptive(self):
+        '''
+        Load-deflection curve with load levels refined where the response
+        deviates from the linear interpolation between the neighboring
+        levels by more than Fw_tol. The initial levels include the loads
+        at which the elastic moment reaches the points of largest stiffness
+        reduction in the kappa_M_table, i.e. cracking and yielding. All
+        midpoints of a refinement pass are evaluated at once. Returns
+        the load levels, the deflections and the number of evaluated
+        load levels.
+        '''
         F_max = self.F_max
-        F_arr = np.linspace(0, F_max, self.n_load_steps)
-        w_list = []
-        # @todo [SR,RC]: separate the slider theta_F from the calculation
-        #                of the datapoints load deflection curve.
-        #                use broadcasting in the functions
-        #                get_M_x(x[:,np.newaxis], F[np.newaxis,:] and
-        #                in get_Q_x, get_kappa_x, get_w_x, get_phi_x, get_w_x
-        #                then, the browsing through the history is done within
-        #                the two dimensional array of and now loop over theta is
-        #                neeeded then. Theta works just as a slider - as originally
-        #                introduced.
-        original_F = self.beam_design.F
-        for F in F_arr:
-            if F == 0:
-                w_list.append(0)
-            else:
-                self.beam_design.F = -F
-                # Append the maximum deflection value that corresponds to the new load (F)
-                w_list.append(np.fabs(np.min(self.get_w_x())))
-        if self.F_max_old == F_max:
-            self.beam_design.F = original_F
-        self.F_max_old = F_max
-        return F_arr, np.array(w_list)
-    
+        F_arr = np.unique(np.hstack([np.linspace(0, F_max, 5),
+                                     self.get_F_stiffness_changes()]))
+        w_arr = self._get_w_max(F_arr)
+        n_eval = len(F_arr)
+        refine = np.ones(len(F_arr) - 1, dtype=bool)
+        while np.any(refine) and n_eval < self.n_load_steps_max:
+            idx = np.flatnonzero(refine)[:self.n_load_steps_max - n_eval]
+            F_mid = (F_arr[idx] + F_arr[idx + 1]) / 2
+            w_mid = self._get_w_max(F_mid)
+            n_eval += len(idx)
+            err = np.fabs(w_mid - (w_arr[idx] + w_arr[idx + 1]) / 2)
+            w_tol = self.Fw_tol * max(np.max(w_arr), np.max(w_mid))
+            F_arr = np.insert(F_arr, idx + 1, F_mid)
+            w_arr = np.insert(w_arr, idx + 1, w_mid)
+            # both halves of an inaccurate interval are checked in the next pass
+            idx_new = idx + np.arange(len(idx))
+            refine = np.zeros(len(F_arr) - 1, dtype=bool)
+            refine[idx_new] = refine[idx_new + 1] = err > w_tol
+        return F_arr, w_arr, n_eval
+
+    def get_F_stiffness_changes(self, n=2):
+        '''
+        Loads within (0, F_max) at which the extreme elastic moment along
+        the beam reaches the n points of the kappa_M_table with the largest
+        reduction of the bending stiffness.
+        '''
+        M_T, kappa_T, _, _ = self.kappa_M_table
+        EI_T = np.diff(M_T) / np.diff(kappa_T)
+        M_j = M_T[1:-1]
+        # ratio of the stiffness beyond and below the inner points
+        EI_ratio_j = np.where(M_j > 0, EI_T[1:] / EI_T[:-1], EI_T[:-1] / EI_T[1:])
+        M_max, M_min = self._get_M_envelope()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            F_j = np.where(M_j > 0, M_j / M_max, M_j / M_min)
+        inside = (F_j > 0) & (F_j < self.F_max)
+        F_j, EI_ratio_j = F_j[inside], EI_ratio_j[inside]
+        return F_j[np.argsort(EI_ratio_j)[:n]]
+
+    def get_moving_load_envelopes(self, P, a, n_positions=1001):
+        '''
+        Envelopes of a train of moving point loads P with the distances a
+        behind the leading load. The deflection envelope refers to the
+        bending stiffness of the uncracked cross section, as the
+        superposition of the load positions requires a linear response.
+        '''
+        EI = 1 / self.get_flexibility_0()
+        return self.beam_design.get_moving_load_envelopes(P, a, n_positions, EI)
+
+    def _get_M_envelope(self):
+        '''
+        Maximum and minimum moment along the beam due to the downward unit load
+        in the sign convention of the cross section, i.e. positive for sagging,
+        on the grid of F_max
+        '''
+        bd = self.beam_design
+        return compute.get_M_envelope(bd.get_x_F([]), bd.beam_conf_name)
+
     # def get_Fw_inx(self, inx):
     #     F_max = self.F_max
     #     F_arr = np.linspace(0, F_max, self.n_load_steps)
@@ -214,6 +357,7 @@ class DeflectionProfile(InteractiveModel):
     
 
     def subplots(self, fig):
+        import matplotlib.gridspec as gridspec
         gs = gridspec.GridSpec(1, 2, figure=fig, width_ratios=[0.7, 0.3])
 
         # ax2, ax3 = fig.subplots(1, 2)
@@ -222,6 +366,7 @@ class DeflectionProfile(InteractiveModel):
         ax_Fw = fig.add_subplot(gs[0, 1])
         return ax_w, ax_k, ax_Fw
 
+    @timed('DeflectionProfile.plot')
     def update_plot(self, axes):
         ax_w, ax_k, ax_Fw = axes
         self.plot_fw_with_fmax(ax_Fw)
@@ -255,11 +400,9 @@ class DeflectionProfile(InteractiveModel):
     F_scale = tr.Float(1/1000)
 
     def plot_fw(self, ax_Fw):
-        # TODO: expensive calculations for all displacements are running with each plot update to produce new
-        #  load-displacement curve, this shouldn't be done for example when only the force has changed
         ax_Fw.set_xlabel(r'$w_\mathrm{max}$ [mm]')
         ax_Fw.set_ylabel(r'$F$ [kN]')
-        F, w = self.get_Fw()
+        F, w = self.Fw
         ax_Fw.plot(w, self.F_scale * F,  label='sim deflection', lw=2)
 
 
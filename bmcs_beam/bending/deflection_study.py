@@ -0,0 +1,215 @@
+'''
+Load-deflection curves for a grid of parameter values evaluated
+by a pool of processes and stored in a cache on the disk.
+'''
+
+import functools
+import glob
+import hashlib
+import importlib
+import inspect
+import itertools
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import traits.api as tr
+
+from bmcs_beam.cache import get_cache_dir
+from bmcs_beam.version import __version__
+
+
+CACHE_VERSION = 1
+'''Version of the cached curves, to be increased with changes of the model
+that are not covered by the sources of MODEL_MODULES
+'''
+
+MODEL_MODULES = ('bmcs_beam.compute', 'bmcs_beam.bending.deflection_profile',
+                 'bmcs_beam.beam_config.beam_design', 'bmcs_beam.beam_config.closed_form',
+                 'bmcs_cross_section.mkappa', 'bmcs_cross_section.cs_design',
+                 'bmcs_cross_section.matmod')
+'''Modules and packages whose sources determine the load-deflection curves
+'''
+
+
+@functools.lru_cache()
+def get_model_fingerprint():
+    '''
+    Hash of the sources of MODEL_MODULES, the packages are included with
+    all their modules
+    '''
+    sha = hashlib.sha1()
+    for name in MODEL_MODULES:
+        path = importlib.import_module(name).__file__
+        if os.path.basename(path) == '__init__.py':
+            files = sorted(glob.glob(os.path.join(os.path.dirname(path), '**', '*.py'), recursive=True))
+        else:
+            files = [path]
+        for file in files:
+            with open(file, 'rb') as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+def set_param(model, path, value):
+    '''
+    Assign the value to the attribute given by a dotted path relative to
+    the model, integer items index lists, e.g. 'mc.cross_section_shape_.H'
+    or 'mc.cross_section_layout.reinforcement.0.A'
+    '''
+    *names, name = path.split('.')
+    for n in names:
+        model = model[int(n)] if n.isdigit() else getattr(model, n)
+    if name.isdigit():
+        model[int(name)] = value
+    else:
+        setattr(model, name, value)
+
+
+def get_Fw(dp_factory, param_items):
+    '''
+    Load-deflection curve of the deflection profile constructed by
+    dp_factory with the parameters (path, value) assigned
+    '''
+    dp = dp_factory()
+    for path, value in param_items:
+        set_param(dp, path, value)
+    return dp.get_Fw()
+
+
+def _get_source_id(fn):
+    if isinstance(fn, functools.partial):
+        return (_get_source_id(fn.func), repr(fn.args), repr(sorted(fn.keywords.items())))
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = ''
+    return fn.__module__, fn.__qualname__, source
+
+
+class DeflectionStudy(tr.HasTraits):
+    '''
+    Parametric study of the load-deflection response. All combinations of
+    the parameter values are evaluated independently in a pool of processes.
+    The curves are cached on the disk under a hash of the parameters, of the
+    source of dp_factory, of factory_version and of the model, see
+    get_model_fingerprint, so that repeated and extended studies only
+    evaluate the new combinations.
+    '''
+
+    dp_factory = tr.Callable
+    '''Function constructing the DeflectionProfile of the reference design.
+    It is sent to the worker processes and must therefore be importable,
+    i.e. defined at the module level.
+    '''
+
+    factory_version = tr.Str
+    '''Version tag of the model constructed by dp_factory. Only the source
+    of dp_factory itself enters the cache key, the tag must be changed when
+    the functions or data it uses change, otherwise the cached curves
+    of the previous model are returned.
+    '''
+
+    params = tr.Dict(tr.Str, tr.List)
+    '''Parameter values {path: values} with the paths relative to the
+    deflection profile, e.g. {'beam_design.L': [3000, 4000], 'mc.E_ct': [...]}
+    '''
+
+    n_workers = tr.Int(0)
+    '''Number of processes, zero stands for the number of CPUs,
+    with one process, the curves are evaluated within the current one
+    '''
+
+    cache_dir = tr.Str
+    '''Directory of the cached curves, by default within the shared cache
+    directory of bmcs_beam.cache
+    '''
+
+    def _cache_dir_default(self):
+        return os.path.join(get_cache_dir(), 'Fw')
+
+    param_grid = tr.Property(depends_on='params')
+    '''List of all parameter combinations as tuples of (path, value)
+    '''
+    @tr.cached_property
+    def _get_param_grid(self):
+        paths = list(self.params.keys())
+        return [tuple(zip(paths, values))
+                for values in itertools.product(*self.params.values())]
+
+    def get_cache_file(self, param_items):
+        key = repr((__version__, CACHE_VERSION, get_model_fingerprint(),
+                    _get_source_id(self.dp_factory), self.factory_version, param_items))
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.npz')
+
+    def get_Fw_list(self):
+        '''
+        Load-deflection curves (F, w) for all parameter combinations
+        in the order of param_grid
+        '''
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = [self.get_cache_file(items) for items in self.param_grid]
+        Fw_list = [self._load_Fw(file) for file in files]
+        todo = [i for i, Fw in enumerate(Fw_list) if Fw is None]
+        items_list = [self.param_grid[i] for i in todo]
+        # no pool is started for a single process or a completely cached study
+        if self.n_workers == 1 or not items_list:
+            Fw_todo = map(get_Fw, itertools.repeat(self.dp_factory), items_list)
+        else:
+            with ProcessPoolExecutor(self.n_workers or None) as pool:
+                Fw_todo = list(pool.map(get_Fw, itertools.repeat(self.dp_factory), items_list))
+        for i, (F, w) in zip(todo, Fw_todo):
+            self._save_Fw(files[i], F, w)
+            Fw_list[i] = (F, w)
+        return Fw_list
+
+    @staticmethod
+    def _load_Fw(file):
+        '''
+        Cached curve (F, w) or None if the file is missing or unreadable
+        '''
+        try:
+            with np.load(file) as data:
+                return data['F'], data['w']
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            return None
+
+    @staticmethod
+    def _save_Fw(file, F, w):
+        '''
+        Write the curve to a temporary file first and rename it, so that
+        aborted or concurrent studies never leave a truncated file
+        '''
+        fd, tmp_file = tempfile.mkstemp(suffix='.tmp.npz', dir=os.path.dirname(file))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, F=F, w=w)
+            os.replace(tmp_file, file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
+
+    def get_Fw_table(self):
+        '''
+        Tidy table of the study as a dictionary of columns with one row
+        per load level - the index of the parameter combination 'case',
+        the parameter values, the load 'F' and the deflection 'w'
+        '''
+        Fw_list = self.get_Fw_list()
+        n_rows = [len(F) for F, _ in Fw_list]
+        table = {'case': np.repeat(np.arange(len(Fw_list)), n_rows)}
+        for j, path in enumerate(self.params):
+            values = [items[j][1] for items in self.param_grid]
+            table[path] = np.repeat(np.array(values), n_rows)
+        table['F'] = np.hstack([F for F, _ in Fw_list])
+        table['w'] = np.hstack([w for _, w in Fw_list])
+        return table
+
+    def get_Fw_dataframe(self):
+        '''
+        Tidy table of the study as pandas DataFrame
+        '''
+        import pandas as pd
+        return pd.DataFrame(self.get_Fw_table())
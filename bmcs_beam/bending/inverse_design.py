@@ -0,0 +1,211 @@
+'''
+Inverse design of the cross section - the minimum reinforcement area
+or section height satisfying a deflection limit at the service load
+and the required ultimate load.
+'''
+
+import warnings
+
+import numpy as np
+import traits.api as tr
+
+from bmcs_beam import compute
+from bmcs_beam.bending.deflection_profile import DeflectionProfile
+
+
+class InverseDesign(tr.HasTraits):
+    '''
+    Minimum value of the design parameter of the deflection profile dp -
+    the factor of the areas of all reinforcement layers ('A') or the
+    height of the cross section ('H'). The layers move with the faces of
+    the section - the layers in the upper half of the initial section keep
+    their distance to the top face, the other ones their height z. The
+    design is admissible if the maximum deflection at the service load
+    F_sls does not exceed span / span_deflection_limit and the ultimate
+    load F_max reaches F_uls.
+
+    A probe evaluates the moment-curvature relation of the section once,
+    the deflection is evaluated for the single load F_sls instead of the
+    whole load-deflection curve. The moment-curvature relations of the
+    probes are memorized, so that the iterations and subsequent solutions,
+    e.g. for other loads or spans, reuse them. The iterations combine the
+    bracketing of the root with secant steps of the Illinois method and
+    start from the last solution.
+    '''
+
+    dp = tr.Instance(DeflectionProfile)
+
+    parameter = tr.Enum('A', 'H')
+
+    F_sls = tr.Float(-1000)
+    '''Service load in the convention of BeamDesign.F, i.e. negative downwards
+    '''
+
+    F_uls = tr.Float(0)
+    '''Required ultimate load compared with DeflectionProfile.F_max
+    '''
+
+    span_deflection_limit = tr.Float(250)
+
+    value_min = tr.Float(1e-2)
+    value_max = tr.Float(1e3)
+    '''Admissible range of the parameter, e.g. of the area factor. The
+    height is limited further to the sections containing all layers.
+    '''
+
+    rtol = tr.Float(1e-3)
+    '''Relative tolerance of the parameter
+    '''
+
+    max_iter = tr.Int(50)
+
+    value = tr.Float(0)
+    '''Last solution - the start of the next iterations
+    '''
+
+    probes = tr.Property(depends_on='dp, parameter')
+    '''Memorized moment-curvature relations {value: (kappa_M_table, M_I)}
+    of the probes. They must be reset with reset_traits(['probes']) after
+    changes of the cross section other than the parameter.
+    '''
+    @tr.cached_property
+    def _get_probes(self):
+        return {}
+
+    A_0 = tr.Property(depends_on='dp')
+    '''Areas of the reinforcement layers corresponding to the factor 1
+    '''
+    @tr.cached_property
+    def _get_A_0(self):
+        return [layer.A for layer in self.dp.mc.cross_section_layout.items.values()]
+
+    layers_0 = tr.Property(depends_on='dp')
+    '''Heights z of the layers in the lower half of the initial section and
+    distances to the top face of the layers in the upper half
+    '''
+    @tr.cached_property
+    def _get_layers_0(self):
+        H_0 = self.dp.mc.cross_section_shape_.H
+        layers_0 = []
+        for layer in self.dp.mc.cross_section_layout.items.values():
+            if layer.z > H_0 / 2:
+                layers_0.append((layer, 'top', H_0 - layer.z))
+            else:
+                layers_0.append((layer, 'bottom', layer.z))
+        return layers_0
+
+    H_min = tr.Property(depends_on='dp')
+    '''Height of the section at which the lowest layer of the upper half
+    reaches the highest layer of the lower half or a layer leaves the section
+    '''
+    @tr.cached_property
+    def _get_H_min(self):
+        z_bot = max([0.] + [z for _, face, z in self.layers_0 if face == 'bottom'])
+        c_top = max([0.] + [c for _, face, c in self.layers_0 if face == 'top'])
+        return z_bot + c_top
+
+    span = tr.Property(tr.Float)
+    '''Span of the beam, see BeamDesign.span
+    '''
+    def _get_span(self):
+        return self.dp.beam_design.span
+
+    def get_value(self):
+        '''
+        Current value of the parameter in the deflection profile
+        '''
+        if self.parameter == 'H':
+            return self.dp.mc.cross_section_shape_.H
+        layers = self.dp.mc.cross_section_layout.items.values()
+        return np.mean([layer.A / A_0 for layer, A_0 in zip(layers, self.A_0)])
+
+    def set_value(self, value):
+        '''
+        Set the parameter of the deflection profile
+        '''
+        if self.parameter == 'H':
+            if value <= self.H_min:
+                raise ValueError('the layers do not fit into the section of height H = %g <= %g'
+                                 % (value, self.H_min))
+            self.dp.mc.cross_section_shape_.H = value
+            for layer, face, z in self.layers_0:
+                layer.z = value - z if face == 'top' else z
+        else:
+            for layer, A_0 in zip(self.dp.mc.cross_section_layout.items.values(), self.A_0):
+                layer.A = value * A_0
+
+    def get_probe(self, value):
+        '''
+        Ultimate load and maximum deflection at the service load
+        for the value of the parameter
+        '''
+        probe = self.probes.get(value)
+        if probe is None:
+            self.set_value(value)
+            probe = self.probes[value] = (self.dp.kappa_M_table, np.array(self.dp.mc.inv_M_kappa[0]))
+        kappa_M_table, M_I = probe
+        dp, bd = self.dp, self.dp.beam_design
+        F_max = compute.get_F_max(bd.x, bd.beam_conf_name, M_I)
+        w_xF = compute.solve_xF(bd.x, bd.beam_conf_name, [self.F_sls], kappa_M_table,
+                                tol=dp.redistribution_tol, max_iter=dp.redistribution_max_iter)[3]
+        return F_max, np.max(np.fabs(w_xF))
+
+    def get_utilization(self, value):
+        '''
+        Maximum of the utilization ratios of the deflection limit and of the
+        ultimate load minus one - negative for admissible designs and
+        decreasing with the value of the parameter. The section must carry
+        the service load as well, the deflection beyond the ultimate load
+        is meaningless.
+        '''
+        F_max, w_max = self.get_probe(value)
+        w_lim = self.span / self.span_deflection_limit
+        return max(w_max / w_lim, max(self.F_uls, -self.F_sls) / F_max) - 1
+
+    def solve(self):
+        '''
+        Minimum admissible value of the parameter. The deflection profile
+        is set to the solution, which is returned and stored as value.
+        '''
+        value_min = self.value_min
+        if self.parameter == 'H':
+            value_min = max(value_min, self.H_min * (1 + self.rtol))
+        v_a = v_b = self.value or self.get_value()
+        g_a = g_b = self.get_utilization(v_a)
+        # bracket the root by geometric steps from the start value
+        while g_b > 0 and v_b < self.value_max:
+            v_a, g_a = v_b, g_b
+            v_b = min(2 * v_b, self.value_max)
+            g_b = self.get_utilization(v_b)
+        while g_a <= 0 and v_a > value_min:
+            v_b, g_b = v_a, g_a
+            v_a = max(v_a / 2, value_min)
+            g_a = self.get_utilization(v_a)
+        if g_b > 0:
+            raise ValueError('no admissible design up to %s = %g' % (self.parameter, self.value_max))
+        if g_a <= 0:
+            v_b = v_a
+        # Illinois method - secant steps within the bracket [v_a, v_b]
+        # with the end point retained twice halved in its utilization
+        side = 0
+        for _ in range(self.max_iter):
+            if v_b - v_a <= self.rtol * v_b:
+                break
+            v_c = (v_a * g_b - v_b * g_a) / (g_b - g_a)
+            v_c = min(max(v_c, v_a + 0.1 * self.rtol * v_b), v_b - 0.1 * self.rtol * v_b)
+            g_c = self.get_utilization(v_c)
+            if g_c > 0:
+                v_a, g_a = v_c, g_c
+                if side == -1:
+                    g_b /= 2
+                side = -1
+            else:
+                v_b, g_b = v_c, g_c
+                if side == 1:
+                    g_a /= 2
+                side = 1
+        else:
+            warnings.warn('inverse design did not converge within %d iterations' % self.max_iter)
+        self.set_value(v_b)
+        self.value = v_b
+        return v_b
@@ -0,0 +1,231 @@
+'''
+Long-term deflection of the beam under sustained load due to creep and
+shrinkage of concrete evaluated for a whole array of times at once.
+
+The short-term curvature follows from the moment-curvature relation of the
+deflection profile. The creep and shrinkage increments of the curvature are
+obtained with the effective modulus of concrete and the interpolation between
+the uncracked and the fully cracked state according to EC2, 7.4.3, the
+shrinkage curvature according to EC2, eq. (7.21). The section properties are
+evaluated on a grid over the height of the cross section, so that arbitrary
+shapes with the method get_b are supported.
+'''
+
+import numpy as np
+import traits.api as tr
+
+from bmcs_beam import compute
+from bmcs_beam.bending.deflection_profile import DeflectionProfile
+from bmcs_cross_section.matmod.ec2 import EC2
+from bmcs_cross_section.matmod.ec2_creep_shrinkage import EC2CreepShrinkage
+
+
+class LongTermDeflection(tr.HasTraits):
+    '''
+    Deflection profiles w(x, t) for the sustained load beam_design.F
+    of the deflection profile dp and an array of times t in days.
+    The loads and moments follow the sign convention of the beam design,
+    the section properties refer to the height z measured from the bottom.
+    '''
+
+    dp = tr.Instance(DeflectionProfile)
+
+    f_ck = tr.Float(30)
+    '''Characteristic compressive strength of concrete [MPa]
+    '''
+
+    t_0 = tr.Float(28)
+    '''Age of concrete at loading [days]
+    '''
+
+    t_s = tr.Float(3)
+    '''Age of concrete at the beginning of drying shrinkage [days]
+    '''
+
+    RH = tr.Float(70)
+    '''Relative humidity of the ambient environment [%]
+    '''
+
+    T = tr.Float(20)
+    '''Ambient temperature [°C]
+    '''
+
+    cement_type = tr.Enum('N', 'R', 'S')
+
+    beta = tr.Float(0.5)
+    '''Coefficient of the duration of loading in EC2, eq. (7.19),
+    0.5 for sustained loads
+    '''
+
+    E_cm = tr.Float(0)
+    '''Modulus of concrete - zero stands for the value of EC2 for f_ck
+    '''
+
+    u = tr.Float(0)
+    '''Perimeter exposed to drying - zero stands for the perimeter of the shape
+    '''
+
+    n_z = tr.Int(200)
+    '''Number of integration cells over the height of the cross section
+    '''
+
+    E_c = tr.Property(depends_on='f_ck, E_cm')
+    @tr.cached_property
+    def _get_E_c(self):
+        return self.E_cm if self.E_cm > 0 else EC2.get_E_cm(self.f_ck)
+
+    z_grid = tr.Property(depends_on='dp, dp.mc, dp.mc.state_changed, n_z')
+    '''Centers, widths and height of the integration cells (z, b, dz)
+    '''
+    @tr.cached_property
+    def _get_z_grid(self):
+        shape = self.dp.mc.cross_section_shape_
+        dz = shape.H / self.n_z
+        z = (np.arange(self.n_z) + 0.5) * dz
+        return z, np.asarray(shape.get_b(z), dtype=np.float64) * np.ones_like(z), dz
+
+    A_c = tr.Property(depends_on='z_grid')
+    @tr.cached_property
+    def _get_A_c(self):
+        _, b, dz = self.z_grid
+        return np.sum(b) * dz
+
+    perimeter = tr.Property(depends_on='z_grid, u')
+    @tr.cached_property
+    def _get_perimeter(self):
+        if self.u > 0:
+            return self.u
+        shape = self.dp.mc.cross_section_shape_
+        z = np.linspace(0, shape.H, self.n_z + 1)
+        b = np.asarray(shape.get_b(z), dtype=np.float64) * np.ones_like(z)
+        return b[0] + b[-1] + 2 * np.sum(np.hypot(np.diff(z), np.diff(b) / 2))
+
+    def get_phi_t(self, t):
+        '''
+        Creep coefficient phi(t, t_0) - zero before loading
+        '''
+        t = np.asarray(t, dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            phi = EC2CreepShrinkage.get_creep_coefficient(
+                self.f_ck, self.A_c, self.perimeter, self.t_0, np.maximum(t, self.t_0),
+                T=self.T, RH=self.RH, cement_type=self.cement_type)
+        return np.where(t > self.t_0, phi, 0)
+
+    def get_eps_cs_t(self, t):
+        '''
+        Total shrinkage strain (positive for shortening) - zero before drying
+        '''
+        t = np.asarray(t, dtype=np.float64)
+        eps_cs = EC2CreepShrinkage.get_eps_cs_shrinkage(
+            self.f_ck, self.A_c, self.perimeter, np.maximum(t, self.t_s),
+            t_s=self.t_s, RH=self.RH, cement_type=self.cement_type)
+        return np.where(t > self.t_s, eps_cs, 0)
+
+    def get_section_t(self, phi_t, hogging=False):
+        '''
+        Properties of the uncracked and of the fully cracked transformed
+        section for the effective modulus of concrete at the creep
+        coefficients phi_t. For hogging moments, the section is mirrored
+        so that the compression zone lies at the top. Returns the dictionary
+        of arrays with the effective modulus 'E', the centroid 'z_I',
+        the moment of inertia 'I_I' and the first moment of reinforcement
+        'S_I' of the uncracked section and the neutral axis 'z_II',
+        'I_II' and 'S_II' of the cracked section.
+        '''
+        z_z, b_z, dz = self.z_grid
+        layout = self.dp.mc.cross_section_layout
+        H = self.dp.mc.cross_section_shape_.H
+        z_j, A_j = np.asarray(layout.z_j, dtype=np.float64), np.asarray(layout.A_j, dtype=np.float64)
+        E_j = np.array([getattr(layer.matmod_, 'E_s', None) or layer.matmod_.E
+                        for layer in layout.items.values()], dtype=np.float64)
+        if hogging:
+            b_z, z_j = b_z[::-1], H - z_j
+        E_t = self.E_c / (1 + np.asarray(phi_t, dtype=np.float64))
+        # modular ratios - shape (n_j, n_t)
+        alpha_jt = E_j[:, np.newaxis] / E_t[np.newaxis, :]
+        A_c = np.sum(b_z) * dz
+        # uncracked section with the concrete displaced by the reinforcement
+        dA_jt = (alpha_jt - 1) * A_j[:, np.newaxis]
+        z_I = (np.sum(b_z * z_z) * dz + z_j @ dA_jt) / (A_c + np.sum(dA_jt, axis=0))
+        I_I = (np.sum(b_z[:, np.newaxis] * (z_z[:, np.newaxis] - z_I) ** 2, axis=0) * dz +
+               np.sum(dA_jt * (z_j[:, np.newaxis] - z_I) ** 2, axis=0))
+        S_I = np.sum(alpha_jt * A_j[:, np.newaxis] * (z_I - z_j[:, np.newaxis]), axis=0)
+        # cracked section - neutral axis by bisection of the first moment
+        # of the compressed concrete and of the reinforcement
+        aA_jt = alpha_jt * A_j[:, np.newaxis]
+        z_lo, z_hi = np.zeros_like(E_t), np.full_like(E_t, H)
+        for _ in range(60):
+            z_n = (z_lo + z_hi) / 2
+            S_n = (np.sum(b_z[:, np.newaxis] * np.maximum(z_z[:, np.newaxis] - z_n, 0), axis=0) * dz -
+                   np.sum(aA_jt * (z_n - z_j[:, np.newaxis]), axis=0))
+            z_lo, z_hi = np.where(S_n > 0, z_n, z_lo), np.where(S_n > 0, z_hi, z_n)
+        z_II = (z_lo + z_hi) / 2
+        I_II = (np.sum(b_z[:, np.newaxis] * (z_z[:, np.newaxis] > z_II) *
+                       (z_z[:, np.newaxis] - z_II) ** 2, axis=0) * dz +
+                np.sum(aA_jt * (z_j[:, np.newaxis] - z_II) ** 2, axis=0))
+        S_II = np.sum(aA_jt * (z_II - z_j[:, np.newaxis]), axis=0)
+        return dict(E=E_t, z_I=z_I, I_I=I_I, S_I=S_I, z_II=z_II, I_II=I_II, S_II=S_II)
+
+    def get_kappa_cs_xt(self, M_x, t):
+        '''
+        Increments of curvature due to creep and shrinkage along the beam
+        for the moments M_x and the times t, and the effective flexibility
+        of the cross section at t - arrays of shape (n_x, n_t) in the sign
+        convention of the beam design
+        '''
+        phi_t, eps_cs_t = self.get_phi_t(t), self.get_eps_cs_t(t)
+        M_x = np.asarray(M_x, dtype=np.float64)
+        # moments in the convention of the cross section
+        M_sec_x = -M_x
+        f_ctm = EC2.get_f_ctm(self.f_ck)
+        dkappa_xt = np.zeros((len(M_x), len(phi_t)))
+        f_xt = np.zeros_like(dkappa_xt)
+        for hogging, sign in [(False, 1.), (True, -1.)]:
+            x_mask = (M_sec_x < 0) if hogging else (M_sec_x >= 0)
+            sec_0 = self.get_section_t(np.zeros(1), hogging)
+            sec_t = self.get_section_t(phi_t, hogging)
+            M_cr = f_ctm * sec_0['I_I'][0] / sec_0['z_I'][0]
+            M_abs = np.fabs(M_sec_x[x_mask])[:, np.newaxis]
+            with np.errstate(divide='ignore'):
+                zeta = np.where(M_abs > M_cr, 1 - self.beta * (M_cr / M_abs) ** 2, 0)
+
+            def get_f(sec):
+                return (zeta / sec['I_II'] + (1 - zeta) / sec['I_I']) / sec['E']
+
+            f_t = get_f(sec_t)
+            dkappa_creep = M_abs * (f_t - get_f(sec_0))
+            kappa_shrink = eps_cs_t * (zeta * sec_t['S_II'] / sec_t['I_II'] +
+                                       (1 - zeta) * sec_t['S_I'] / sec_t['I_I'])
+            # section curvature of the mirrored section is reverted and
+            # converted to the beam convention
+            dkappa_xt[x_mask] = -sign * (dkappa_creep + kappa_shrink)
+            f_xt[x_mask] = f_t
+        return dkappa_xt, f_xt
+
+    def solve_xt(self, t):
+        '''
+        Profiles of moment, curvature, rotation and deflection for the
+        sustained load at the times t returned as arrays of shape (n_x, n_t).
+        In statically indeterminate systems, the restraint of the creep and
+        shrinkage curvature redistributes the moments with the effective
+        flexibility of the cross section.
+        '''
+        t = np.atleast_1d(np.asarray(t, dtype=np.float64))
+        bd = self.dp.beam_design
+        M_x, kappa_x, phi_x, w_x = (u[:, 0] for u in self.dp.solve_xF([bd.F]))
+        dkappa_xt, f_xt = self.get_kappa_cs_xt(M_x, t)
+        dM_xt, dkappa_xt, dphi_xt, dw_xt = compute.solve_kinematics(bd.x, bd.beam_conf_name, dkappa_xt, f_xt)
+        return (M_x[:, np.newaxis] + dM_xt, kappa_x[:, np.newaxis] + dkappa_xt,
+                phi_x[:, np.newaxis] + dphi_xt, w_x[:, np.newaxis] + dw_xt)
+
+    def get_w_xt(self, t):
+        '''
+        Profiles of deflection along the beam at the times t - shape (n_x, n_t)
+        '''
+        return self.solve_xt(t)[3]
+
+    def get_w_max_t(self, t):
+        '''
+        Maximum absolute deflection at the times t
+        '''
+        return np.max(np.fabs(self.get_w_xt(t)), axis=0)
@@ -0,0 +1,117 @@
+'''
+Serviceability check of the deflection for many load combinations
+evaluated within a single broadcasted solution of the deflection profile.
+'''
+
+import numpy as np
+import traits.api as tr
+
+from bmcs_beam.bending.deflection_profile import DeflectionProfile
+
+
+def get_EN1990_combinations(permanent, variable, psi_0, psi_1, psi_2):
+    '''
+    Characteristic, frequent and quasi-permanent combinations of EN 1990,
+    6.5.3 with each variable load case leading once. The permanent and
+    variable load cases are given by their names and the combination
+    factors psi as dictionaries {variable load case: psi}. Returns the
+    factors of the load cases per combination {combination: {case: factor}}.
+    '''
+    G = {case: 1. for case in permanent}
+    combinations = {}
+    if not variable:
+        combinations['quasi-permanent'] = G
+        return combinations
+    for lead in variable:
+        others = [case for case in variable if case != lead]
+        suffix = '(%s)' % lead if len(variable) > 1 else ''
+        combinations['characteristic' + suffix] = \
+            {**G, lead: 1., **{case: psi_0[case] for case in others}}
+        combinations['frequent' + suffix] = \
+            {**G, lead: psi_1[lead], **{case: psi_2[case] for case in others}}
+    combinations['quasi-permanent'] = {**G, **{case: psi_2[case] for case in variable}}
+    return combinations
+
+
+class SLSCheck(tr.HasTraits):
+    '''
+    Deflection envelope and span/deflection ratios for load combinations.
+    All load cases act in the load configuration of the beam design, their
+    values are given in the convention of BeamDesign.F, i.e. negative for
+    downward loads. The combined loads of all combinations are solved at
+    once, the nonlinear response is therefore evaluated for the combined
+    load and not superposed from the load cases.
+    '''
+
+    dp = tr.Instance(DeflectionProfile)
+
+    load_cases = tr.Dict(tr.Str, tr.Float)
+    '''Values of the load cases {name: F}
+    '''
+
+    combinations = tr.Dict(tr.Str, tr.Dict(tr.Str, tr.Float))
+    '''Factors of the load cases per combination {combination: {case: factor}},
+    e.g. constructed by get_EN1990_combinations
+    '''
+
+    span_deflection_limit = tr.Float(250)
+    '''Admissible ratio of the span and the deflection, e.g. 250
+    for the quasi-permanent combination according to EC2, 7.4.1
+    '''
+
+    span = tr.Property(tr.Float)
+    '''Span of the beam, see BeamDesign.span
+    '''
+    def _get_span(self):
+        return self.dp.beam_design.span
+
+    def get_F_C(self):
+        '''
+        Combined loads of all combinations in the order of combinations
+        '''
+        cases = list(self.load_cases)
+        unknown = {case for factors in self.combinations.values() for case in factors} - set(cases)
+        if unknown:
+            raise ValueError('undefined load cases %s' % sorted(unknown))
+        factors_Ci = np.array([[factors.get(case, 0.) for case in cases]
+                               for factors in self.combinations.values()]).reshape(-1, len(cases))
+        return factors_Ci @ np.array([self.load_cases[case] for case in cases])
+
+    def get_w_xC(self):
+        '''
+        Deflection profiles of all combinations - shape (n_x, n_C)
+        '''
+        return self.dp.get_w_xF(self.get_F_C())
+
+    def get_w_envelope(self):
+        '''
+        Envelope of the deflection profiles over all combinations
+        returned as the arrays (x, w_min_x, w_max_x)
+        '''
+        w_xC = self.get_w_xC()
+        return self.dp.beam_design.x, np.min(w_xC, axis=1), np.max(w_xC, axis=1)
+
+    def get_results(self):
+        '''
+        Results per combination as a dictionary of arrays - the combined
+        load 'F', the maximum absolute deflection 'w_max', its position
+        'x_max', the ratio of the span and the deflection 'span_w' and
+        the check of the limit 'passed'
+        '''
+        F_C = self.get_F_C()
+        w_xC = np.fabs(self.dp.get_w_xF(F_C))
+        i_C = np.argmax(w_xC, axis=0)
+        w_max_C = w_xC[i_C, np.arange(len(F_C))]
+        with np.errstate(divide='ignore'):
+            span_w_C = self.span / w_max_C
+        return {'combination': np.array(list(self.combinations)),
+                'F': F_C, 'w_max': w_max_C, 'x_max': self.dp.beam_design.x[i_C],
+                'span_w': span_w_C, 'passed': span_w_C >= self.span_deflection_limit}
+
+    def get_governing(self):
+        '''
+        Name and results of the combination with the largest deflection
+        '''
+        results = self.get_results()
+        i = np.argmax(results['w_max'])
+        return {key: value[i] for key, value in results.items()}
@@ -0,0 +1,55 @@
+'''
+Test the broadcasted evaluation of the deflection profiles
+for an array of load levels.
+'''
+
+from bmcs_beam.api import DeflectionProfile, BoundaryConfig
+from bmcs_cross_section.api import BarLayer
+
+import numpy as np
+
+
+def get_dp(beam_conf_name=BoundaryConfig.THREE_PB):
+    dp = DeflectionProfile()
+    dp.mc.low_kappa = -0.00005
+    dp.mc.high_kappa = 0.00005
+    dp.mc.cross_section_shape_.B = 200
+    dp.mc.cross_section_shape_.H = 300
+    dp.mc.cross_section_layout.add_layer(BarLayer(name='bottom', z=30, ds=16, count=3))
+    dp.mc.cross_section_layout.add_layer(BarLayer(name='top', z=270, ds=16, count=3))
+    dp.beam_design.beam_conf_name = beam_conf_name
+    dp.beam_design.n_x = 51
+    return dp
+
+
+def test_w_xF_matches_w_x():
+    '''The profiles w(x, F) must coincide with the single load evaluation.
+    '''
+    for conf, F_arr in [(BoundaryConfig.THREE_PB, [-1000., -3000., -5000.]),
+                        (BoundaryConfig.FOUR_PB, [-1000., -3000., -5000.]),
+                        (BoundaryConfig.SIMPLE_BEAM_DIST_LOAD, [-0.2, -0.6, -1.])]:
+        dp = get_dp(conf)
+        F_arr = np.array(F_arr)
+        w_xF = dp.get_w_xF(F_arr)
+        assert w_xF.shape == (dp.beam_design.n_x, len(F_arr))
+        for j, F in enumerate(F_arr):
+            dp.beam_design.F = F
+            assert np.allclose(w_xF[:, j], dp.get_w_x())
+
+
+def test_get_Fw_keeps_F():
+    '''The load-deflection curve must not modify the load of the beam design.
+    '''
+    dp = get_dp()
+    dp.beam_design.F = -1234
+    F, w = dp.get_Fw()
+    assert dp.beam_design.F == -1234
+    assert F.shape == w.shape == (dp.n_load_steps,)
+    assert w[0] == 0
+    # the deflection grows with the load irrespective of its sign
+    assert np.all(np.diff(w) > 0)
+
+
+if __name__ == '__main__':
+    test_w_xF_matches_w_x()
+    test_get_Fw_keeps_F()
@@ -0,0 +1,53 @@
+'''
+Test the cached inverse moment-curvature table of the deflection profile.
+'''
+
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_kappa_M_table_monotone():
+    '''The table must be strictly increasing in M and non-decreasing in kappa.
+    '''
+    dp = get_dp()
+    M_T, kappa_T, kappa_min, kappa_max = dp.kappa_M_table
+    assert np.all(np.diff(M_T) > 0)
+    assert np.all(np.diff(kappa_T) >= 0)
+    assert kappa_min <= kappa_T[0] and kappa_T[-1] <= kappa_max
+
+
+def test_kappa_M_matches_mc():
+    '''Within the monotone branch, the result equals the interpolation
+    in mc.inv_M_kappa, the shape of the moment array is preserved.
+    '''
+    dp = get_dp()
+    M_I, kappa_I = dp.mc.inv_M_kappa
+    # positive branch up to the peak of the moment at cracking
+    i0 = np.argmin(np.fabs(kappa_I))
+    i_cr = i0 + np.argmax(np.diff(M_I[i0:]) <= 0)
+    M_I, kappa_I = M_I[i0 - 1:i_cr + 1], kappa_I[i0 - 1:i_cr + 1]
+    M = np.linspace(0, M_I[-1], 200).reshape(20, 10)
+    kappa = dp.get_kappa_M(M)
+    assert kappa.shape == M.shape
+    assert np.allclose(kappa, np.interp(M, M_I, kappa_I))
+    assert np.all(np.diff(dp.get_kappa_M(np.linspace(-2e7, 2e7, 1001))) >= 0)
+
+
+def test_kappa_M_table_cached():
+    '''The table is reused until the cross section changes.
+    '''
+    dp = get_dp()
+    M_T = dp.kappa_M_table[0]
+    assert dp.kappa_M_table[0] is M_T
+    dp.beam_design.F = -3000
+    assert dp.kappa_M_table[0] is M_T
+    dp.mc.cross_section_shape_.H = 400
+    dp.mc.cross_section_shape_.H = 350
+    assert dp.kappa_M_table[0] is not M_T
+
+
+if __name__ == '__main__':
+    test_kappa_M_table_monotone()
+    test_kappa_M_matches_mc()
+    test_kappa_M_table_cached()
@@ -0,0 +1,68 @@
+'''
+Test the deflection of statically determinate and indeterminate systems
+with the integration constants and the redundant reactions resolved
+from the support conditions.
+'''
+
+from bmcs_beam.api import BoundaryConditions, BoundaryConfig
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+from bmcs_beam.compute import interp_x
+
+import numpy as np
+
+
+def test_elastic_deflection():
+    '''Below cracking, the deflection coincides with the linear elastic
+    solution for the initial stiffness of the cross section.
+    '''
+    for conf, F in [(BoundaryConfig.THREE_PB, -1000.),
+                    (BoundaryConfig.THREE_SPAN_DIST_LOAD, -0.5),
+                    (BoundaryConfig.THREE_PB_FIXED_SUPPORT, -1000.),
+                    (BoundaryConfig.CANTILEVER, -200.)]:
+        dp = get_dp(conf)
+        dp.beam_design.n_x = 301
+        x, L = dp.beam_design.x, dp.beam_design.L
+        EI = 1 / dp.get_flexibility_0()
+        w_x = dp.get_w_xF([F])[:, 0]
+        # the curvature follows the moment as kappa = M / EI
+        w_el = -BoundaryConditions.get_w_kernel(L, conf)(x, F, EI)
+        assert np.allclose(w_x, w_el, rtol=0, atol=1e-3 * np.max(np.fabs(w_el)))
+
+
+def test_moment_redistribution():
+    '''Beyond the moment capacity at the clamped ends, the moment is
+    redistributed to the midspan satisfying the equilibrium and the
+    support conditions.
+    '''
+    dp = get_dp(BoundaryConfig.THREE_PB_FIXED_SUPPORT)
+    dp.beam_design.n_x = 101
+    L = dp.beam_design.L
+    F = np.array([-8000., -16000.])
+    M_xF, kappa_xF, phi_xF, w_xF = dp.solve_xF(F)
+    M_el = dp.beam_design.get_M_xF(F)
+    # midspan moment of the simple beam superposed with the end moments
+    assert np.allclose(M_xF[50] - (M_xF[0] + M_xF[-1]) / 2, F * L / 4)
+    # the kernel takes the value behind the clamped end at x = L
+    assert np.allclose(M_xF[:-1, 0], M_el[:-1, 0], atol=1e-3 * np.max(np.fabs(M_el)))
+    assert np.fabs(M_xF[0, 1]) < np.fabs(M_el[0, 1])
+    assert np.allclose(w_xF[[0, -1]], 0, atol=1e-12)
+    assert np.allclose(phi_xF[[0, -1]], 0, atol=1e-12)
+
+
+def test_three_span_supports():
+    '''The deflection vanishes at all four supports.
+    '''
+    dp = get_dp(BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    L = dp.beam_design.L
+    F, w = dp.get_Fw()
+    assert np.all(w[1:] > 0)
+    w_xF = dp.get_w_xF(-F)
+    for x_s in [0, L / 3, 2 * L / 3, L]:
+        w_s = interp_x(x_s, dp.beam_design.x, w_xF)
+        assert np.allclose(w_s, 0, atol=1e-9 * np.max(w))
+
+
+if __name__ == '__main__':
+    test_elastic_deflection()
+    test_moment_redistribution()
+    test_three_span_supports()
@@ -0,0 +1,44 @@
+'''
+Test the adaptive load stepping of the load-deflection curve.
+'''
+
+from bmcs_beam.api import BoundaryConfig
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_adaptive_Fw():
+    '''The adaptive curve reproduces a finely resolved uniform curve
+    with less load levels than a uniform curve of the same accuracy.
+    '''
+    dp = get_dp(BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    dp.n_load_steps = 2001
+    F_ref, w_ref = dp.get_Fw()
+    dp.Fw_tol = 1e-3
+    F, w, n_eval = dp.get_Fw_adaptive()
+    assert n_eval == len(F) < dp.n_load_steps_max
+    assert F[0] == 0 and F[-1] == dp.F_max and np.all(np.diff(F) > 0)
+    err = np.max(np.fabs(np.interp(F_ref, F, w) - w_ref))
+    assert err < 5 * dp.Fw_tol * np.max(w_ref)
+    dp.n_load_steps = n_eval
+    F_u, w_u = dp.get_Fw()
+    assert np.max(np.fabs(np.interp(F_ref, F_u, w_u) - w_ref)) > err
+
+    dp.load_stepping = 'adaptive'
+    F_a, w_a = dp.get_Fw()
+    assert np.allclose(F_a, F) and np.allclose(w_a, w)
+
+
+def test_stiffness_changes():
+    '''The seeded load levels lie within the load range.
+    '''
+    dp = get_dp(BoundaryConfig.THREE_PB)
+    F_j = dp.get_F_stiffness_changes()
+    assert 0 < len(F_j) <= 2
+    assert np.all((F_j > 0) & (F_j < dp.F_max))
+
+
+if __name__ == '__main__':
+    test_adaptive_Fw()
+    test_stiffness_changes()
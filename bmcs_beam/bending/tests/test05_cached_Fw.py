@@ -0,0 +1,87 @@
+'''
+Test the reuse of the load-deflection curve for the changes of the current
+load and its recomputation for changes of the geometry and material.
+'''
+
+from bmcs_beam.api import BoundaryConfig
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_Fw_kept_for_load_changes():
+    dp = get_dp(BoundaryConfig.FOUR_PB)
+    Fw = dp.Fw
+    dp.beam_design.F = -2000
+    assert dp.Fw is Fw
+    dp.beam_design.L = 4000
+    assert dp.Fw is not Fw
+    F, w = dp.Fw
+    F_ref, w_ref = dp.get_Fw()
+    assert np.allclose(F, F_ref) and np.allclose(w, w_ref)
+
+
+def test_Fw_reset():
+    dp = get_dp(BoundaryConfig.FOUR_PB)
+    Fw = dp.Fw
+    # attribute of the configuration outside of the traits
+    dp.beam_design.beam_conf_name.first_load_distance = 1000
+    try:
+        assert dp.Fw is not Fw
+    finally:
+        dp.beam_design.beam_conf_name.first_load_distance = 0
+    assert dp.Fw is Fw
+    dp.beam_design.beam_conf_name = BoundaryConfig.THREE_PB
+    assert dp.Fw is not Fw
+    Fw = dp.Fw
+    dp.n_load_steps = 11
+    assert dp.Fw is not Fw
+    Fw = dp.Fw
+    dp.mc.cross_section_shape_.H = 400
+    dp.mc.cross_section_shape_.H = 350
+    assert dp.Fw is not Fw
+
+
+def test_Fw_closed_form():
+    '''The deflection is resolved in closed form for both backends
+    of the moment kernels.
+    '''
+    dp = get_dp(BoundaryConfig.THREE_PB_FIXED_SUPPORT)
+    Fw = dp.Fw
+    dp.beam_design.MQ_backend = 'sympy'
+    assert dp.Fw is Fw
+    F, w = dp.get_Fw()
+    assert np.allclose(F, Fw[0]) and np.allclose(w, Fw[1])
+
+
+def test_Fw_refined_grid():
+    dp = get_dp(BoundaryConfig.THREE_PB_FIXED_SUPPORT)
+    dp.beam_design.n_x = 21
+    Fw = dp.Fw
+    dp.beam_design.x_grid = 'refined'
+    assert dp.Fw is not Fw
+    Fw = dp.Fw
+    # the refined curve is kept for the changes of the current load
+    dp.beam_design.F = -0.9 * dp.F_max
+    assert dp.Fw is Fw
+    F, w = dp.get_Fw()
+    assert np.allclose(F, Fw[0]) and np.allclose(w, Fw[1])
+    dp.beam_design.n_refine = 2
+    assert dp.Fw is not Fw
+    assert not np.allclose(dp.Fw[1], w)
+
+
+def test_beam_constructed_on_access():
+    dp = get_dp()
+    beam = dp.beam_design.beam
+    dp.beam_design.F = -2000
+    assert dp.beam_design.beam is not beam
+    assert float(dp.beam_design.beam.applied_loads[-1][0]) == -2000
+
+
+if __name__ == '__main__':
+    test_Fw_kept_for_load_changes()
+    test_Fw_reset()
+    test_Fw_closed_form()
+    test_Fw_refined_grid()
+    test_beam_constructed_on_access()
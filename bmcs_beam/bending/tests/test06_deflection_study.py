@@ -0,0 +1,96 @@
+'''
+Test the parallel parametric study of the load-deflection curves.
+'''
+
+import os
+import tempfile
+
+from bmcs_beam.api import DeflectionStudy
+from bmcs_beam.bending import deflection_study
+from bmcs_beam.bending.deflection_study import get_Fw
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def get_study(cache_dir, n_workers):
+    return DeflectionStudy(dp_factory=get_dp, n_workers=n_workers, cache_dir=cache_dir,
+                           params={'beam_design.L': [3000, 4000],
+                                   'mc.cross_section_shape_.H': [300, 350]})
+
+
+def test_study_Fw():
+    '''The curves evaluated in parallel coincide with the serial ones
+    and are read from the cache when the study is repeated.
+    '''
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ds = get_study(cache_dir, n_workers=2)
+        Fw_list = ds.get_Fw_list()
+        assert len(Fw_list) == len(os.listdir(cache_dir)) == 4
+        for items, (F, w) in zip(ds.param_grid, Fw_list):
+            F_ref, w_ref = get_Fw(get_dp, items)
+            assert np.allclose(F, F_ref) and np.allclose(w, w_ref)
+        # the cached study is read without a pool of processes
+        pool_executor = deflection_study.ProcessPoolExecutor
+        deflection_study.ProcessPoolExecutor = None
+        try:
+            assert len(get_study(cache_dir, n_workers=2).get_Fw_list()) == 4
+        finally:
+            deflection_study.ProcessPoolExecutor = pool_executor
+        # replace a cached curve to see that it is not recomputed
+        file = ds.get_cache_file(ds.param_grid[0])
+        np.savez(file, F=np.zeros(2), w=np.ones(2))
+        F, w = get_study(cache_dir, n_workers=1).get_Fw_list()[0]
+        assert np.all(w == 1)
+
+
+def test_study_cache_invalidation():
+    '''Truncated cache files are recomputed, the cache files change with
+    the version of the model and with the version tag of the factory.
+    '''
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ds = get_study(cache_dir, n_workers=1)
+        ds.params = {'beam_design.L': [3000]}
+        F_ref, w_ref = ds.get_Fw_list()[0]
+        file = ds.get_cache_file(ds.param_grid[0])
+        with open(file, 'r+b') as f:
+            f.truncate(20)
+        F, w = ds.get_Fw_list()[0]
+        assert np.allclose(F, F_ref) and np.allclose(w, w_ref)
+        assert os.listdir(cache_dir) == [os.path.basename(file)]
+        deflection_study.CACHE_VERSION += 1
+        try:
+            assert ds.get_cache_file(ds.param_grid[0]) != file
+        finally:
+            deflection_study.CACHE_VERSION -= 1
+        ds.factory_version = '2'
+        assert ds.get_cache_file(ds.param_grid[0]) != file
+    assert len(deflection_study.get_model_fingerprint()) == 40
+
+
+def test_study_cache_dir():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ['BMCS_BEAM_CACHE_DIR'] = cache_dir
+        try:
+            ds = DeflectionStudy(dp_factory=get_dp)
+            assert os.path.dirname(ds.cache_dir) == cache_dir
+        finally:
+            del os.environ['BMCS_BEAM_CACHE_DIR']
+
+
+def test_study_table():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        ds = get_study(cache_dir, n_workers=1)
+        ds.params = {'beam_design.L': [3000, 4000, 5000]}
+        table = ds.get_Fw_table()
+        n_rows = 3 * get_dp().n_load_steps
+        for column in ['case', 'beam_design.L', 'F', 'w']:
+            assert table[column].shape == (n_rows,)
+        assert np.all(table['beam_design.L'][table['case'] == 2] == 5000)
+
+
+if __name__ == '__main__':
+    test_study_Fw()
+    test_study_cache_invalidation()
+    test_study_cache_dir()
+    test_study_table()
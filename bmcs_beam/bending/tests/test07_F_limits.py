@@ -0,0 +1,57 @@
+'''
+Test the batch evaluation of the cracking, yield and ultimate loads.
+'''
+
+from bmcs_beam.api import DeflectionProfile, BoundaryConfig
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_F_limits_match_F_max():
+    '''The hogging capacity of the section with the weaker top reinforcement
+    governs the configurations with clamped or inner supports and the point
+    moment.
+    '''
+    for conf in BoundaryConfig:
+        dp = get_dp(conf)
+        dp.mc.cross_section_layout.items['top'].A = 50
+        M_I, _ = dp.mc.inv_M_kappa
+        assert -M_I[0] < 0.9 * M_I[-1]
+        _, _, F_max = DeflectionProfile.get_F_limits(dp.beam_design.L, conf, M_I[-1],
+                                                     M_u_neg=M_I[0])
+        assert np.isclose(F_max, dp.F_max)
+
+
+def test_F_limits_signed():
+    L = 3000
+    M_M = np.array([[20e6, -10e6]])
+    F_cr, F_y, F_max = DeflectionProfile.get_F_limits(
+        L, np.arange(7)[:, np.newaxis], 100e6, M_M[:, 0], 50e6, M_u_neg=-80e6, M_cr_neg=M_M[:, 1])
+    assert F_max.shape == (7, 1)
+    assert np.isclose(F_max[BoundaryConfig.THREE_SPAN_DIST_LOAD.value], 80e6 / (0.1 * (L / 3) ** 2))
+    assert np.isclose(F_max[BoundaryConfig.THREE_PB_FIXED_SUPPORT.value], 80e6 / (L / 8))
+    assert np.isclose(F_max[BoundaryConfig.CANTILEVER.value], 80e6 / L)
+    assert np.isclose(F_cr[BoundaryConfig.THREE_PB.value], 20e6 / (L / 4))
+    assert np.isclose(F_cr[BoundaryConfig.CANTILEVER.value], 10e6 / L)
+    # the hogging yield moment defaults to the symmetric one
+    assert np.isclose(F_y[BoundaryConfig.SINGLE_MOMENT.value], 50e6 / 0.5)
+
+
+def test_F_limits_batch():
+    n = 1000
+    L = np.linspace(2000, 8000, n)
+    config = np.arange(n) % 3
+    M_u = np.full(n, 100e6)
+    F_cr, F_y, F_max = DeflectionProfile.get_F_limits(L, config, M_u, 0.1 * M_u, 0.8 * M_u)
+    assert F_cr.shape == F_y.shape == F_max.shape == (n,)
+    assert np.allclose(F_cr, 0.1 * F_max) and np.allclose(F_y, 0.8 * F_max)
+    assert np.allclose(F_max[config == 0], 4 * M_u[config == 0] / L[config == 0])
+    assert np.allclose(F_max[config == 1], 3 * M_u[config == 1] / L[config == 1])
+    assert np.allclose(F_max[config == 2], 8 * M_u[config == 2] / L[config == 2] ** 2)
+
+
+if __name__ == '__main__':
+    test_F_limits_match_F_max()
+    test_F_limits_signed()
+    test_F_limits_batch()
@@ -0,0 +1,60 @@
+'''
+Test the benchmarks of the deflection pipeline and the detection of regressions.
+'''
+
+import copy
+import json
+import os
+import tempfile
+
+from bmcs_beam.bending.benchmark import get_benchmarks, run_benchmarks, compare, main
+from bmcs_beam.bending.verification_cases import VERIFICATION_CASES
+
+
+def test_benchmark_names():
+    names = [b.name for b in get_benchmarks((51,), (11,))]
+    assert len(names) == len(set(names))
+    assert 'DeflectionProfile.get_Fw[CANTILEVER,n_x=51,n_load_steps=11]' in names
+    assert len([name for name in names if name.startswith('verification')]) == len(VERIFICATION_CASES)
+
+
+def test_compare():
+    results = run_benchmarks(get_benchmarks((51,), (11,)), repeat=1,
+                             name_filter='[THREE_PB,n_x=51')
+    assert len(results['results']) == 5
+    assert all(r['peak_mem'] > 0 and r['t_min'] > 0 for r in results['results'].values())
+    assert compare(results, results) == []
+    slow = copy.deepcopy(results)
+    name = 'DeflectionProfile.get_w_x[THREE_PB,n_x=51]'
+    slow['results'][name]['t_min'] += 1.
+    slow['results'][name]['peak_mem'] *= 2
+    assert [(n, metric) for n, metric, _, _ in compare(slow, results)] == \
+           [(name, 't_min'), (name, 'peak_mem')]
+
+
+def test_baseline():
+    '''The regressions fail the run only against a baseline recorded
+    in the same environment.
+    '''
+    argv = ['--quick', '--filter', 'get_w_x[THREE_PB,n_x=101]']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        baseline = os.path.join(tmp_dir, 'baseline.json')
+        assert main(argv + ['--baseline', baseline]) == 0
+        assert main(argv + ['--baseline', baseline, '--save-baseline']) == 0
+        with open(baseline) as f:
+            results = json.load(f)
+        for result in results['results'].values():
+            result['peak_mem'] /= 1000
+        with open(baseline, 'w') as f:
+            json.dump(results, f)
+        assert main(argv + ['--baseline', baseline, '--time-factor', '1']) == 1
+        results['meta']['node'] = 'other'
+        with open(baseline, 'w') as f:
+            json.dump(results, f)
+        assert main(argv + ['--baseline', baseline, '--time-factor', '1']) == 0
+
+
+if __name__ == '__main__':
+    test_benchmark_names()
+    test_compare()
+    test_baseline()
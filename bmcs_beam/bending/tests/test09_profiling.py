@@ -0,0 +1,56 @@
+'''
+Test the opt-in instrumentation of the stages of the deflection pipeline.
+'''
+
+import pstats
+
+from bmcs_beam.api import BoundaryConfig, StageProfiler
+from bmcs_beam.beam_config.beam_design import MQ_KERNELS
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_stage_report():
+    dp = get_dp(BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    dp.beam_design.MQ_backend = 'sympy'
+    dp.beam_design.MQ_disk_cache = False
+    MQ_KERNELS.clear()
+    with StageProfiler() as prof:
+        dp.Fw
+        dp.Fw
+        dp.get_w_x()
+        dp.beam_design.get_M_x()
+        dp.beam_design.get_Q_x()
+    report = prof.get_report()
+    assert (report['DeflectionProfile.Fw']['hits'], report['DeflectionProfile.Fw']['misses']) == (1, 1)
+    assert report['DeflectionProfile.kappa_M_table']['calls'] == 1
+    assert report['DeflectionProfile.kappa_M_table']['hits'] > 0
+    assert (report['BeamDesign.MQ_kernels']['hits'], report['BeamDesign.MQ_kernels']['misses']) == (1, 1)
+    assert report['BeamDesign.kernel_data']['calls'] == 1
+    assert report['compute.cumtrapz']['calls'] >= report['DeflectionProfile.solve_xF']['calls']
+    assert report['DeflectionProfile.get_Fw']['time'] >= report['DeflectionProfile.solve_xF']['time'] > 0
+    # ordered by decreasing time
+    times = [s['time'] for s in report.values()]
+    assert times == sorted(times, reverse=True)
+    assert report['MKappa.inv_M_kappa']['calls'] == 2
+    assert 'compute.kappa_lookup' in prof.format_report()
+
+
+def test_inactive_and_cprofile():
+    dp = get_dp(BoundaryConfig.THREE_PB)
+    w_x = dp.get_w_x()
+    with StageProfiler(backend='cprofile') as prof:
+        assert np.allclose(dp.get_w_x(), w_x)
+    assert prof.get_report()['DeflectionProfile.kappa_M_table']['hits'] > 0
+    stats = prof.get_pstats()
+    assert isinstance(stats, pstats.Stats)
+    assert any(name == 'solve_xF' for _, _, name in stats.stats)
+    # outside of the profiler nothing is recorded
+    dp.get_w_x()
+    assert prof.get_report()['DeflectionProfile.solve_xF']['calls'] == 1
+
+
+if __name__ == '__main__':
+    test_stage_report()
+    test_inactive_and_cprofile()
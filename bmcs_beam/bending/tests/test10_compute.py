@@ -0,0 +1,42 @@
+'''
+Test the headless compute API against the interactive deflection profile.
+'''
+
+import subprocess
+import sys
+
+from bmcs_beam import compute
+from bmcs_beam.api import BoundaryConfig
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_headless_import():
+    '''The compute API loads neither the plotting nor the GUI packages.
+    '''
+    code = ('import sys, bmcs_beam.compute; '
+            'print(sorted(m for m in ["matplotlib", "ipywidgets", "traitsui", "traits", '
+            '"sympy", "bmcs_utils"] if m in sys.modules))')
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == '[]'
+
+
+def test_compute_matches_dp():
+    for conf in [BoundaryConfig.FOUR_PB, BoundaryConfig.THREE_SPAN_DIST_LOAD]:
+        dp = get_dp(conf)
+        M_I, kappa_I = dp.mc.inv_M_kappa
+        kappa_M_table = compute.get_kappa_M_table(M_I, kappa_I)
+        x = np.linspace(0, dp.beam_design.L, dp.beam_design.n_x)
+        F_max = compute.get_F_max(x, conf, M_I)
+        assert np.isclose(F_max, dp.F_max)
+        F, w = compute.get_Fw(x, conf, kappa_M_table, F_max, dp.n_load_steps)
+        F_dp, w_dp = dp.get_Fw()
+        assert np.allclose(F, F_dp) and np.allclose(w, w_dp)
+        M_xF = compute.get_M_xF(x, conf, [-1000., -2000.])
+        assert np.allclose(M_xF, dp.beam_design.get_M_xF([-1000., -2000.]))
+
+
+if __name__ == '__main__':
+    test_headless_import()
+    test_compute_matches_dp()
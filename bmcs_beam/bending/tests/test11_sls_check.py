@@ -0,0 +1,48 @@
+'''
+Test the serviceability check of the deflection for load combinations.
+'''
+
+from bmcs_beam.api import BoundaryConfig, SLSCheck, get_EN1990_combinations
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_EN1990_combinations():
+    combinations = get_EN1990_combinations(['G'], ['Q1', 'Q2'], psi_0={'Q1': 0.7, 'Q2': 0.6},
+                                           psi_1={'Q1': 0.5, 'Q2': 0.2},
+                                           psi_2={'Q1': 0.3, 'Q2': 0.0})
+    assert len(combinations) == 5
+    assert combinations['characteristic(Q2)'] == {'G': 1., 'Q2': 1., 'Q1': 0.7}
+    assert combinations['frequent(Q1)'] == {'G': 1., 'Q1': 0.5, 'Q2': 0.}
+    assert combinations['quasi-permanent'] == {'G': 1., 'Q1': 0.3, 'Q2': 0.}
+
+
+def test_sls_results():
+    '''The batched results coincide with the evaluation for the single combined loads.
+    '''
+    dp = get_dp(BoundaryConfig.THREE_SPAN_DIST_LOAD)
+    dp.beam_design.L = 9000
+    sls = SLSCheck(dp=dp, load_cases={'G': -4., 'Q': -6.},
+                   combinations=get_EN1990_combinations(['G'], ['Q'], psi_0={'Q': 0.7},
+                                                        psi_1={'Q': 0.5}, psi_2={'Q': 0.3}))
+    results = sls.get_results()
+    assert list(results['combination']) == ['characteristic', 'frequent', 'quasi-permanent']
+    assert np.allclose(results['F'], [-10., -7., -5.8])
+    for F, w_max, x_max in zip(results['F'], results['w_max'], results['x_max']):
+        dp.beam_design.F = F
+        w_x = np.fabs(dp.get_w_x())
+        assert np.isclose(w_max, np.max(w_x))
+        assert np.isclose(np.interp(x_max, dp.beam_design.x, w_x), w_max)
+    # maximum deflection in one of the outer spans
+    assert np.all(np.minimum(results['x_max'], 9000 - results['x_max']) < 3000)
+    assert np.allclose(results['span_w'], 3000 / results['w_max'])
+    assert np.all(results['passed'] == (results['span_w'] >= 250))
+    assert sls.get_governing()['combination'] == 'characteristic'
+    x, w_min_x, w_max_x = sls.get_w_envelope()
+    assert np.all(w_min_x <= w_max_x) and len(x) == dp.beam_design.n_x
+
+
+if __name__ == '__main__':
+    test_EN1990_combinations()
+    test_sls_results()
@@ -0,0 +1,59 @@
+'''
+Test the long-term deflection due to creep and shrinkage over a time axis.
+'''
+
+from bmcs_beam.api import BoundaryConfig, LongTermDeflection
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def get_ltd(beam_conf_name, **kw):
+    dp = get_dp(beam_conf_name)
+    dp.beam_design.F = -0.5 * dp.F_max
+    return LongTermDeflection(dp=dp, **kw)
+
+
+def test_time_axis():
+    t = np.array([28., 60., 365., 3650., 36500.])
+    for conf in [BoundaryConfig.THREE_PB, BoundaryConfig.THREE_SPAN_DIST_LOAD]:
+        ltd = get_ltd(conf)
+        w_xt = ltd.get_w_xt(t)
+        assert w_xt.shape == (ltd.dp.beam_design.n_x, len(t))
+        # the deflection grows with time
+        w_max_t = np.max(np.fabs(w_xt), axis=0)
+        assert np.all(np.diff(w_max_t) > 0)
+        # the evaluation per time coincides with the time axis
+        for j, t_j in enumerate(t):
+            assert np.allclose(ltd.get_w_xt(t_j)[:, 0], w_xt[:, j])
+        # no displacement at the supports
+        x = ltd.dp.beam_design.x
+        L = x[-1]
+        x_s = [0, L / 3, 2 * L / 3, L] if conf == BoundaryConfig.THREE_SPAN_DIST_LOAD else [0, L]
+        for x_i in x_s:
+            assert np.allclose([np.interp(x_i, x, w_x) for w_x in w_xt.T], 0, atol=1e-8)
+
+
+def test_short_term_limit():
+    '''Without creep and shrinkage, the short-term deflection is recovered.
+    '''
+    ltd = get_ltd(BoundaryConfig.THREE_SPAN_DIST_LOAD, t_s=28)
+    assert ltd.get_phi_t(28) == 0 and ltd.get_eps_cs_t(28) == 0
+    assert np.allclose(ltd.get_w_xt(28)[:, 0], ltd.dp.get_w_x())
+
+
+def test_cracked_section():
+    '''The cracked section is softer and the creep reduces the modulus.
+    '''
+    ltd = get_ltd(BoundaryConfig.THREE_PB)
+    sec = ltd.get_section_t(np.array([0., 2.]))
+    assert np.all(sec['I_II'] < sec['I_I'])
+    assert np.allclose(sec['E'][1] * 3, sec['E'][0])
+    # symmetric reinforcement
+    assert np.allclose(sec['z_I'], 150) and np.allclose(sec['S_I'], 0)
+
+
+if __name__ == '__main__':
+    test_time_axis()
+    test_short_term_limit()
+    test_cracked_section()
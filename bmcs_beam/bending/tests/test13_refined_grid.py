@@ -0,0 +1,60 @@
+'''
+Test the deflection on the refined discretization of the beam.
+'''
+
+from bmcs_beam import compute
+from bmcs_beam.api import BoundaryConfig
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+
+
+def test_refined_grid():
+    '''The refined grid contains the points at the loads and the crossings
+    of the cracking and yield moments only, which improve the deflection
+    of the coarse grid.
+    '''
+    for conf in [BoundaryConfig.THREE_PB, BoundaryConfig.FOUR_PB]:
+        dp = get_dp(conf)
+        dp.beam_design.F = -0.9 * dp.F_max
+        dp.beam_design.n_x = 4001
+        w_ref = np.max(np.fabs(dp.get_w_x()))
+        dp.beam_design.n_x = 100
+        dp.beam_design.x_grid = 'refined'
+        w_refined = np.max(np.fabs(dp.get_w_x()))
+        M_refine = dp.beam_design.M_refine
+        assert np.array_equal(M_refine, compute.get_M_kinks(dp.kappa_M_table))
+        assert len(M_refine) == 4 and np.all(np.isin(M_refine, dp.kappa_M_table[0]))
+        # the points at the sagging cracking and yield moments
+        M_x = -dp.beam_design.get_M_x()
+        assert all(np.any(np.isclose(M_x, M)) for M in M_refine[2:])
+        assert len(dp.beam_design.x) <= 100 + 4 + 4
+        assert np.isclose(w_refined, w_ref, rtol=5e-3)
+
+
+def test_refined_Fw():
+    '''The load-deflection curve on the refined grid contains the kinks of
+    all load levels, not only of the current load of the beam design. The
+    grid grows with the crossings of the kinks at all load levels.
+    '''
+    for conf in [BoundaryConfig.THREE_PB, BoundaryConfig.CANTILEVER]:
+        dp = get_dp(conf)
+        dp.beam_design.n_x = 4001
+        F_ref, w_ref = dp.get_Fw()
+        dp.beam_design.n_x = 100
+        w_uniform = dp.get_Fw()[1]
+        dp.beam_design.x_grid = 'refined'
+        dp.beam_design.n_refine = 2
+        F, w = dp.get_Fw()
+        assert np.allclose(F, F_ref)
+        err = np.max(np.fabs(w[1:] / w_ref[1:] - 1))
+        assert err < 2e-2 and err < np.max(np.fabs(w_uniform[1:] / w_ref[1:] - 1))
+        assert len(dp.beam_design.get_x_F(-F)) <= 100 + 4 * len(F) * (1 + 2 * 2)
+        # independent of the current load
+        dp.beam_design.F = -0.9 * dp.F_max
+        assert np.allclose(dp.get_Fw()[1], w)
+
+
+if __name__ == '__main__':
+    test_refined_grid()
+    test_refined_Fw()
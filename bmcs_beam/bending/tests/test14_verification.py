@@ -0,0 +1,53 @@
+'''
+Test the verification runner with synthetic experimental curves.
+'''
+
+import os
+import tempfile
+
+from bmcs_beam.bending import verification
+from bmcs_beam.bending.verification_cases import VERIFICATION_CASES, VERIFICATION_DATA_DIR
+
+import numpy as np
+
+
+def test_error_metrics():
+    w = np.linspace(0, 10, 11)
+    metrics = verification.get_error_metrics(w, 2 * w, np.array([1., 5., 20.]), np.array([3., 10., 30.]))
+    # the point beyond the model curve is ignored
+    assert np.isclose(metrics['rms'], np.sqrt(0.5))
+    assert np.isclose(metrics['rel_rms'], np.sqrt(0.5) / 30)
+    assert np.isclose(metrics['F_max_ratio'], 20 / 30)
+    assert np.isclose(metrics['coverage'], 2 / 3)
+
+
+def test_data_cache():
+    '''Up-to-date columns of the cache are used without reading the xlsx files.
+    '''
+    name = 'pap10_2Cc'
+    stamp = os.path.getmtime(os.path.join(VERIFICATION_DATA_DIR, VERIFICATION_CASES[name].data_file))
+    w, F = np.array([0., 1., 2.]), np.array([0., 3., 4.])
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_file = os.path.join(cache_dir, 'data.npz')
+        np.savez(cache_file, **{name + '/w': w, name + '/F': F, name + '/stamp': stamp})
+        experiments = verification.load_experiments([name], cache_file)
+    assert np.allclose(experiments[name][0], w) and np.allclose(experiments[name][1], F)
+
+
+def test_run_verification():
+    names = ['yao20_qi16_S-1', 'yao20_abd99_G23']
+    # the model curves serve as the experimental ones
+    experiments = {}
+    for name in names:
+        F, w = VERIFICATION_CASES[name].get_dp().get_Fw()
+        experiments[name] = w[::3], F[::3] / 1000
+    results = verification.run_verification(names, n_workers=2, experiments=experiments)
+    assert [r['name'] for r in results] == names
+    for r in results:
+        assert r['rel_rms'] < 1e-6 and np.isclose(r['F_max_ratio'], 1) and r['wall_time'] > 0
+
+
+if __name__ == '__main__':
+    test_error_metrics()
+    test_data_cache()
+    test_run_verification()
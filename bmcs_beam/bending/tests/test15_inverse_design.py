@@ -0,0 +1,59 @@
+'''
+Test the inverse design of the minimum reinforcement and section height.
+'''
+
+from bmcs_beam.api import InverseDesign
+from bmcs_beam.bending.tests.test01_load_deflection_batch import get_dp
+
+import numpy as np
+import pytest
+
+
+def test_reinforcement_area():
+    inv = InverseDesign(dp=get_dp(), F_sls=-9000, span_deflection_limit=500)
+    A_j = inv.solve()
+    # the deflection limit governs and the profile is set to the solution
+    F_max, w_max = inv.get_probe(A_j)
+    assert F_max > 9000 and np.isclose(w_max, inv.span / 500, rtol=1e-2)
+    assert np.isclose(inv.get_value(), A_j)
+    assert inv.get_utilization(A_j) <= 0 < inv.get_utilization(A_j * (1 - 2 * inv.rtol))
+    # the required ultimate load increases the reinforcement
+    n_probes = len(inv.probes)
+    inv.F_uls = 1.2 * F_max
+    A_u = inv.solve()
+    assert A_u > A_j and np.isclose(inv.get_probe(A_u)[0], inv.F_uls, rtol=1e-2)
+    assert len(inv.probes) > n_probes
+    # the memorized probes are reused for a repeated solution
+    n_probes = len(inv.probes)
+    inv.value = A_j
+    assert np.isclose(inv.solve(), A_u, rtol=2 * inv.rtol) and len(inv.probes) - n_probes < 4
+
+
+def test_section_height():
+    inv = InverseDesign(dp=get_dp(), parameter='H', F_sls=-9000)
+    H = inv.solve()
+    assert inv.dp.mc.cross_section_shape_.H == H
+    # the top layer keeps its cover, the bottom layer its height
+    layers = inv.dp.mc.cross_section_layout.items
+    assert np.isclose(layers['top'].z, H - 30) and layers['bottom'].z == 30
+    assert inv.get_utilization(H) <= 0 < inv.get_utilization(H * (1 - 2 * inv.rtol))
+
+
+def test_section_height_near_layers():
+    '''The height is limited to the sections containing the layers
+    in their order.
+    '''
+    inv = InverseDesign(dp=get_dp(), parameter='H', F_sls=-100, span_deflection_limit=10)
+    assert inv.H_min == 60
+    H = inv.solve()
+    layers = inv.dp.mc.cross_section_layout.items
+    assert inv.H_min < H < 300 and layers['bottom'].z < layers['top'].z < H
+    assert inv.get_utilization(H) <= 0
+    with pytest.raises(ValueError):
+        inv.set_value(55)
+
+
+if __name__ == '__main__':
+    test_reinforcement_area()
+    test_section_height()
+    test_section_height_near_layers()
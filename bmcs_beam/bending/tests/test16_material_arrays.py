@@ -0,0 +1,51 @@
+'''
+Test the EC2 and ACI material functions over arrays of concrete grades.
+'''
+
+from bmcs_beam.bending.EC2 import Util_ACI as ACI
+from bmcs_beam.bending.EC2 import Util_EC2 as EC2
+
+import numpy as np
+import pytest
+
+
+def test_arrays_and_scalars():
+    fck = np.array([20., 30., 50., 60., 90.])
+    h = np.array([200., 500., 1000., 1600., 2000.])
+    for get_f, args in [(EC2.elastic_modulus, ()), (EC2.tensile_strength, ()),
+                        (EC2.flex_tensile_strength, (h,)), (EC2.ultimate_strain, ()),
+                        (ACI.elastic_modulus, (25,)), (ACI.tensile_strength, ()),
+                        (ACI.beta, ()), (ACI.ultimate_strain, ())]:
+        f = get_f(fck, *args, units='MPa')
+        assert f.shape == fck.shape
+        f_i = [get_f(fck_i, *[a[i] if np.ndim(a) else a for a in args], units='MPa')
+               for i, fck_i in enumerate(fck)]
+        assert all(np.isscalar(f_ii) for f_ii in f_i)
+        assert np.allclose(f, f_i)
+    for get_ab in [EC2.alpha_beta, EC2.lambda_eta]:
+        assert np.allclose(np.array(get_ab(fck)).T, [get_ab(fck_i) for fck_i in fck])
+
+
+def test_branches():
+    # the strength classes above C50/60 follow the logarithmic tensile strength,
+    # the reduced ultimate strain and the reduced rectangular stress block
+    fck = np.array([50., 90.])
+    assert np.allclose(EC2.tensile_strength(fck), [0.3 * 50 ** (2 / 3), 2.12 * np.log(1 + 98 / 10)])
+    assert np.allclose(EC2.ultimate_strain([40., 90.]), [3.5e-3, 2.6e-3])
+    assert np.allclose(EC2.lambda_eta(fck), [[0.8, 0.7], [1.0, 0.8]])
+    assert np.all(EC2.flex_tensile_strength(30, [200., 1600., 2000.]) <= EC2.tensile_strength(30))
+
+
+def test_units():
+    fck = np.array([30., 30. * 145.038])
+    units = np.array(['MPa', 'psi'])
+    assert np.allclose(EC2.elastic_modulus(fck, units), EC2.elastic_modulus(30) * np.array([1, 145.038]))
+    assert np.allclose(ACI.tensile_strength(fck, units), ACI.tensile_strength(30, 'MPa') * np.array([1, 145.038]))
+    with pytest.raises(KeyError):
+        EC2.tensile_strength(fck, 'ksi')
+
+
+if __name__ == '__main__':
+    test_arrays_and_scalars()
+    test_branches()
+    test_units()
@@ -0,0 +1,53 @@
+'''
+Test the batch EC2 design of rectangular sections against the design
+of the single beams.
+'''
+
+from bmcs_beam.bending.EC2 import Util_EC2 as EC2
+from bmcs_beam.bending.EC2.RC import RectangularBeam
+
+import numpy as np
+
+
+def get_sections(n):
+    rng = np.random.default_rng(0)
+    h = rng.uniform(300, 1200, n)
+    return dict(b=rng.uniform(200, 600, n), h=h, d=0.9 * h, As=rng.uniform(200, 8000, n),
+                fck=rng.uniform(20, 90, n), fyk=500., Es=200000.)
+
+
+def test_design_table():
+    sections = get_sections(50)
+    table = RectangularBeam.EC2_design_table(**sections)
+    assert all(column.shape == (50,) for column in table.values())
+    for i in range(50):
+        beam = RectangularBeam()
+        for name, value in sections.items():
+            setattr(beam, name, np.broadcast_to(value, 50)[i].item())
+        beam.units = 'MPa'
+        assert np.isclose(table['MRd'][i], beam.EC2_design_moment())
+        assert np.isclose(table['Mcr'][i], beam.EC2_cracking_moment())
+        assert np.isclose(table['Mel'][i], beam.EC2_elastic_moment())
+        A_min, A_max = EC2.steel_ratio(beam.As, beam.fck, beam.fyk, beam.b, beam.d, beam.h,
+                                       table['Xu_max'][i])
+        assert np.isclose(table['A_min'][i], A_min) and np.isclose(table['A_max'][i], A_max)
+    assert table['As_max_ok'].dtype == bool
+    assert np.all(table['ductile'] == (table['Xu'] < table['Xu_max']))
+
+
+def test_units():
+    '''The psi-inch sections give the moments of the converted MPa-mm sections.
+    '''
+    sections = get_sections(10)
+    table = RectangularBeam.EC2_design_table(**sections)
+    scale = dict(b=1 / 25.4, h=1 / 25.4, d=1 / 25.4, As=1 / 25.4 ** 2, fck=145.038, fyk=145.038, Es=145.038)
+    table_psi = RectangularBeam.EC2_design_table(
+        **{name: value * scale[name] for name, value in sections.items()}, units='psi')
+    M_scale = 145.038 / 25.4 ** 3
+    for name in ['MRd', 'Mcr', 'Mel']:
+        assert np.allclose(table_psi[name], table[name] * M_scale)
+
+
+if __name__ == '__main__':
+    test_design_table()
+    test_units()
@@ -0,0 +1,64 @@
+'''
+Test the batch EC2 design of prestressed sections against the iterative
+design of the single beams.
+'''
+
+from bmcs_beam.bending.EC2 import PSC
+from bmcs_beam.bending.EC2.BoxGirder import BoxGirder
+from bmcs_beam.bending.EC2.TeeBeam import TeeBeam
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def get_table(beam, **kw):
+    sections = {name: getattr(beam, name) for name in
+                ['bf', 'hf', 'bw', 'd_P', 'e_P', 'Ap', 'Pm', 'fck', 'fpk', 'Ep', 'd_S', 'As', 'fyk', 'Es', 'k']}
+    sections.update(kw)
+    return PSC.PrestressedBeam.EC2_design_table(**sections)
+
+
+def test_single_beams():
+    # the iteration of the beams stops at the relative tolerance 1e-3
+    for beam in [TeeBeam(), BoxGirder()]:
+        table = get_table(beam)
+        assert table['converged'] and np.isclose(table['MRd'], beam.EC2_design_moment(), rtol=2e-3)
+    beam = PSC.RectangularBeam()
+    table = PSC.PrestressedBeam.EC2_design_table(
+        bf=beam.b, hf=np.inf, bw=beam.b, d_P=beam.d_P, e_P=beam.e_P, Ap=beam.Ap,
+        Pm=beam.Pm, fck=beam.fck, fpk=beam.fpk, Ep=beam.Ep)
+    assert np.isclose(table['MRd'], beam.EC2_design_moment(), rtol=1e-2)
+    plt.close('all')
+
+
+def test_batch():
+    beam = TeeBeam()
+    plt.close('all')
+    rng = np.random.default_rng(0)
+    n = 1000
+    sections = dict(Ap=rng.uniform(500, 6000, n), fck=rng.uniform(25, 80, n),
+                    hf=rng.uniform(80, 300, n))
+    table = get_table(beam, **sections)
+    # without equilibrium at the transition to the T-section, the
+    # iteration of the beam ends in a cycle
+    converged = table['converged']
+    assert 0.5 < np.mean(converged) < 1
+    # both the compression zone in the flange and below it
+    in_flange = table['Xu'] < sections['hf']
+    assert np.any(in_flange & converged) and np.any(~in_flange & converged)
+    # equilibrium - the fixed point of the prestress
+    alpha, _ = PSC.EC2.alpha_beta(sections['fck'])
+    la, eta = PSC.EC2.lambda_eta(sections['fck'])
+    fcd = sections['fck'] / beam.gamma_c
+    N_c = np.where(in_flange, alpha * beam.bf * table['Xu'] * fcd,
+                   eta * fcd * (sections['hf'] * (beam.bf - beam.bw) + beam.bw * la * table['Xu']))
+    assert np.allclose(N_c[converged], (sections['Ap'] * table['fp'])[converged])
+    # the sections are independent
+    for i in range(0, n, 100):
+        table_i = get_table(beam, **{name: value[i] for name, value in sections.items()})
+        assert all(np.isclose(table_i[name], table[name][i]) for name in ['Xu', 'fp', 'MRd'])
+
+
+if __name__ == '__main__':
+    test_single_beams()
+    test_batch()
@@ -0,0 +1,62 @@
+'''
+Test the ultimate moment of polygonal sections against the rectangular
+section and the special cases of the T-beam and the box girder.
+'''
+
+from bmcs_beam.bending.EC2 import Util_EC2 as EC2
+from bmcs_beam.bending.EC2.BoxGirder import BoxGirder
+from bmcs_beam.bending.EC2.PolygonSection import PolygonSection
+from bmcs_beam.bending.EC2.PSC import PrestressedBeam
+from bmcs_beam.bending.EC2.TeeBeam import TeeBeam
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def test_rectangle():
+    b, H, d, As, fck = 300., 600., 550., 1500., 60.
+    section = PolygonSection([(0, 0), (b, 0), (b, H), (0, H)], steel=[(d, As)], fck=fck)
+    A, S = section.get_compression_zone([0, 100, H, 2 * H])
+    assert np.allclose(A, [0, b * 100, b * H, b * H]) and np.allclose(S, [0, b * 100 ** 2 / 2, b * H ** 2 / 2, b * H ** 2 / 2])
+    la, eta = EC2.lambda_eta(fck)
+    fyd = 500 / 1.15
+    Xu = As * fyd / (eta * fck / 1.5 * b * la)
+    assert np.isclose(section.solve_Xu(), Xu)
+    assert np.isclose(section.EC2_design_moment(), As * fyd * (d - la * Xu / 2))
+    assert np.all(np.diff(section.get_N(np.linspace(1, 2 * H, 50))) > 0)
+
+
+def test_tee_beam():
+    beam = TeeBeam()
+    section = PolygonSection(PolygonSection.tee_outline(beam.bf, beam.hf, beam.bw, beam.H),
+                             tendons=[(beam.d_P, beam.Ap, beam.Pm)], fck=beam.fck, fpk=beam.fpk, Ep=beam.Ep)
+    A, S = section.get_compression_zone(beam.H)
+    assert np.isclose(A, beam.bf * beam.hf + beam.bw * (beam.H - beam.hf))
+    assert np.isclose(S / A, beam.H - beam.yb)
+    table = PrestressedBeam.EC2_design_table(**{name: getattr(beam, name) for name in
+                                                ['bf', 'hf', 'bw', 'd_P', 'e_P', 'Ap', 'Pm', 'fck', 'fpk', 'Ep']})
+    assert np.isclose(section.solve_Xu(), table['Xu'])
+    assert np.isclose(section.EC2_design_moment() - beam.Pm * beam.e_P, table['MRd'])
+    plt.close('all')
+
+
+def test_box_girder():
+    beam = BoxGirder()
+    H = beam.H
+    outline = [(-beam.Bt / 2, 0), (beam.Bt / 2, 0), (beam.Bb / 2, H), (-beam.Bb / 2, H)]
+    void = [(-beam.bt / 2, beam.ht), (beam.bt / 2, beam.ht), (beam.bb / 2, H - beam.hb), (-beam.bb / 2, H - beam.hb)]
+    section = PolygonSection(outline, voids=[void], tendons=[(beam.d_P, beam.Ap, beam.Pm)],
+                             steel=[(50, 1000), (H - 50, 2000)], fck=beam.fck, fpk=beam.fpk, Ep=beam.Ep)
+    A, S = section.get_compression_zone(H)
+    assert np.isclose(A, beam.Ac) and np.isclose(S / A, beam.yt)
+    Xu = section.solve_Xu()
+    assert np.isclose(section.get_N(Xu), 0, atol=1e-6 * beam.Ap * beam.fpk)
+    # the compression zone reaches into the webs
+    assert EC2.lambda_eta(beam.fck)[0] * Xu > beam.ht
+    plt.close('all')
+
+
+if __name__ == '__main__':
+    test_rectangle()
+    test_tee_beam()
+    test_box_girder()
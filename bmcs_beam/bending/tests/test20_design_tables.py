@@ -0,0 +1,87 @@
+'''
+Test the dimensionless EC2 design tables and the lookup of the required
+reinforcement against the design moment of rectangular sections.
+'''
+
+import os
+import tempfile
+import warnings
+
+from bmcs_beam.bending.EC2 import DesignTables
+from bmcs_beam.bending.EC2.RC import RectangularBeam
+
+import numpy as np
+import pytest
+
+
+def test_design_tables():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ['BMCS_BEAM_CACHE_DIR'] = cache_dir
+        try:
+            check_table_cache()
+            check_required_reinforcement()
+        finally:
+            del os.environ['BMCS_BEAM_CACHE_DIR']
+            DesignTables._tables.clear()
+
+
+def check_table_cache():
+    DesignTables.clear_tables()
+    table = DesignTables.get_table(30, 500)
+    path = DesignTables.get_table_file(30, 500, 200000, 1000)
+    assert os.path.exists(path)
+    assert np.all(np.diff(table['mu']) > 0)
+    assert np.isclose(table['mu_lim'], table['mu'][-1]) and table['xi'][-1] == table['xi_lim']
+    # the table is read from the cache directory
+    DesignTables._tables.clear()
+    table_read = DesignTables.get_table(30, 500)
+    assert all(np.allclose(table_read[name], value) for name, value in table.items())
+    # a damaged file is ignored and replaced
+    DesignTables._tables.clear()
+    with open(path, 'wb') as f:
+        f.write(b'damaged')
+    with pytest.warns(UserWarning):
+        table_read = DesignTables.get_table(30, 500)
+    assert np.allclose(table_read['mu'], table['mu'])
+    DesignTables._tables.clear()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        DesignTables.get_table(30, 500)
+    DesignTables.clear_tables()
+    assert not os.path.exists(path)
+
+
+def check_required_reinforcement():
+    rng = np.random.default_rng(0)
+    n = 2000
+    b, d = rng.uniform(200, 600, n), rng.uniform(300, 1000, n)
+    fck, fyk = rng.choice([20., 30., 50., 70.], n), rng.choice([420., 500.], n)
+    As = rng.uniform(300, 4000, n)
+    design = RectangularBeam.EC2_design_table(b=b, h=d / 0.9, d=d, As=As, fck=fck, fyk=fyk, Es=200000.)
+    required = DesignTables.required_reinforcement(design['MRd'], b, d, fck, fyk)
+    # the reinforcement of the ductile sections is recovered without
+    # compression reinforcement
+    ductile = design['ductile']
+    assert 0.5 < np.mean(ductile) < 1
+    assert np.allclose(required['As1'][ductile], As[ductile], rtol=1e-4)
+    assert np.allclose(required['xi'][ductile], (design['Xu'] / d)[ductile], rtol=1e-4)
+    assert np.all(required['As2'][ductile] == 0)
+    # the moment of the over-reinforced sections requires compression reinforcement
+    over = ~ductile & (design['Xu'] < d)
+    assert np.all(required['As2'][over] > 0)
+    # the scalar section gives the same reinforcement
+    i = np.flatnonzero(~ductile)[0]
+    required_i = DesignTables.required_reinforcement(design['MRd'][i], b[i], d[i], fck[i], fyk[i])
+    assert np.isclose(required_i['As1'], required['As1'][i]) and np.isclose(required_i['As2'], required['As2'][i])
+    # the compression reinforcement must lie above the tension reinforcement
+    with pytest.raises(ValueError):
+        DesignTables.required_reinforcement(300e6, 300, 450, 30, 500, d2=450)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        required_d2 = DesignTables.required_reinforcement(
+            [1e6, 300e6], 300, 450, 30, 500, d2=[450 - 1e-9, 45])
+    assert np.all(np.isfinite(required_d2['As1'])) and required_d2['As2'][0] == 0
+
+
+if __name__ == '__main__':
+    test_design_tables()
@@ -0,0 +1,160 @@
+'''
+Verification of the deflection profile against the experimental
+load-deflection curves of the verification cases. The curves are read
+from the xlsx files once and stored in a columnar cache, the models of
+the cases are evaluated in parallel worker processes. The error of
+each case is reported as the RMS of the load difference at the
+experimental deflections together with the wall time of the model.
+
+Usage:
+
+    python -m bmcs_beam.bending.verification
+    python -m bmcs_beam.bending.verification --filter yao20 --workers 2 --output results.json
+'''
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from bmcs_beam.cache import get_cache_dir
+from bmcs_beam.bending.verification_cases import VERIFICATION_CASES, VERIFICATION_DATA_DIR
+
+
+def get_data_cache_file():
+    '''
+    File of the columnar cache of the experimental curves
+    '''
+    return os.path.join(get_cache_dir(), 'verification_data.npz')
+
+
+def read_experiment(case):
+    '''
+    Experimental curve of the case as the arrays (w, F) of the deflection
+    [mm] and of the load scaled to the load of the model [kN]. The xlsx
+    files are read with pandas, which is required for this function only.
+    '''
+    import pandas as pd
+    data = pd.read_excel(os.path.join(VERIFICATION_DATA_DIR, case.data_file),
+                         case.sheet or 0, engine='openpyxl')
+    w_F = data[[case.w_col, case.F_col]].dropna().to_numpy(dtype=np.float64)
+    return w_F[:, 0], w_F[:, 1] * case.F_factor
+
+
+def _get_data_stamp(case):
+    return os.path.getmtime(os.path.join(VERIFICATION_DATA_DIR, case.data_file))
+
+
+def load_experiments(names=None, cache_file=None):
+    '''
+    Experimental curves {name: (w, F)} of the cases. The curves are taken
+    from the columnar cache - a single npz file with the arrays of all
+    cases - and read from the xlsx files only if they are missing or
+    older than the xlsx file. The updated cache is written back.
+    '''
+    names = list(VERIFICATION_CASES) if names is None else list(names)
+    cache_file = cache_file or get_data_cache_file()
+    columns = {}
+    if os.path.exists(cache_file):
+        with np.load(cache_file) as npz:
+            columns = dict(npz)
+    experiments, updated = {}, False
+    for name in names:
+        case = VERIFICATION_CASES[name]
+        stamp = _get_data_stamp(case)
+        if name + '/stamp' not in columns or columns[name + '/stamp'] != stamp:
+            w, F = read_experiment(case)
+            columns.update({name + '/w': w, name + '/F': F, name + '/stamp': np.float64(stamp)})
+            updated = True
+        experiments[name] = columns[name + '/w'], columns[name + '/F']
+    if updated:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        # the file is replaced at once for concurrent runs
+        tmp_file = cache_file + '.%d.tmp.npz' % os.getpid()
+        np.savez(tmp_file, **columns)
+        os.replace(tmp_file, cache_file)
+    return experiments
+
+
+def get_error_metrics(w_model, F_model, w_exp, F_exp):
+    '''
+    Deviation of the model curve from the experimental one - the RMS of the
+    load difference at the experimental deflections within the range of
+    the model curve, the RMS related to the maximum experimental load and
+    the ratio of the maximum loads
+    '''
+    w_model, F_model = np.asarray(w_model), np.asarray(F_model)
+    w_exp, F_exp = np.asarray(w_exp), np.asarray(F_exp)
+    # the model curve is monotone in w up to the ultimate load
+    i = np.argsort(w_model, kind='stable')
+    inside = (w_exp >= w_model[i[0]]) & (w_exp <= w_model[i[-1]])
+    dF = np.interp(w_exp[inside], w_model[i], F_model[i]) - F_exp[inside]
+    rms = np.sqrt(np.mean(dF ** 2)) if np.any(inside) else np.nan
+    return dict(rms=rms, rel_rms=rms / np.max(np.fabs(F_exp)),
+                F_max_ratio=np.max(F_model) / np.max(F_exp),
+                coverage=np.mean(inside))
+
+
+def run_case(name, w_exp, F_exp):
+    '''
+    Evaluate the model of the case and compare it with the experimental
+    curve. Returns the dictionary of the error metrics, the wall time of
+    the model construction and of the load-deflection curve and the
+    model curve (w, F) with the load in [kN].
+    '''
+    t_start = time.perf_counter()
+    dp = VERIFICATION_CASES[name].get_dp()
+    F, w = dp.get_Fw()
+    wall_time = time.perf_counter() - t_start
+    F = F / 1000
+    return dict(name=name, wall_time=wall_time, w=w, F=F,
+                **get_error_metrics(w, F, w_exp, F_exp))
+
+
+def run_verification(names=None, n_workers=None, experiments=None, log=None):
+    '''
+    Results of run_case for the cases given by their names, all cases
+    by default, in the order of the names. The cases are distributed over
+    n_workers processes, n_workers=1 evaluates them in the current process.
+    '''
+    names = list(VERIFICATION_CASES) if names is None else list(names)
+    experiments = load_experiments(names) if experiments is None else experiments
+    args = [(name,) + tuple(experiments[name]) for name in names]
+    if n_workers == 1:
+        results = [run_case(*a) for a in args]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(n_workers) as executor:
+            futures = [executor.submit(run_case, *a) for a in args]
+            results = [future.result() for future in futures]
+    if log:
+        for r in results:
+            log('%-28s rms = %8.3f kN (%5.1f %%)  F_max ratio = %5.3f  %7.2f s'
+                % (r['name'], r['rms'], 100 * r['rel_rms'], r['F_max_ratio'], r['wall_time']))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filter', default='', help='run cases containing the string')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes, all cores by default')
+    parser.add_argument('--output', help='JSON file of the error metrics and wall times')
+    args = parser.parse_args(argv)
+
+    names = [name for name in VERIFICATION_CASES if args.filter in name]
+    t_start = time.perf_counter()
+    results = run_verification(names, args.workers, log=print)
+    print('%d cases in %.1f s' % (len(results), time.perf_counter() - t_start))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([{key: value for key, value in r.items() if key not in ('w', 'F')}
+                       for r in results], f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
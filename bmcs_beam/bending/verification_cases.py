@@ -0,0 +1,162 @@
+'''
+Experimental load-deflection tests in notebooks/verification_data with the
+corresponding deflection profile models. The material and geometrical
+parameters follow the notebook deflection_profile_verification.ipynb
+mapped to the layered cross section design of bmcs_cross_section.
+'''
+
+import collections
+import os
+
+from bmcs_beam.beam_config.boundary_conditions import BoundaryConfig
+from bmcs_beam.bending.deflection_profile import DeflectionProfile
+from bmcs_cross_section.api import ReinfLayer
+
+VERIFICATION_DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'notebooks', 'verification_data')
+
+VerificationCase = collections.namedtuple(
+    'VerificationCase', ['get_dp', 'data_file', 'sheet', 'w_col', 'F_col', 'F_factor'])
+'''Model factory and the location of the experimental curve - the xlsx file
+relative to VERIFICATION_DATA_DIR, the sheet (None for the first one) and
+the columns of deflection [mm] and load [kN]. F_factor scales the
+experimental load to the load F of the model in [kN].
+'''
+
+
+def get_dp(conf, L, B, H, E, eps_cr, eps_tu, eps_cy, eps_cu, mu,
+           layers, high_kappa, first_load_distance=0, B_w=None, H_w=None):
+    '''
+    Deflection profile of a rectangular section, or of a T section
+    if the web dimensions B_w and H_w are given. The layers are given as
+    a list of tuples (z, A, matmod, E, f), with the strength f standing for
+    f_sy of steel and f_t of carbon. The strains are given as magnitudes.
+    '''
+    dp = DeflectionProfile()
+    mc = dp.mc
+    mc.low_kappa = 0
+    mc.high_kappa = high_kappa
+    if B_w is None:
+        mc.cross_section_shape_.B = B
+    else:
+        mc.cross_section_shape = 'T-shape'
+        mc.cross_section_shape_.B_f = B
+        mc.cross_section_shape_.B_w = B_w
+        mc.cross_section_shape_.H_w = H_w
+    mc.cross_section_shape_.H = H
+    compression, tension = mc.matrix_.compression_, mc.matrix_.tension_
+    compression.E_cc = E
+    # compressive strains are negative in the material law
+    compression.eps_cy = -eps_cy
+    compression.eps_cu = -eps_cu
+    tension.E_ct = E
+    tension.eps_cr = eps_cr
+    tension.eps_tu = eps_tu
+    tension.mu = mu
+    for i, (z, A, matmod, E_r, f_r) in enumerate(layers):
+        # the layers of the layout are identified by their names
+        layer = ReinfLayer(name='layer %d' % (i + 1), z=z, A=A, matmod=matmod)
+        if matmod == 'steel':
+            layer.matmod_.trait_set(E_s=E_r, f_sy=f_r)
+        else:
+            layer.matmod_.trait_set(E=E_r, f_t=f_r)
+        mc.cross_section_layout.add_layer(layer)
+    dp.beam_design.beam_conf_name = conf
+    # the load distance is an attribute of the shared enumeration member
+    dp.beam_design.beam_conf_name.first_load_distance = first_load_distance
+    dp.beam_design.L = L
+    return dp
+
+
+def get_dp_rectangular(conf, L, b, h, E, E_s, f_sy, eps_cr, rho, beta_tu, omega,
+                       mu, alpha, lambda_cu, high_kappa, matmod='carbon'):
+    '''
+    Deflection profile of a rectangular section with a single layer of
+    reinforcement given by the normalized parameters of the papers
+    '''
+    return get_dp(conf, L, b, h, E, eps_cr=eps_cr, eps_tu=beta_tu * eps_cr,
+                  eps_cy=omega * eps_cr, eps_cu=lambda_cu * eps_cr, mu=mu,
+                  layers=[(h * (1 - alpha), rho * b * alpha * h, matmod, E_s, f_sy)],
+                  high_kappa=high_kappa)
+
+
+def get_dp_t_section(conf, L, b, h, E, E_s, f_sy, eps_cr, rho, beta_tu, omega,
+                     mu, alpha, lambda_cu, o, zeta, high_kappa):
+    '''
+    Deflection profile of a T section with a single layer of steel
+    reinforcement given by the normalized parameters of the papers
+    '''
+    return get_dp(conf, L, b, h, E, eps_cr=eps_cr, eps_tu=beta_tu * eps_cr,
+                  eps_cy=omega * eps_cr, eps_cu=lambda_cu * eps_cr, mu=mu,
+                  layers=[(h * (1 - alpha), rho * b * h, 'steel', E_s, f_sy)],
+                  high_kappa=high_kappa, B_w=o * b, H_w=(1 - zeta) * h)
+
+
+def get_el_ghadioui2020_B_M_C_K1():
+    E = 33525
+    return get_dp(BoundaryConfig.FOUR_PB, L=4700, B=400, H=200, E=E,
+                  eps_cr=0.00006, eps_tu=0.00008, eps_cy=0.00175, eps_cu=0.0035, mu=0.0,
+                  layers=[(35, 2 * 70.14, 'carbon', 135121, 0.014 * 135121)],
+                  high_kappa=0.000082, first_load_distance=1925)
+
+
+def get_hei20_HB_SU_0():
+    E = 39500
+    eps_cr = ((6.365 + 6.306 + 5.635 + 5.627 + 5.452 + 5.627) / 6) / E
+    return get_dp(BoundaryConfig.FOUR_PB, L=840, B=45, H=30, E=E,
+                  eps_cr=eps_cr, eps_tu=9.02 / E, eps_cy=72 / E, eps_cu=2 * 72 / E, mu=0.0,
+                  layers=[(8, 3.62, 'carbon', 240000, 2712),
+                          (22, 3.62, 'carbon', 240000, 2712)],
+                  high_kappa=0.0007, first_load_distance=320)
+
+
+def get_pap10_2Cc():
+    return get_dp_rectangular(BoundaryConfig.FOUR_PB, L=3 * 650, b=150, h=100, E=30000,
+                              E_s=225000, f_sy=3350, eps_cr=0.00016,
+                              rho=(0.0079 * 2 * 150 * 12) / (150 * 100), beta_tu=2,
+                              omega=0.68, mu=0.0, alpha=0.94, lambda_cu=21.93,
+                              high_kappa=0.0001)
+
+
+def get_bie19_C3_3_8_2():
+    return get_dp_rectangular(BoundaryConfig.THREE_PB, L=2 * 320, b=200, h=99, E=44429,
+                              E_s=244835, f_sy=2737, eps_cr=0.0002616, rho=0.00234,
+                              beta_tu=2, omega=0.28 / 0.2616, mu=0.2, alpha=0.77,
+                              lambda_cu=2.92 / 0.2616, high_kappa=0.0008)
+
+
+def get_yao20_qi16_S_1():
+    return get_dp_t_section(BoundaryConfig.THREE_PB, L=1140, b=120, h=140, E=36500,
+                            E_s=200000, f_sy=761, eps_cr=0.000140, rho=0.0496,
+                            beta_tu=15, omega=22.7, mu=0.3, alpha=0.81, lambda_cu=25,
+                            o=0.33, zeta=0.25, high_kappa=0.00006)
+
+
+def get_yao20_abd99_G23():
+    return get_dp_t_section(BoundaryConfig.FOUR_PB, L=1800, b=250, h=210, E=20400,
+                            E_s=200000, f_sy=465, eps_cr=0.000210, rho=0.0209,
+                            beta_tu=15, omega=5.9, mu=0.3, alpha=0.81, lambda_cu=40.9,
+                            o=0.4, zeta=0.29, high_kappa=0.00005)
+
+
+VERIFICATION_CASES = {
+    'el_ghadioui2020_B-M-C-K1': VerificationCase(
+        get_el_ghadioui2020_B_M_C_K1, os.path.join('el_ghadioui2020', 'fig_3.xlsx'), None,
+        'B-M-C-K1_deflection', 'B-M-C-K1_load', 0.5),
+    'hei20_HB-SU-0-1': VerificationCase(
+        get_hei20_HB_SU_0, os.path.join('hei20', 'hei20.xlsx'), 'HB-SU-0',
+        'HB-SU-0-1_w', 'HB-SU-0-1_F', 0.25),
+    'pap10_2Cc': VerificationCase(
+        get_pap10_2Cc, os.path.join('pap10', 'pap10.xlsx'), '2Cc',
+        '2Cc_w', '2Cc_F', 0.5),
+    'bie19_C3-3-8-2': VerificationCase(
+        get_bie19_C3_3_8_2, os.path.join('Bie19', 'bie19.xlsx'), None,
+        'C3-3-8-2_w', 'C3-3-8-2_F', 2.),
+    'yao20_qi16_S-1': VerificationCase(
+        get_yao20_qi16_S_1, os.path.join('yao20_yao_mobasher', 'figure_14', 'qi16.xlsx'), None,
+        'S_1_exp_w', 'S_1_exp_F', 2. / 1000),
+    'yao20_abd99_G23': VerificationCase(
+        get_yao20_abd99_G23, os.path.join('yao20_yao_mobasher', 'figure_14', 'abd99.xlsx'), None,
+        'G23_w', 'G23_F', 1.),
+}
@@ -0,0 +1,16 @@
+'''
+Persistent cache directory shared by the kernel cache, the design tables,
+the load-deflection studies, the verification data and the benchmark
+baseline. It is given by the environment variable BMCS_BEAM_CACHE_DIR
+and defaults to ~/.cache/bmcs_beam.
+'''
+
+import os
+
+
+def get_cache_dir():
+    '''
+    Directory of the cached data
+    '''
+    return os.environ.get('BMCS_BEAM_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'bmcs_beam'))
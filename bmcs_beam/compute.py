@@ -0,0 +1,403 @@
+'''
+Headless compute API of the bending models. The functions depend on NumPy
+and SciPy only and return plain arrays - no matplotlib, sympy, ipywidgets
+or traits models are imported, so that batch workers can evaluate beams
+without the interactive stack. The interactive DeflectionProfile delegates
+its computation to these functions.
+
+The moment-curvature relation enters as the arrays (M_I, kappa_I) of the
+inverse relation, e.g. MKappa.inv_M_kappa evaluated once and stored
+with np.savez. The moments follow the sign convention of the cross section,
+i.e. positive for sagging, the loads and the moments along the beam follow
+the convention of the beam configurations, i.e. negative for sagging.
+
+Usage:
+
+    M_I, kappa_I = np.load('mkappa.npz').values()
+    kappa_M_table = get_kappa_M_table(M_I, kappa_I)
+    x = np.linspace(0, 3000, 101)
+    F_max = get_F_max(x, BoundaryConfig.THREE_PB, M_I)
+    F, w = get_Fw(x, BoundaryConfig.THREE_PB, kappa_M_table, F_max)
+'''
+
+import warnings
+
+import numpy as np
+from scipy.integrate import cumtrapz
+
+from bmcs_beam.beam_config import closed_form
+from bmcs_beam.beam_config.closed_form import BoundaryConfig
+from bmcs_beam.profiling import stage, timed
+
+
+def get_kappa_M_table(M_I, kappa_I):
+    '''
+    Monotone table of the inverse moment-curvature relation. Returns the
+    strictly increasing moments M_T, the corresponding curvatures kappa_T
+    and the extreme curvatures returned outside of the table.
+    '''
+    M_I = np.asarray(M_I, dtype=np.float64)
+    kappa_I = np.asarray(kappa_I, dtype=np.float64)
+    # starting from zero curvature, cut off the moment reductions
+    # on the negative and on the positive branch
+    i0 = np.argmin(np.fabs(kappa_I))
+    M_T = np.hstack([np.minimum.accumulate(M_I[i0::-1])[::-1],
+                     np.maximum.accumulate(M_I[i0:])[1:]])
+    # plateaus are represented by the point closest to zero curvature
+    dM_T = np.diff(M_T)
+    keep = np.ones_like(M_T, dtype=bool)
+    keep[:i0] = dM_T[:i0] > 0
+    keep[i0 + 1:] = dM_T[i0:] > 0
+    M_T, kappa_T = M_T[keep], kappa_I[keep]
+    # the unloaded state is not necessarily among the discretization points
+    i = np.searchsorted(M_T, 0)
+    if 0 < i < len(M_T) and M_T[i] != 0:
+        M_T, kappa_T = np.insert(M_T, i, 0), np.insert(kappa_T, i, 0)
+    return M_T, kappa_T, kappa_I[0], kappa_I[-1]
+
+
+def get_kappa_M(M, kappa_M_table):
+    '''
+    Curvature for an arbitrary array of moments interpolated in the
+    kappa_M_table. Beyond the table, the extreme curvatures are returned.
+    '''
+    M_T, kappa_T, kappa_min, kappa_max = kappa_M_table
+    with stage('compute.kappa_lookup'):
+        kappa = np.interp(M, M_T, kappa_T, left=kappa_min)
+        return np.where(M >= M_T[-1], kappa_max, kappa)
+
+
+def get_M_kinks(kappa_M_table, n_kinks=2, ratio=2.):
+    '''
+    Moments at the kinks of the kappa_M_table, e.g. cracking and yielding.
+    Starting from the unloaded state, the first n_kinks points on each
+    branch at which the flexibility d_kappa / d_M grows at least by the
+    factor ratio are returned in increasing order. The smaller changes
+    of the nonlinear branches and the kinks beyond, e.g. near the moment
+    capacity, are skipped.
+    '''
+    M_T, kappa_T = kappa_M_table[0], kappa_M_table[1]
+    f_T = np.diff(kappa_T) / np.diff(M_T)
+    i0 = np.searchsorted(M_T, 0)
+    # flexibility ratios of the outer to the inner segment at the interior points
+    i_pos = np.arange(max(i0, 1), len(M_T) - 1)
+    i_pos = i_pos[f_T[i_pos] >= ratio * f_T[i_pos - 1]][:n_kinks]
+    i_neg = np.arange(min(i0, len(M_T) - 1) - 1, 0, -1)
+    i_neg = i_neg[f_T[i_neg - 1] >= ratio * f_T[i_neg]][:n_kinks]
+    return M_T[np.sort(np.hstack([i_neg, i_pos]).astype(int))]
+
+
+def get_flexibility_0(kappa_M_table):
+    '''
+    Initial flexibility d_kappa / d_M of the uncracked cross section
+    '''
+    dM = 1e-6 * np.max(np.fabs(kappa_M_table[0]))
+    return (get_kappa_M(dM, kappa_M_table) - get_kappa_M(-dM, kappa_M_table)) / (2 * dM)
+
+
+def get_flexibility_t(M, kappa_M_table):
+    '''
+    Tangential flexibility d_kappa / d_M of the kappa_M_table for an
+    arbitrary array of moments. Beyond the table, where the curvature
+    is constant, a small fraction of the initial flexibility is returned
+    to keep the tangent system of the moment redistribution regular.
+    '''
+    M_T, kappa_T, _, _ = kappa_M_table
+    f_0 = get_flexibility_0(kappa_M_table)
+    with stage('compute.kappa_lookup'):
+        f_T = np.diff(kappa_T) / np.diff(M_T)
+        i = np.clip(np.searchsorted(M_T, M, side='right') - 1, 0, len(f_T) - 1)
+        f_t = np.where((M < M_T[0]) | (M >= M_T[-1]), 0, f_T[i])
+        return np.maximum(f_t, 1e-6 * f_0)
+
+
+def get_M_xF(x, config, F):
+    '''
+    Bending moment profiles along the beam for an array of loads F -
+    shape (n_x, n_F)
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    get_M, _ = closed_form.get_MQ_kernels(x[-1], config)
+    F_F = np.asarray(F, dtype=np.float64)[np.newaxis, :]
+    # constant branches of the kernels return scalars
+    return get_M(x[:, np.newaxis], F_F) * np.ones((len(x), F_F.shape[1]))
+
+
+def get_M_envelope(x, config):
+    '''
+    Maximum and minimum moment along the beam due to the downward unit load
+    in the sign convention of the cross section, i.e. positive for sagging
+    '''
+    M_x = get_M_xF(x, config, [1.])[:, 0]
+    return np.max(M_x), np.min(M_x)
+
+
+def get_F_max(x, config, M_I):
+    '''
+    Ultimate load at which the elastic moment first reaches the sagging or
+    the hogging moment capacity of the cross section given by the ends of
+    the moment-curvature relation
+    '''
+    M_I = np.asarray(M_I, dtype=np.float64)
+    return float(closed_form.get_F_at_M(float(x[-1]), config.value, M_I[-1], M_I[0],
+                                        config.first_load_distance))
+
+
+@timed('compute.solve_xF')
+def solve_xF(x, config, F, kappa_M_table, tol=1e-8, max_iter=100):
+    '''
+    Profiles of moment, curvature, rotation and deflection for an array
+    of loads F returned as arrays of shape (n_x, n_F).
+
+    The support reactions and the integration constants C_0 + C_1 x
+    of the deflection are the unknowns of a linear system combining
+    the equilibrium at the end of the beam with the kinematic
+    conditions - zero deflection at point supports and zero rotation
+    at clamped supports. The system is solved by Newton iterations
+    with the tangential flexibility of the cracked cross section.
+    The steps of the moment redistribution in statically indeterminate
+    systems are shortened to the minimum of the complementary energy,
+    which keeps the iterations convergent across the kinks of the
+    moment-curvature relation. Statically determinate systems are
+    resolved within the first iteration. The relative tolerance tol
+    applies to the support reactions.
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    L = x[-1]
+    F_F = np.asarray(F, dtype=np.float64)
+    terms = closed_form.get_load_terms(L, config)
+    loads = [term for term in terms if term[0] == 'F']
+    supports = [term for term in terms if term[0] != 'F']
+    n_F, n_R = len(F_F), len(supports)
+
+    # moment due to the loads and per unit reactions
+    M_xl, _ = closed_form.get_unit_MQ(x, loads)
+    M_xR, _ = closed_form.get_unit_MQ(x, supports)
+    # terms at the right end act behind the beam - the profiles
+    # take the value on the left side of the discontinuity there
+    M_xl[:, [start >= L for _, _, start, _ in loads]] = 0
+    M_xR[:, [start >= L for _, _, start, _ in supports]] = 0
+    v_l = np.array([value for _, value, _, _ in loads])
+    M0_xF = np.einsum('xl,l,F->xF', M_xl, v_l, F_F)
+
+    # linear system for the unknowns [R_1 ... R_n, C_0, C_1]
+    A_Fab = np.zeros((n_F, n_R + 2, n_R + 2))
+    b_Fa = np.zeros((n_F, n_R + 2))
+    # zero moment and shear force behind the right end of the beam
+    M_Ll, Q_Ll = closed_form.get_unit_MQ([L], loads)
+    M_LR, Q_LR = closed_form.get_unit_MQ([L], supports)
+    A_Fab[:, 0, :n_R], b_Fa[:, 0] = M_LR[0], -(M_Ll[0] @ v_l) * F_F
+    A_Fab[:, 1, :n_R], b_Fa[:, 1] = Q_LR[0], -(Q_Ll[0] @ v_l) * F_F
+    # kinematic conditions - the deflection of clamped supports is
+    # prescribed by the accompanying point support
+    for a, (_, _, x_s, order) in enumerate(supports, start=2):
+        A_Fab[:, a, n_R:] = [0, 1] if order == -2 else [1, x_s]
+
+    # elastic reactions as the start values
+    R_RF = np.einsum('R,F->RF', [value for _, value, _, _ in supports], F_F)
+    C_2F = np.zeros((2, n_F))
+    for k in range(max_iter):
+        M_xF = M0_xF + M_xR @ R_RF
+        # sagging moments of the beam are negative while they are
+        # positive in the moment-curvature relation of the cross section
+        kappa_xF = -get_kappa_M(-M_xF, kappa_M_table)
+        f_xF = get_flexibility_t(-M_xF, kappa_M_table)
+        # rotations and deflections due to the curvature [0] and
+        # their tangents with respect to the unit reactions [1:]
+        kappa_xaF = np.concatenate(
+            [kappa_xF[:, np.newaxis, :], f_xF[:, np.newaxis, :] * M_xR[..., np.newaxis]],
+            axis=1)
+        with stage('compute.cumtrapz'):
+            phi_xaF = cumtrapz(kappa_xaF, x, initial=0, axis=0)
+            w_xaF = get_w_integral(phi_xaF, kappa_xaF, x)
+        u_saF = _get_support_displacements(supports, x, phi_xaF, w_xaF)
+        A_Fab[:, 2:, :n_R], b_Fa[:, 2:] = u_saF[:, 1:].transpose(2, 0, 1), u_saF[:, 0].T
+        # Newton step for the residual of the equilibrium and of the support conditions
+        r_Fa = np.concatenate(
+            [np.einsum('FeR,RF->Fe', A_Fab[:, :2, :n_R], R_RF) - b_Fa[:, :2],
+             b_Fa[:, 2:] + np.einsum('Fac,cF->Fa', A_Fab[:, 2:, n_R:], C_2F)], axis=1)
+        du_Fa = np.linalg.solve(A_Fab, -r_Fa[..., np.newaxis])[..., 0]
+        dR_RF, dC_2F = du_Fa[:, :n_R].T, du_Fa[:, n_R:].T
+        if np.max(np.fabs(dR_RF), initial=0) <= tol * np.max(np.fabs(R_RF + dR_RF), initial=0):
+            R_RF, C_2F = R_RF + dR_RF, C_2F + dC_2F
+            break
+        # the first step satisfies the equilibrium, the following
+        # steps are self-equilibrated and can be shortened
+        if k:
+            # virtual work of the reaction increments on the displacements
+            # of the supports - forces on the deflection, moments on the rotation
+            v_w_xF, v_phi_xF = np.zeros((len(x), n_F)), np.zeros((len(x), n_F))
+            for a, (_, _, x_s, order) in enumerate(supports):
+                i, eta = get_interp_weights(x_s, x)
+                v_xF, dR_F = (v_phi_xF, dR_RF[a]) if order == -2 else (v_w_xF, -dR_RF[a])
+                v_xF[i] += (1 - eta) * dR_F
+                v_xF[i + 1] += eta * dR_F
+            q_xF = (_cumtrapz_adjoint(_cumtrapz_adjoint(v_w_xF, x) + v_phi_xF, x) +
+                    _w_correction_adjoint(v_w_xF, x))
+            t_F = _get_step_length(M_xF, M_xR @ dR_RF, q_xF, kappa_M_table)
+        else:
+            t_F = 1
+        R_RF, C_2F = R_RF + t_F * dR_RF, C_2F + t_F * dC_2F
+    else:
+        warnings.warn('moment redistribution did not converge within %d iterations'
+                      % max_iter)
+
+    # profiles linearized with respect to the last correction of the reactions
+    C_0, C_1 = C_2F
+    M_xF = M0_xF + M_xR @ R_RF
+    kappa_xF = kappa_xaF[:, 0] + np.einsum('xRF,RF->xF', kappa_xaF[:, 1:], dR_RF)
+    phi_xF = phi_xaF[:, 0] + np.einsum('xRF,RF->xF', phi_xaF[:, 1:], dR_RF) + C_1
+    w_xF = w_xaF[:, 0] + np.einsum('xRF,RF->xF', w_xaF[:, 1:], dR_RF) + C_0 + np.outer(x, C_1)
+    return M_xF, kappa_xF, phi_xF, w_xF
+
+
+def solve_kinematics(x, config, kappa_xF, f_xF):
+    '''
+    Rotation and deflection profiles of the beam with the curvature kappa_xF
+    given independently of the loads, e.g. due to shrinkage and creep.
+    In statically indeterminate systems, the kinematic conditions at the
+    supports are satisfied by self-equilibrated increments of the support
+    reactions inducing the curvature f_xF * M with the flexibility f_xF.
+    Returns the moment increments and the profiles of curvature, rotation
+    and deflection as arrays of shape (n_x, n_F).
+    '''
+    x = np.asarray(x, dtype=np.float64)
+    L = x[-1]
+    supports = [term for term in closed_form.get_load_terms(L, config) if term[0] != 'F']
+    n_F, n_R = kappa_xF.shape[1], len(supports)
+    M_xR, _ = closed_form.get_unit_MQ(x, supports)
+    M_xR[:, [start >= L for _, _, start, _ in supports]] = 0
+    kappa_xaF = np.concatenate(
+        [kappa_xF[:, np.newaxis, :], f_xF[:, np.newaxis, :] * M_xR[..., np.newaxis]], axis=1)
+    with stage('compute.cumtrapz'):
+        phi_xaF = cumtrapz(kappa_xaF, x, initial=0, axis=0)
+        w_xaF = get_w_integral(phi_xaF, kappa_xaF, x)
+    # zero moment and shear force of the reaction increments behind the
+    # end of the beam and the kinematic conditions at the supports
+    A_Fab = np.zeros((n_F, n_R + 2, n_R + 2))
+    b_Fa = np.zeros((n_F, n_R + 2))
+    M_LR, Q_LR = closed_form.get_unit_MQ([L], supports)
+    A_Fab[:, 0, :n_R], A_Fab[:, 1, :n_R] = M_LR[0], Q_LR[0]
+    for a, (_, _, x_s, order) in enumerate(supports, start=2):
+        A_Fab[:, a, n_R:] = [0, 1] if order == -2 else [1, x_s]
+    u_saF = _get_support_displacements(supports, x, phi_xaF, w_xaF)
+    A_Fab[:, 2:, :n_R], b_Fa[:, 2:] = u_saF[:, 1:].transpose(2, 0, 1), -u_saF[:, 0].T
+    u_Fa = np.linalg.solve(A_Fab, b_Fa[..., np.newaxis])[..., 0]
+    dR_RF, (C_0, C_1) = u_Fa[:, :n_R].T, u_Fa[:, n_R:].T
+    kappa_xF = kappa_xaF[:, 0] + np.einsum('xRF,RF->xF', kappa_xaF[:, 1:], dR_RF)
+    phi_xF = phi_xaF[:, 0] + np.einsum('xRF,RF->xF', phi_xaF[:, 1:], dR_RF) + C_1
+    w_xF = w_xaF[:, 0] + np.einsum('xRF,RF->xF', w_xaF[:, 1:], dR_RF) + C_0 + np.outer(x, C_1)
+    return M_xR @ dR_RF, kappa_xF, phi_xF, w_xF
+
+
+def _get_support_displacements(supports, x, phi_xaF, w_xaF):
+    '''
+    Rotations at the clamped supports and deflections at the point supports
+    interpolated in the profiles - shape (n_supports, n_a, n_F)
+    '''
+    return np.array([interp_x(x_s, x, phi_xaF if order == -2 else w_xaF)
+                     for _, _, x_s, order in supports])
+
+
+def get_w_max(x, config, F_arr, kappa_M_table, **solve_kw):
+    '''
+    Maximum deflection along the beam for the downward loads F_arr
+    '''
+    F_arr = np.asarray(F_arr, dtype=np.float64)
+    w_xF = solve_xF(x, config, -F_arr, kappa_M_table, **solve_kw)[3]
+    # the sign of the deflection depends on the sign convention
+    # of the moment-curvature relation
+    w_arr = np.max(np.fabs(w_xF), axis=0)
+    w_arr[F_arr == 0] = 0
+    return w_arr
+
+
+def get_Fw(x, config, kappa_M_table, F_max, n_load_steps=31, **solve_kw):
+    '''
+    Load-deflection curve for n_load_steps equidistant load levels up to F_max
+    '''
+    F_arr = np.linspace(0, F_max, n_load_steps)
+    return F_arr, get_w_max(x, config, F_arr, kappa_M_table, **solve_kw)
+
+
+def _get_step_length(M_xF, dM_xF, q_xF, kappa_M_table, n_iter=30):
+    '''
+    Step length t within (0, 1] of the self-equilibrated moment increment dM
+    at which the virtual work of the reaction increments on the support
+    displacements vanishes. It is the derivative of the complementary
+    energy of the beam and increases monotonically with t for a monotone
+    moment-curvature relation, so that the root is bracketed by bisection
+    for all load levels at once. The support displacements are linear in
+    the curvature with the weights q_xF.
+    '''
+    def get_dU_F(t_F):
+        return np.einsum('xF,xF->F', q_xF,
+                         -get_kappa_M(-(M_xF + t_F * dM_xF), kappa_M_table))
+    n_F = M_xF.shape[1]
+    t_F = np.ones(n_F)
+    search_F = get_dU_F(t_F) > 0
+    t_min, t_max = np.zeros(n_F), np.ones(n_F)
+    for _ in range(n_iter):
+        if not np.any(search_F):
+            break
+        t_F = np.where(search_F, (t_min + t_max) / 2, t_F)
+        overshoot_F = get_dU_F(t_F) > 0
+        t_max = np.where(search_F & overshoot_F, t_F, t_max)
+        t_min = np.where(search_F & ~overshoot_F, t_F, t_min)
+    return t_F
+
+
+def get_w_integral(phi_x, kappa_x, x):
+    '''
+    Deflection as the integral of the rotation phi_x along the first axis
+    by the trapezoidal rule with the end correction of the derivative
+    kappa_x. The integral is exact for a curvature varying linearly
+    between the points, e.g. for point loads with the points of the grid
+    at the loads and at the kinks of the moment-curvature relation.
+    '''
+    h = np.diff(x).reshape((-1,) + (1,) * (phi_x.ndim - 1))
+    dw = h / 2 * (phi_x[1:] + phi_x[:-1]) - h ** 2 / 12 * (kappa_x[1:] - kappa_x[:-1])
+    return np.concatenate([np.zeros_like(phi_x[:1]), np.cumsum(dw, axis=0)])
+
+
+def _w_correction_adjoint(v_x, x):
+    '''
+    Transposed operator of the end correction in get_w_integral, i.e.
+    the weights of kappa_x in the sum of v_x * w_x
+    '''
+    h = np.diff(x)[:, np.newaxis]
+    S_x = np.cumsum(v_x[::-1], axis=0)[::-1]
+    u_x = np.zeros_like(v_x)
+    u_x[:-1] += h ** 2 / 12 * S_x[1:]
+    u_x[1:] -= h ** 2 / 12 * S_x[1:]
+    return u_x
+
+
+def _cumtrapz_adjoint(v_x, x):
+    '''
+    Transposed operator of cumtrapz(y_x, x, initial=0, axis=0), i.e. the
+    weights of y_x in the sum of v_x * cumtrapz(y_x)
+    '''
+    h = np.diff(x)[:, np.newaxis]
+    S_x = np.cumsum(v_x[::-1], axis=0)[::-1]
+    u_x = np.zeros_like(v_x)
+    u_x[:-1] += h / 2 * S_x[1:]
+    u_x[1:] += h / 2 * S_x[1:]
+    return u_x
+
+
+def get_interp_weights(x_val, x):
+    '''
+    Index of the interval containing x_val and the relative position within it
+    '''
+    i = np.clip(np.searchsorted(x, x_val) - 1, 0, len(x) - 2)
+    return i, (x_val - x[i]) / (x[i + 1] - x[i])
+
+
+def interp_x(x_val, x, y_x):
+    '''
+    Linear interpolation of y_x at the position x_val along the first
+    axis - equivalent to np.interp for each column of y_x
+    '''
+    i, eta = get_interp_weights(x_val, x)
+    return (1 - eta) * y_x[i] + eta * y_x[i + 1]
@@ -0,0 +1,40 @@
+'''
+Lazy loading of the names exported by the packages of bmcs_beam. The heavy
+dependencies - sympy, matplotlib, traitsui and the bmcs_cross_section stack -
+are imported with the submodule defining a name on its first access
+instead of at the import of the package.
+
+Usage within a package __init__.py:
+
+    from bmcs_beam.lazy_import import lazy_attributes
+
+    __getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+        '.deflection_profile': ['DeflectionProfile'],
+    })
+'''
+
+import importlib
+import sys
+
+
+def lazy_attributes(module_name, exports):
+    '''
+    Module level __getattr__ and __dir__ functions (PEP 562) and the list
+    __all__ for the exports {module: [names]}. Relative module names are
+    resolved with respect to module_name. The loaded values are stored
+    in the module, so that the __getattr__ is called once per name.
+    '''
+    name_module = {name: module for module, names in exports.items() for name in names}
+
+    def __getattr__(name):
+        module = name_module.get(name)
+        if module is None:
+            raise AttributeError('module %r has no attribute %r' % (module_name, name))
+        value = getattr(importlib.import_module(module, module_name), name)
+        setattr(sys.modules[module_name], name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | set(name_module))
+
+    return __getattr__, __dir__, list(name_module)
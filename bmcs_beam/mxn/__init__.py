@@ -7,21 +7,16 @@ Created on Jan 17, 2014
 from traits.etsconfig.api import ETSConfig
 ETSConfig.toolkit = 'qt4'
 
-from .cross_section import \
-    CrossSection
-from .cross_section_component import \
-    CrossSectionComponent
-from .cross_section_state import \
-    CrossSectionState
-from .ecb_calib import \
-    ECBCalib
-from .matrix_laws import \
-    MatrixLawBase
-from .mxn_diagram import \
-    MxNDiagram
-from .mxn_tree_node import \
-    MxNTreeNode
-from .reinf_laws import \
-    ReinfLawBase, ReinfLawFBM
-from .view import \
-    MxNTreeView
+from bmcs_beam.lazy_import import lazy_attributes
+
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.cross_section': ['CrossSection'],
+    '.cross_section_component': ['CrossSectionComponent'],
+    '.cross_section_state': ['CrossSectionState'],
+    '.ecb_calib': ['ECBCalib'],
+    '.matrix_laws': ['MatrixLawBase'],
+    '.mxn_diagram': ['MxNDiagram'],
+    '.mxn_tree_node': ['MxNTreeNode'],
+    '.reinf_laws': ['ReinfLawBase', 'ReinfLawFBM'],
+    '.view': ['MxNTreeView'],
+})
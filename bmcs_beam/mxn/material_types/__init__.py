@@ -1,11 +1,8 @@
-from .material_type_base import \
-    MaterialTypeBase
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .material_type_matrix_mixture import \
-    MTMatrixMixture
-
-from .material_type_reinf_bar import \
-    MTReinfBar
-
-from .material_type_reinf_fabric import \
-    MTReinfFabric
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.material_type_base': ['MaterialTypeBase'],
+    '.material_type_matrix_mixture': ['MTMatrixMixture'],
+    '.material_type_reinf_bar': ['MTReinfBar'],
+    '.material_type_reinf_fabric': ['MTReinfFabric'],
+})
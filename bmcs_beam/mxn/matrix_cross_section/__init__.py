@@ -1,15 +1,9 @@
-from bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo import \
-    MCSGeo
-
-from bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo_I import \
-    MCSGeoI
-
-from bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo_circ import \
-    MCSGeoCirc
-
-from bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo_rect import \
-    MCSGeoRect
-
-from bmcs_beam.mxn.matrix_cross_section.matrix_cross_section import \
-    MatrixCrossSection
-
+from bmcs_beam.lazy_import import lazy_attributes
+
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    'bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo': ['MCSGeo'],
+    'bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo_I': ['MCSGeoI'],
+    'bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo_circ': ['MCSGeoCirc'],
+    'bmcs_beam.mxn.matrix_cross_section.matrix_cross_section_geo_rect': ['MCSGeoRect'],
+    'bmcs_beam.mxn.matrix_cross_section.matrix_cross_section': ['MatrixCrossSection'],
+})
@@ -1,17 +1,10 @@
-from .matrix_law_base import \
-    MatrixLawBase
-
-from .matrix_law_linear import \
-    MatrixLawLinear
-
-from .matrix_law_bilinear import \
-    MatrixLawBilinear
-
-from .matrix_law_block import \
-    MatrixLawBlock
-
-from .matrix_law_quadratic import \
-    MatrixLawQuadratic
-
-from .matrix_law_quad import \
-    MatrixLawQuad
+from bmcs_beam.lazy_import import lazy_attributes
+
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.matrix_law_base': ['MatrixLawBase'],
+    '.matrix_law_linear': ['MatrixLawLinear'],
+    '.matrix_law_bilinear': ['MatrixLawBilinear'],
+    '.matrix_law_block': ['MatrixLawBlock'],
+    '.matrix_law_quadratic': ['MatrixLawQuadratic'],
+    '.matrix_law_quad': ['MatrixLawQuad'],
+})
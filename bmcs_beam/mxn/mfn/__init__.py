@@ -1,2 +1,5 @@
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .mfn_line.mfn_line import MFnLineArray
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.mfn_line.mfn_line': ['MFnLineArray'],
+})
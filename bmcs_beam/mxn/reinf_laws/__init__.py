@@ -1,21 +1,11 @@
-from .reinf_law_base import \
-    ReinfLawBase
-
-from .reinf_law_bilinear import \
-    ReinfLawBilinear
-
-from .reinf_law_cubic import \
-    ReinfLawCubic
-
-from .reinf_law_piecewise_linear import \
-    ReinfLawPiecewiseLinear
-
-from .reinf_law_fbm import \
-    ReinfLawFBM
-
-from .reinf_law_linear import \
-    ReinfLawLinear
-
-from .reinf_law_steel import \
-    ReinfLawSteel
-
+from bmcs_beam.lazy_import import lazy_attributes
+
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.reinf_law_base': ['ReinfLawBase'],
+    '.reinf_law_bilinear': ['ReinfLawBilinear'],
+    '.reinf_law_cubic': ['ReinfLawCubic'],
+    '.reinf_law_piecewise_linear': ['ReinfLawPiecewiseLinear'],
+    '.reinf_law_fbm': ['ReinfLawFBM'],
+    '.reinf_law_linear': ['ReinfLawLinear'],
+    '.reinf_law_steel': ['ReinfLawSteel'],
+})
@@ -1,11 +1,8 @@
-from .reinf_layout_component import \
-    ReinfLayoutComponent
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .reinf_layout_component_tex_layer import \
-    RLCTexLayer
-
-from .reinf_layout_component_tex_uniform import \
-    RLCTexUniform
-
-from .reinf_layout_component_bar import \
-    RLCBar
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.reinf_layout_component': ['ReinfLayoutComponent'],
+    '.reinf_layout_component_tex_layer': ['RLCTexLayer'],
+    '.reinf_layout_component_tex_uniform': ['RLCTexUniform'],
+    '.reinf_layout_component_bar': ['RLCBar'],
+})
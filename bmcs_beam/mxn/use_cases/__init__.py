@@ -1,10 +1,9 @@
-from .use_case_container import \
-    UseCaseContainer
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .use_case_parametric_study import \
-    UCParametricStudy, UCPStudyElementMxN, \
-    UCPStudyElementFabricLaw, UCPStudyElementBarLaw, \
-    UCPStudyElementMatrixLaw
-
-from .use_case_database import \
-    UCDatabase
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.use_case_container': ['UseCaseContainer'],
+    '.use_case_parametric_study': [
+        'UCParametricStudy', 'UCPStudyElementMxN', 'UCPStudyElementFabricLaw',
+        'UCPStudyElementBarLaw', 'UCPStudyElementMatrixLaw'],
+    '.use_case_database': ['UCDatabase'],
+})
@@ -1,5 +1,6 @@
-from .file_handler import \
-    get_outfile
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .keyref import \
-    KeyRef
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.file_handler': ['get_outfile'],
+    '.keyref': ['KeyRef'],
+})
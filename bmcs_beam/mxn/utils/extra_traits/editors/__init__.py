@@ -1,2 +1,5 @@
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .mpl_figure_editor import MPLFigureEditor
\ No newline at end of file
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.mpl_figure_editor': ['MPLFigureEditor'],
+})
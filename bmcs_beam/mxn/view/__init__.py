@@ -1,9 +1,6 @@
+from bmcs_beam.lazy_import import lazy_attributes
 
-from .mxn_tree_view import \
-    MxNTreeView, tree_node, tree_editor, \
-    leaf_node
-
-from .mxn_tree_view_handler import \
-    MxNTreeViewHandler, menu_save, \
-    menu_open, plot_self
-
+__getattr__, __dir__, __all__ = lazy_attributes(__name__, {
+    '.mxn_tree_view': ['MxNTreeView', 'tree_node', 'tree_editor', 'leaf_node'],
+    '.mxn_tree_view_handler': ['MxNTreeViewHandler', 'menu_save', 'menu_open', 'plot_self'],
+})
@@ -0,0 +1,194 @@
+'''
+Opt-in instrumentation of the stages of the beam models. Within an active
+StageProfiler, the instrumented stages - sympy solution and lambdification
+of the statical system, evaluation and lookup of the moment-curvature
+relation, integration of the curvature and plotting - record the number
+of calls, the cumulative wall time and the hits and misses of their caches.
+Without an active profiler, the stages only check an empty list.
+
+Usage:
+
+    with StageProfiler() as prof:
+        dp.get_Fw()
+    print(prof.format_report())
+
+    with StageProfiler(backend='cprofile') as prof:
+        dp.update_plot(axes)
+    prof.dump_stats('update_plot.prof')  # pstats, snakeviz, gprof2dot
+'''
+
+import cProfile
+import functools
+import pstats
+import time
+
+_active_profilers = []
+
+
+class StageStats(object):
+    '''Calls, cumulative wall time and cache hits and misses of a stage.
+    The time of nested stages is included in the time of the enclosing one.
+    '''
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_ratio(self):
+        n = self.hits + self.misses
+        return self.hits / n if n else float('nan')
+
+    def as_dict(self):
+        return dict(calls=self.calls, time=self.time, hits=self.hits,
+                    misses=self.misses, hit_ratio=self.hit_ratio)
+
+
+class StageProfiler(object):
+    '''
+    Context manager collecting the statistics of the instrumented stages.
+    The optional backend 'cprofile' or 'pyinstrument' profiles the same
+    block on the function level, the backend profiler is available
+    as the attribute profiler after the block.
+    '''
+
+    def __init__(self, backend=None):
+        if backend not in (None, 'cprofile', 'pyinstrument'):
+            raise ValueError('unknown profiler backend %r' % backend)
+        self.backend = backend
+        self.profiler = None
+        self.stats = {}
+
+    def __enter__(self):
+        if self.backend == 'cprofile':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.backend == 'pyinstrument':
+            # optional dependency
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+            self.profiler.start()
+        _active_profilers.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.backend == 'cprofile':
+            self.profiler.disable()
+        elif self.backend == 'pyinstrument':
+            self.profiler.stop()
+        _active_profilers.remove(self)
+        return False
+
+    def get_stage_stats(self, name):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = StageStats()
+        return stats
+
+    def get_report(self):
+        '''
+        Statistics of the stages as a dictionary {stage: {calls, time, hits,
+        misses, hit_ratio}} ordered by decreasing cumulative time
+        '''
+        items = sorted(self.stats.items(), key=lambda item: -item[1].time)
+        return {name: stats.as_dict() for name, stats in items}
+
+    def format_report(self):
+        lines = ['%-45s %8s %12s %8s %8s' % ('stage', 'calls', 'time [s]', 'hits', 'misses')]
+        for name, s in self.get_report().items():
+            lines.append('%-45s %8d %12.6f %8d %8d' % (name, s['calls'], s['time'],
+                                                       s['hits'], s['misses']))
+        return '\n'.join(lines)
+
+    def get_pstats(self):
+        '''Function level statistics of the cprofile backend as pstats.Stats
+        '''
+        if self.backend != 'cprofile':
+            raise ValueError('pstats are only available for the cprofile backend')
+        return pstats.Stats(self.profiler)
+
+    def dump_stats(self, file_name):
+        '''
+        Store the function level statistics - the cProfile binary format
+        readable by pstats and snakeviz, or the HTML report of pyinstrument
+        '''
+        if self.backend == 'cprofile':
+            self.profiler.dump_stats(file_name)
+        elif self.backend == 'pyinstrument':
+            with open(file_name, 'w') as f:
+                f.write(self.profiler.output_html())
+        else:
+            raise ValueError('no profiler backend to dump the statistics')
+
+
+class stage(object):
+    '''
+    Context manager recording a call of the named stage
+    in all active profilers
+    '''
+    __slots__ = ('name', 't_start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        if _active_profilers:
+            self.t_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if _active_profilers:
+            dt = time.perf_counter() - self.t_start
+            for profiler in _active_profilers:
+                stats = profiler.get_stage_stats(self.name)
+                stats.calls += 1
+                stats.time += dt
+        return False
+
+
+def record_cache(name, hit):
+    '''Record a hit or a miss of the cache of the named stage
+    '''
+    for profiler in _active_profilers:
+        stats = profiler.get_stage_stats(name)
+        if hit:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+
+
+def timed(name):
+    '''Decorator recording the calls of a function as the named stage
+    '''
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kw):
+            with stage(name):
+                return fn(*args, **kw)
+        return wrapper
+    return decorator
+
+
+def cached_stage(name):
+    '''
+    Replacement of traits.api.cached_property for the getter of a cached
+    property recording the access as a hit or a miss of the cache
+    and the time of the evaluation as the named stage
+    '''
+    # traits is only needed by the interactive models
+    from traits.has_traits import TraitsCache, Undefined, cached_property
+
+    def decorator(fget):
+        cache_name = TraitsCache + fget.__name__[5:]
+        get_cached = cached_property(timed(name)(fget))
+
+        @functools.wraps(fget)
+        def wrapper(self):
+            if _active_profilers:
+                record_cache(name, self.__dict__.get(cache_name, Undefined) is not Undefined)
+            return get_cached(self)
+        wrapper.cached_property = True
+        return wrapper
+    return decorator